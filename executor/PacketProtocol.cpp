@@ -1,15 +1,56 @@
 #include <Arduino.h>
 #include <inttypes.h>
+#include <avr/pgmspace.h>
 #include "PacketProtocol.h"
 
+// CRC-16/MCRF4XX (poly 0x1021 reflected, init 0xFFFF), kept in flash to save RAM.
+// Reflected so bits are checked in the order the UART sends them, LSB first
+static const uint16_t CRC16_TABLE[256] PROGMEM = {
+    0x0000, 0x1189, 0x2312, 0x329B, 0x4624, 0x57AD, 0x6536, 0x74BF,
+    0x8C48, 0x9DC1, 0xAF5A, 0xBED3, 0xCA6C, 0xDBE5, 0xE97E, 0xF8F7,
+    0x1081, 0x0108, 0x3393, 0x221A, 0x56A5, 0x472C, 0x75B7, 0x643E,
+    0x9CC9, 0x8D40, 0xBFDB, 0xAE52, 0xDAED, 0xCB64, 0xF9FF, 0xE876,
+    0x2102, 0x308B, 0x0210, 0x1399, 0x6726, 0x76AF, 0x4434, 0x55BD,
+    0xAD4A, 0xBCC3, 0x8E58, 0x9FD1, 0xEB6E, 0xFAE7, 0xC87C, 0xD9F5,
+    0x3183, 0x200A, 0x1291, 0x0318, 0x77A7, 0x662E, 0x54B5, 0x453C,
+    0xBDCB, 0xAC42, 0x9ED9, 0x8F50, 0xFBEF, 0xEA66, 0xD8FD, 0xC974,
+    0x4204, 0x538D, 0x6116, 0x709F, 0x0420, 0x15A9, 0x2732, 0x36BB,
+    0xCE4C, 0xDFC5, 0xED5E, 0xFCD7, 0x8868, 0x99E1, 0xAB7A, 0xBAF3,
+    0x5285, 0x430C, 0x7197, 0x601E, 0x14A1, 0x0528, 0x37B3, 0x263A,
+    0xDECD, 0xCF44, 0xFDDF, 0xEC56, 0x98E9, 0x8960, 0xBBFB, 0xAA72,
+    0x6306, 0x728F, 0x4014, 0x519D, 0x2522, 0x34AB, 0x0630, 0x17B9,
+    0xEF4E, 0xFEC7, 0xCC5C, 0xDDD5, 0xA96A, 0xB8E3, 0x8A78, 0x9BF1,
+    0x7387, 0x620E, 0x5095, 0x411C, 0x35A3, 0x242A, 0x16B1, 0x0738,
+    0xFFCF, 0xEE46, 0xDCDD, 0xCD54, 0xB9EB, 0xA862, 0x9AF9, 0x8B70,
+    0x8408, 0x9581, 0xA71A, 0xB693, 0xC22C, 0xD3A5, 0xE13E, 0xF0B7,
+    0x0840, 0x19C9, 0x2B52, 0x3ADB, 0x4E64, 0x5FED, 0x6D76, 0x7CFF,
+    0x9489, 0x8500, 0xB79B, 0xA612, 0xD2AD, 0xC324, 0xF1BF, 0xE036,
+    0x18C1, 0x0948, 0x3BD3, 0x2A5A, 0x5EE5, 0x4F6C, 0x7DF7, 0x6C7E,
+    0xA50A, 0xB483, 0x8618, 0x9791, 0xE32E, 0xF2A7, 0xC03C, 0xD1B5,
+    0x2942, 0x38CB, 0x0A50, 0x1BD9, 0x6F66, 0x7EEF, 0x4C74, 0x5DFD,
+    0xB58B, 0xA402, 0x9699, 0x8710, 0xF3AF, 0xE226, 0xD0BD, 0xC134,
+    0x39C3, 0x284A, 0x1AD1, 0x0B58, 0x7FE7, 0x6E6E, 0x5CF5, 0x4D7C,
+    0xC60C, 0xD785, 0xE51E, 0xF497, 0x8028, 0x91A1, 0xA33A, 0xB2B3,
+    0x4A44, 0x5BCD, 0x6956, 0x78DF, 0x0C60, 0x1DE9, 0x2F72, 0x3EFB,
+    0xD68D, 0xC704, 0xF59F, 0xE416, 0x90A9, 0x8120, 0xB3BB, 0xA232,
+    0x5AC5, 0x4B4C, 0x79D7, 0x685E, 0x1CE1, 0x0D68, 0x3FF3, 0x2E7A,
+    0xE70E, 0xF687, 0xC41C, 0xD595, 0xA12A, 0xB0A3, 0x8238, 0x93B1,
+    0x6B46, 0x7ACF, 0x4854, 0x59DD, 0x2D62, 0x3CEB, 0x0E70, 0x1FF9,
+    0xF78F, 0xE606, 0xD49D, 0xC514, 0xB1AB, 0xA022, 0x92B9, 0x8330,
+    0x7BC7, 0x6A4E, 0x58D5, 0x495C, 0x3DE3, 0x2C6A, 0x1EF1, 0x0F78,
+};
+
 PacketProtocol::PacketProtocol()
-    : serial(nullptr), handler(nullptr), rxBufferIndex(0),
+    : serial(nullptr), handler(nullptr), integrity(INTEGRITY_XOR),
+      framing(FRAMING_START_BYTE), rxBufferIndex(0),
       packetsSent(0), packetsReceived(0), packetsInvalid(0) {
 }
 
 void PacketProtocol::begin(Stream* serialPort, PacketHandler packetHandler) {
     serial = serialPort;
     handler = packetHandler;
+    integrity = INTEGRITY_XOR;
+    framing = FRAMING_START_BYTE;
     rxBufferIndex = 0;
 }
 
@@ -17,22 +58,45 @@ void PacketProtocol::setHandler(PacketHandler packetHandler) {
     handler = packetHandler;
 }
 
-uint8_t PacketProtocol::calculateChecksum(const uint8_t* data, uint8_t length) {
+void PacketProtocol::setIntegrity(Integrity mode) {
+    integrity = mode;
+}
+
+void PacketProtocol::setFraming(Framing mode) {
+    framing = mode;
+}
+
+uint8_t PacketProtocol::calculateChecksum(const uint8_t* data, uint16_t length) {
     uint8_t checksum = 0;
-    for (uint8_t i = 0; i < length; i++) {
+    for (uint16_t i = 0; i < length; i++) {
         checksum ^= data[i];
     }
     return checksum;
 }
 
-bool PacketProtocol::validatePacket(const uint8_t* packet, uint8_t length) {
+uint16_t PacketProtocol::calculateCrc16(const uint8_t* data, uint16_t length) {
+    uint16_t crc = 0xFFFF;
+    for (uint16_t i = 0; i < length; i++) {
+        crc = (crc >> 8) ^ pgm_read_word(&CRC16_TABLE[(crc ^ data[i]) & 0xFF]);
+    }
+    return crc;
+}
+
+uint16_t PacketProtocol::packetSize(uint8_t payloadLength) const {
+    return 3 + payloadLength + (integrity == INTEGRITY_CRC16 ? 2 : 1);
+}
+
+bool PacketProtocol::validatePacket(const uint8_t* packet, uint16_t length) {
     if (length < MIN_PACKET_SIZE) return false;
     if (packet[0] != PACKET_START_BYTE) return false;
 
-    uint8_t payloadLength = packet[2];
-    uint8_t expectedLength = MIN_PACKET_SIZE + payloadLength;
+    if (length != packetSize(packet[2])) return false;
 
-    if (length != expectedLength) return false;
+    if (integrity == INTEGRITY_CRC16) {
+        uint16_t crc;
+        memcpy(&crc, &packet[length - 2], 2);
+        return calculateCrc16(&packet[1], length - 3) == crc;
+    }
 
     // Verify checksum (XOR of TYPE + LENGTH + PAYLOAD)
     uint8_t checksum = calculateChecksum(&packet[1], length - 2);
@@ -48,11 +112,63 @@ void PacketProtocol::update() {
     }
 
     // Process one complete packet if available
-    if (rxBufferIndex >= MIN_PACKET_SIZE) {
+    if (framing == FRAMING_COBS) {
+        processCobsBuffer();
+    } else if (rxBufferIndex >= MIN_PACKET_SIZE) {
         processBuffer();
     }
 }
 
+void PacketProtocol::processCobsBuffer() {
+    // Find the delimiter
+    uint16_t end = 0;
+    while (end < rxBufferIndex && rxBuffer[end] != 0) end++;
+
+    if (end == rxBufferIndex) {
+        // A full buffer without a delimiter can only be garbage
+        if (rxBufferIndex == sizeof(rxBuffer)) {
+            rxBufferIndex = 0;
+            packetsInvalid++;
+        }
+        return;
+    }
+
+    // Decode behind a start byte, so the packet can be validated as usual
+    uint8_t packet[MAX_PACKET_SIZE];
+    packet[0] = PACKET_START_BYTE;
+    uint16_t length = 1;
+    bool isValid = true;
+    for (uint16_t index = 0; index < end;) {
+        uint8_t code = rxBuffer[index];
+        if (index + code > end || length + code > sizeof(packet) + 1) {
+            isValid = false;
+            break;
+        }
+        memcpy(&packet[length], &rxBuffer[index + 1], code - 1);
+        length += code - 1;
+        index += code;
+        if (code < 0xFF && index < end) {
+            if (length == sizeof(packet)) {
+                isValid = false;
+                break;
+            }
+            packet[length++] = 0;
+        }
+    }
+    isValid = isValid && validatePacket(packet, length);
+
+    // Remove the frame and its delimiter from the buffer
+    memmove(rxBuffer, rxBuffer + end + 1, rxBufferIndex - end - 1);
+    rxBufferIndex -= end + 1;
+
+    if (isValid) {
+        handlePacket(packet, length);
+        packetsReceived++;
+    } else {
+        packetsInvalid++;
+    }
+}
+
 void PacketProtocol::processBuffer() {
     // Find start byte
     uint16_t startIdx = 0;
@@ -71,8 +187,7 @@ void PacketProtocol::processBuffer() {
     // Check if we have enough data for a complete packet
     if (rxBufferIndex < MIN_PACKET_SIZE) return;
 
-    uint8_t payloadLength = rxBuffer[2];
-    uint8_t packetLength = MIN_PACKET_SIZE + payloadLength;
+    uint16_t packetLength = packetSize(rxBuffer[2]);
 
     if (rxBufferIndex < packetLength) return;
 
@@ -80,7 +195,7 @@ void PacketProtocol::processBuffer() {
     bool isValid = validatePacket(rxBuffer, packetLength);
 
     // Remove packet from buffer
-    uint8_t tempPacket[MIN_PACKET_SIZE + MAX_PAYLOAD_SIZE];
+    uint8_t tempPacket[MAX_PACKET_SIZE];
     memcpy(tempPacket, rxBuffer, packetLength);
     memmove(rxBuffer, rxBuffer + packetLength, rxBufferIndex - packetLength);
     rxBufferIndex -= packetLength;
@@ -94,7 +209,7 @@ void PacketProtocol::processBuffer() {
     }
 }
 
-void PacketProtocol::handlePacket(const uint8_t* packet, uint8_t length) {
+void PacketProtocol::handlePacket(const uint8_t* packet, uint16_t length) {
     if (!handler) return;
 
     PacketType type = (PacketType)packet[1];
@@ -109,7 +224,7 @@ bool PacketProtocol::sendPacket(PacketType type, const uint8_t* payload, uint8_t
     if (length > MAX_PAYLOAD_SIZE) return false;
 
     // Build packet
-    uint8_t packet[MIN_PACKET_SIZE + MAX_PAYLOAD_SIZE];
+    uint8_t packet[MAX_PACKET_SIZE];
     packet[0] = PACKET_START_BYTE;
     packet[1] = (uint8_t)type;
     packet[2] = length;
@@ -120,17 +235,48 @@ bool PacketProtocol::sendPacket(PacketType type, const uint8_t* payload, uint8_t
     }
 
     // Calculate and add checksum
-    uint8_t packetLength = MIN_PACKET_SIZE + length;
-    packet[packetLength - 1] = calculateChecksum(&packet[1], packetLength - 2);
+    uint16_t packetLength = packetSize(length);
+    if (integrity == INTEGRITY_CRC16) {
+        uint16_t crc = calculateCrc16(&packet[1], length + 2);
+        memcpy(&packet[packetLength - 2], &crc, 2);
+    } else {
+        packet[packetLength - 1] = calculateChecksum(&packet[1], length + 2);
+    }
 
     // Send packet
-    size_t written = serial->write(packet, packetLength);
+    bool sent;
+    if (framing == FRAMING_COBS) {
+        sent = writeCobs(&packet[1], packetLength - 1);
+    } else {
+        sent = serial->write(packet, packetLength) == packetLength;
+    }
 
-    if (written == packetLength) {
+    if (sent) {
         packetsSent++;
-        return true;
     }
-    return false;
+    return sent;
+}
+
+// Write COBS encoded data and the 0x00 delimiter a block at a time, so no
+// second packet sized buffer is needed
+bool PacketProtocol::writeCobs(const uint8_t* data, uint16_t length) {
+    size_t written = 0;
+    size_t expected = 1;
+    uint16_t start = 0;
+    while (true) {
+        uint16_t end = start;
+        while (end < length && data[end] != 0 && end - start < 254) end++;
+
+        uint8_t code = end - start + 1;
+        written += serial->write(code);
+        written += serial->write(&data[start], end - start);
+        expected += code;
+
+        if (end == length) break;
+        start = code == 0xFF ? end : end + 1;  // Skip the zero the code stands for
+    }
+    written += serial->write((uint8_t)0);
+    return written == expected;
 }
 
 bool PacketProtocol::sendPing() {
@@ -164,6 +310,20 @@ bool PacketProtocol::sendSensorData(uint8_t sensorId, float value) {
     return sendPacket(SENSOR_DATA, payload, 5);
 }
 
+bool PacketProtocol::sendSensorBatch(uint8_t sensorId, uint32_t firstMillis, uint16_t intervalUs,
+                                     const float* values, uint8_t count) {
+    uint8_t payload[MAX_PAYLOAD_SIZE];
+    uint8_t maxCount = (MAX_PAYLOAD_SIZE - SENSOR_BATCH_HEADER_SIZE) / 4;
+    if (count > maxCount) count = maxCount;
+
+    payload[0] = sensorId;
+    payload[1] = count;
+    memcpy(&payload[2], &firstMillis, 4);
+    memcpy(&payload[6], &intervalUs, 2);
+    memcpy(&payload[SENSOR_BATCH_HEADER_SIZE], values, count * 4);
+    return sendPacket(SENSOR_DATA, payload, SENSOR_BATCH_HEADER_SIZE + count * 4);
+}
+
 bool PacketProtocol::sendErrorReport(uint8_t errorCode, const uint8_t* data, uint8_t dataLen) {
     uint8_t payload[MAX_PAYLOAD_SIZE];
     payload[0] = errorCode;
@@ -183,6 +343,11 @@ void PacketProtocol::clearBuffer() {
 }
 
 // PacketParser implementation
+uint8_t PacketParser::paramEntryCount(uint8_t length) {
+    if (length == 0 || length % PARAM_ENTRY_SIZE != 0) return 0;
+    return length / PARAM_ENTRY_SIZE;
+}
+
 bool PacketParser::parseSetParamId(const uint8_t *payload, uint8_t length, uint8_t &paramId) {
     if (length < 5) return false;
     paramId = payload[0];
@@ -222,9 +387,23 @@ bool PacketParser::parseSpool(const uint8_t* payload, uint8_t length,
     return true;
 }
 
+bool PacketParser::parseSetpoints(const uint8_t* payload, uint8_t length,
+                                  int16_t counts[4]) {
+    if (length != SETPOINT_FRAME_SIZE) return false;
+    memcpy(counts, payload, SETPOINT_FRAME_SIZE);
+    return true;
+}
+
 bool PacketParser::parseReadSensor(const uint8_t* payload, uint8_t length,
                                    uint8_t& sensorId) {
     if (length < 1) return false;
     sensorId = payload[0];
     return true;
 }
+
+bool PacketParser::parseSubscription(const uint8_t* entry, uint8_t& sensorId,
+                                     uint16_t& rateHz) {
+    sensorId = entry[0];
+    memcpy(&rateHz, &entry[1], 2);
+    return true;
+}
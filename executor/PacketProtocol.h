@@ -16,13 +16,16 @@ enum PacketType: uint8_t {
 
     // Supervisor -> Executor (Commands)
     CMD_SET_MODE = 0x10,  // Set operating mode
-    CMD_SET_PARAM = 0x11,  // Set a parameter (Float or int-32)
+    CMD_SET_PARAM = 0x11,  // Set parameters (Float or int-32), one or more entries
     CMD_START = 0x12,  // Start Operation
     CMD_STOP = 0x13,  // Stop Operation
     CMD_RESET = 0x14,  // Reset Command
     CMD_READ_SENSOR = 0x15,  // Request sensor data
     CMD_SET_TENDONS = 0x16,  // Set tendon steering
     CMD_SET_SPOOL = 0x17,  // Set spool position
+    CMD_GET_PARAM = 0x18,  // Request a PARAM_REPORT of every parameter
+    CMD_SUBSCRIBE = 0x19,  // Stream sensors at given rates as batched SENSOR_DATA
+    CMD_SET_SETPOINTS = 0x1A,  // Tendons and spool as int16, once negotiated
 
     // Space left here
 
@@ -31,12 +34,39 @@ enum PacketType: uint8_t {
     SENSOR_DATA = 0x21,  // Sensor data response
     ERROR_REPORT = 0x22,  // Error report
     DEBUG_MESSAGE = 0x23,  // Debug message
+    PARAM_REPORT = 0x24,  // Parameter values in effect
 };
 
 // Packet structure constants
 const uint8_t PACKET_START_BYTE = 0xAA;
 const uint8_t MAX_PAYLOAD_SIZE = 255;
 const uint8_t MIN_PACKET_SIZE = 4;  // START + TYPE + LENGTH + CHECKSUM
+const uint16_t MAX_PACKET_SIZE = 3 + MAX_PAYLOAD_SIZE + 2;  // With a CRC-16
+const uint16_t MAX_COBS_FRAME_SIZE = MAX_PACKET_SIZE - 1 + 2 + 1;  // No start byte, overhead, 0x00
+const uint8_t SUBSCRIBE_ENTRY_SIZE = 3;  // Sensor id + uint16 rate in Hz, 0 to stop
+const uint8_t SENSOR_BATCH_HEADER_SIZE = 8;  // Id, count, uint32 first millis, uint16 interval us
+const uint8_t PARAM_ENTRY_SIZE = 5;  // Param id + 4 byte value, CMD_SET_PARAM and PARAM_REPORT
+
+// CMD_SET_SETPOINTS: int16 tendon 1-3 then spool, SETPOINT_KEEP leaves a value
+// as it is (the tendons as a group). Must match supervisor/src/setpoints.py
+const uint8_t SETPOINT_FRAME_SIZE = 8;
+const int16_t SETPOINT_KEEP = -32768;
+const float TENDON_LSB = 1.0 / 4096;  // Radians per count
+const float SPOOL_LSB = 1.0 / 8192;  // rpm per count
+
+// Check value at the end of each packet, chosen per session with the
+// LINK_INTEGRITY param. Every session starts with XOR
+enum Integrity: uint8_t {
+    INTEGRITY_XOR = 0,  // 1 byte XOR
+    INTEGRITY_CRC16 = 1,  // 2 byte CRC-16/MCRF4XX, little endian
+};
+
+// How packets are delimited, chosen per session with the LINK_FRAMING param.
+// Every session starts with FRAMING_START_BYTE
+enum Framing: uint8_t {
+    FRAMING_START_BYTE = 0,  // PACKET_START_BYTE then the length
+    FRAMING_COBS = 1,  // Packet without the start byte, COBS encoded, then 0x00
+};
 
 // Callback function type for packet handlers
 typedef void (*PacketHandler)(PacketType type, const uint8_t* payload, uint8_t length);
@@ -51,6 +81,14 @@ public:
     // Set packet handler callback
     void setHandler(PacketHandler handler);
 
+    // Check packets with this from the next one on, in both directions
+    void setIntegrity(Integrity mode);
+    Integrity getIntegrity() const { return integrity; }
+
+    // Delimit packets with this from the next one on, in both directions
+    void setFraming(Framing mode);
+    Framing getFraming() const { return framing; }
+
     // Process incoming serial data (call in loop())
     void update();
 
@@ -64,6 +102,8 @@ public:
     bool sendNack(uint8_t errorCode = 0);
     bool sendStatusUpdate(uint8_t mode, uint8_t state, uint32_t uptime);
     bool sendSensorData(uint8_t sensorId, float value);
+    bool sendSensorBatch(uint8_t sensorId, uint32_t firstMillis, uint16_t intervalUs,
+                         const float* values, uint8_t count);
     bool sendErrorReport(uint8_t errorCode, const uint8_t* data = nullptr, uint8_t dataLen = 0);
 
     // Statistics
@@ -77,9 +117,11 @@ public:
 private:
     Stream* serial;
     PacketHandler handler;
+    Integrity integrity;
+    Framing framing;
 
     // Receive buffer
-    uint8_t rxBuffer[MIN_PACKET_SIZE + MAX_PAYLOAD_SIZE];
+    uint8_t rxBuffer[MAX_COBS_FRAME_SIZE];
     uint16_t rxBufferIndex;
 
     // Statistics
@@ -88,16 +130,21 @@ private:
     uint32_t packetsInvalid;
 
     // Internal methods
-    uint8_t calculateChecksum(const uint8_t* data, uint8_t length);
-    bool validatePacket(const uint8_t* packet, uint8_t length);
+    uint8_t calculateChecksum(const uint8_t* data, uint16_t length);
+    uint16_t calculateCrc16(const uint8_t* data, uint16_t length);
+    uint16_t packetSize(uint8_t payloadLength) const;
+    bool validatePacket(const uint8_t* packet, uint16_t length);
     void processBuffer();
-    void handlePacket(const uint8_t* packet, uint8_t length);
+    void processCobsBuffer();
+    bool writeCobs(const uint8_t* data, uint16_t length);
+    void handlePacket(const uint8_t* packet, uint16_t length);
 };
 
 // Helper class for parsing common payloads
 class PacketParser {
 public:
     // Parse CMD_SET_PARAM payload
+    static uint8_t paramEntryCount(uint8_t length);  // 0 if the length is not whole entries
     static bool parseSetParamId(const uint8_t* payloat, uint8_t length,
                                 uint8_t& paramID);
     static bool parseSetParam(const uint8_t* payload, uint8_t length,
@@ -110,10 +157,14 @@ public:
                                float& motor1, float& motor2, float& motor3);
     static bool parseSpool(const uint8_t* payload, uint8_t length,
                                 float& motorSteps);
+    static bool parseSetpoints(const uint8_t* payload, uint8_t length,
+                               int16_t counts[4]);
 
     // Parse sensor read request
     static bool parseReadSensor(const uint8_t* payload, uint8_t length,
                                uint8_t& sensorId);
+    static bool parseSubscription(const uint8_t* entry, uint8_t& sensorId,
+                                  uint16_t& rateHz);
 };
 
 #endif
@@ -2,7 +2,7 @@
 #include "PositionStepper.h"
 #include "ContinuousStepper.h"
 
-#define MAX_PARAMS 2
+#define MAX_PARAMS 5  // Must match src/params.py PARAMETERS in the supervisor
 
 // Enable pin is not used right now
 #define tendon2MotorPul 5
@@ -21,6 +21,23 @@
 #define spoolMotorDir 9
 // #define spoolMotorEna 7
 
+// Stop the motors if the supervisor goes quiet for this long while running.
+// The supervisor PINGs every 250 ms while connected.
+const unsigned long HEARTBEAT_TIMEOUT_MS = 1000;
+const uint8_t ERROR_HEARTBEAT_TIMEOUT = 0x01;
+
+// Every session starts at BASE_BAUD_RATE, the supervisor then asks for a faster one with
+// LINK_BAUD. All of these are exact or within 2.1% on a 16 MHz AVR.
+const int32_t BASE_BAUD_RATE = 115200;
+const int32_t LINK_BAUD_RATES[] = {115200, 250000, 500000, 1000000};
+
+// Sensors that can be read or streamed with CMD_SUBSCRIBE
+#define NUM_SENSORS 1
+#define SENSOR_TANK_PRESSURE 0
+#define tankPressurePin A0
+const uint16_t MAX_SENSOR_RATE = 1000;  // Hz
+const uint8_t SENSOR_BATCH_SIZE = 16;  // Samples per SENSOR_DATA frame when streaming
+
 const int TENDON_STEPS_PER_REV = 400;
 const int SPOOL_STEPS_PER_REV = 47 * 400; // 47:1 and 400 steps per rev
 
@@ -34,10 +51,30 @@ struct Parameter {
 
 Parameter params[MAX_PARAMS];
 
-int32_t param_tendon_speed = 0;
+// Setpoint encodings, the supervisor sets the one it wants to use
+#define SETPOINT_ENCODING_FLOAT32 0  // CMD_SET_TENDONS and CMD_SET_SPOOL
+#define SETPOINT_ENCODING_INT16 1  // CMD_SET_SETPOINTS as well
+
+int32_t param_tendon_speed = 2;  // rpm, PositionStepper default
+int32_t param_setpoint_encoding = SETPOINT_ENCODING_FLOAT32;
+int32_t param_link_integrity = INTEGRITY_XOR;  // Link params apply after their PARAM_REPORT
+int32_t param_link_framing = FRAMING_START_BYTE;
+int32_t param_link_baud = BASE_BAUD_RATE;
+int32_t linkBaud = BASE_BAUD_RATE;  // In effect, param_link_baud applies after the report
 
 void initParams() {
     params[0] = {&param_tendon_speed, PARAM_INT32};
+    params[1] = {&param_setpoint_encoding, PARAM_INT32};
+    params[2] = {&param_link_integrity, PARAM_INT32};
+    params[3] = {&param_link_framing, PARAM_INT32};
+    params[4] = {&param_link_baud, PARAM_INT32};
+}
+
+bool isLinkBaudRate(int32_t rate) {
+    for (uint8_t i = 0; i < sizeof(LINK_BAUD_RATES) / sizeof(LINK_BAUD_RATES[0]); i++) {
+        if (LINK_BAUD_RATES[i] == rate) return true;
+    }
+    return false;
 }
 
 PositionStepper tendon1Motor(tendon1MotorPul, tendon1MotorDir, 13, TENDON_STEPS_PER_REV);
@@ -50,15 +87,109 @@ PacketProtocol protocol;
 
 uint8_t mode;
 
+bool running = false;
+unsigned long lastPacketMillis = 0;
+
+void setLinkBaud(int32_t rate) {
+    if (rate == linkBaud) return;
+    Serial.flush();  // Let the last packet out at the old rate
+    Serial.end();
+    Serial.begin(rate);
+    protocol.clearBuffer();  // Anything partial was read at the old rate
+    linkBaud = rate;
+}
+
+void stopMotors() {
+    tendon1Motor.stop();
+    tendon2Motor.stop();
+    tendon3Motor.stop();
+    spoolMotor.stop();
+    running = false;
+}
+
+// Apply one CMD_SET_PARAM entry, the id must already be checked
+void applyParam(const uint8_t* entry) {
+    uint8_t paramId = entry[0];
+    if (params[paramId].type == PARAM_FLOAT) {
+        float value;
+        PacketParser::parseSetParamFloat(entry, PARAM_ENTRY_SIZE, paramId, value);
+        *(float*)params[paramId].ptr = value;
+    } else {
+        int32_t value;
+        PacketParser::parseSetParam(entry, PARAM_ENTRY_SIZE, paramId, value);
+        *(int32_t*)params[paramId].ptr = value;
+
+        // This is bad but I really don't want to find a better way right now
+        if (paramId == 0) {
+            tendon1Motor.setSpeed(value);
+            tendon2Motor.setSpeed(value);
+            tendon3Motor.setSpeed(value);
+        }
+    }
+}
+
+// Report the current value of every param id at the start of each entry
+void sendParamReport(const uint8_t* entries, uint8_t length) {
+    uint8_t report[MAX_PAYLOAD_SIZE];
+    for (uint8_t offset = 0; offset + PARAM_ENTRY_SIZE <= length; offset += PARAM_ENTRY_SIZE) {
+        uint8_t paramId = entries[offset];
+        report[offset] = paramId;
+        memcpy(&report[offset + 1], params[paramId].ptr, 4);  // int32 and float are both 4 bytes
+    }
+    protocol.sendPacket(PARAM_REPORT, report, length);
+}
+
+// Streaming state of one sensor
+struct SensorStream {
+    uint16_t intervalUs;  // 0 when not subscribed
+    unsigned long nextSampleUs;
+    uint32_t firstMillis;  // Time of samples[0]
+    float samples[SENSOR_BATCH_SIZE];
+    uint8_t count;
+};
+
+SensorStream sensorStreams[NUM_SENSORS];
+
+float readSensor(uint8_t sensorId) {
+    switch (sensorId) {
+        case SENSOR_TANK_PRESSURE:
+            // 0.5-4.5 V ratiometric transducer, 0-100 psi
+            return (analogRead(tankPressurePin) / 1023.0 * 5.0 - 0.5) * 25.0;
+        default:
+            return NAN;
+    }
+}
+
+void updateSensorStreams() {
+    unsigned long now = micros();
+    for (uint8_t id = 0; id < NUM_SENSORS; id++) {
+        SensorStream& stream = sensorStreams[id];
+        if (stream.intervalUs == 0 || (long)(now - stream.nextSampleUs) < 0) continue;
+
+        if (stream.count == 0) stream.firstMillis = millis();
+        stream.samples[stream.count++] = readSensor(id);
+        // Stay on the sample grid, a late sample does not delay the next one
+        stream.nextSampleUs += stream.intervalUs;
+
+        if (stream.count == SENSOR_BATCH_SIZE) {
+            protocol.sendSensorBatch(id, stream.firstMillis, stream.intervalUs, stream.samples, stream.count);
+            stream.count = 0;
+        }
+    }
+}
+
 float radsToRevs(float rads) {
     return rads / (2.0 * PI);
 }
 
 // Packet handler callback
 void onPacketReceived(PacketType type, const uint8_t* payload, uint8_t length) {
+    lastPacketMillis = millis();
+
     switch (type) {
         case PING:
-            if (!protocol.sendPong()) {
+            // Echo the payload, the supervisor probes new baud rates with it
+            if (!protocol.sendPacket(PONG, payload, length)) {
                 digitalWrite(LED_BUILTIN, HIGH);
             }
             break;
@@ -68,14 +199,12 @@ void onPacketReceived(PacketType type, const uint8_t* payload, uint8_t length) {
             tendon2Motor.start();
             tendon3Motor.start();
             spoolMotor.start();
+            running = true;
             protocol.sendAck();
             break;
 
         case CMD_STOP:
-            tendon1Motor.stop();
-            tendon2Motor.stop();
-            tendon3Motor.stop();
-            spoolMotor.stop();
+            stopMotors();
             protocol.sendAck();
             break;
 
@@ -89,38 +218,50 @@ void onPacketReceived(PacketType type, const uint8_t* payload, uint8_t length) {
         }
 
         case CMD_SET_PARAM: {
-            uint8_t paramId;
-            if (paramId >= MAX_PARAMS || params[paramId].ptr == nullptr) {
-                protocol.sendNack();
-                return;
-            };
-
-            if (PacketParser::parseSetParamId(payload, length, paramId)) {
-                if (params[paramId].type == PARAM_FLOAT) {
-                    float value;
-                    if (PacketParser::parseSetParamFloat(payload, length, paramId, value)) {
-                        *(float*)params[paramId].ptr = value;
-                    } else {
-                        protocol.sendNack();
-                    }
-                } else {
-                    int32_t value;
-                    if (PacketParser::parseSetParam(payload, length, paramId, value)) {
-                        *(int32_t*)params[paramId].ptr = value;
-
-                        // This is bad but I really don't want to find a better way right now
-                        if (paramId == 0) {
-                            tendon1Motor.setSpeed(value);
-                            tendon2Motor.setSpeed(value);
-                            tendon3Motor.setSpeed(value);
-                        }
-                    } else {
-                        protocol.sendNack();
-                    }
+            // One or more [id][4 byte value] entries, all checked before any is applied
+            uint8_t count = PacketParser::paramEntryCount(length);
+            if (count == 0) {
+                protocol.sendNack(CMD_SET_PARAM);
+                break;
+            }
+            for (uint8_t i = 0; i < count; i++) {
+                uint8_t paramId = payload[i * PARAM_ENTRY_SIZE];
+                if (paramId >= MAX_PARAMS || params[paramId].ptr == nullptr) {
+                    protocol.sendNack(CMD_SET_PARAM);
+                    return;
+                }
+                int32_t rate;
+                if (paramId == 4 && (!PacketParser::parseSetParam(&payload[i * PARAM_ENTRY_SIZE],
+                                                                   PARAM_ENTRY_SIZE, paramId, rate) ||
+                                     !isLinkBaudRate(rate))) {
+                    protocol.sendNack(CMD_SET_PARAM);
+                    return;
                 }
-            } else {
-                protocol.sendNack();
             }
+
+            for (uint8_t i = 0; i < count; i++) {
+                applyParam(&payload[i * PARAM_ENTRY_SIZE]);
+            }
+            sendParamReport(payload, length);
+            // The report still goes out with the old link settings, the supervisor switches when it gets it
+            protocol.setIntegrity(param_link_integrity == INTEGRITY_CRC16 ? INTEGRITY_CRC16 : INTEGRITY_XOR);
+            protocol.setFraming(param_link_framing == FRAMING_COBS ? FRAMING_COBS : FRAMING_START_BYTE);
+            setLinkBaud(param_link_baud);
+            lastPacketMillis = millis();  // Give the supervisor time to switch too
+            break;
+        }
+
+        case CMD_GET_PARAM: {
+            uint8_t ids[MAX_PARAMS * PARAM_ENTRY_SIZE];
+            uint8_t reportLength = 0;
+            for (uint8_t paramId = 0; paramId < MAX_PARAMS; paramId++) {
+                if (params[paramId].ptr != nullptr) {
+                    ids[reportLength] = paramId;
+                    reportLength += PARAM_ENTRY_SIZE;
+                }
+            }
+            sendParamReport(ids, reportLength);
+            break;
         }
 
         case CMD_SET_TENDONS: {
@@ -148,16 +289,69 @@ void onPacketReceived(PacketType type, const uint8_t* payload, uint8_t length) {
             break;
         }
 
+        case CMD_SET_SETPOINTS: {
+            int16_t counts[4];
+            if (param_setpoint_encoding != SETPOINT_ENCODING_INT16 ||
+                !PacketParser::parseSetpoints(payload, length, counts)) {
+                protocol.sendNack(CMD_SET_SETPOINTS);
+                break;
+            }
+            if (counts[0] != SETPOINT_KEEP) {
+                if (!(
+                    tendon1Motor.startMoveToPosition(tendon1Motor.rotationsToSteps(radsToRevs(counts[0] * TENDON_LSB))) &&
+                    tendon2Motor.startMoveToPosition(tendon2Motor.rotationsToSteps(radsToRevs(counts[1] * TENDON_LSB))) &&
+                    tendon3Motor.startMoveToPosition(tendon3Motor.rotationsToSteps(radsToRevs(counts[2] * TENDON_LSB)))
+                )) {
+                    protocol.sendNack(0x00);
+                    break;
+                }
+            }
+            if (counts[3] != SETPOINT_KEEP) {
+                spoolMotor.setSpeed(counts[3] * SPOOL_LSB);
+            }
+            protocol.sendAck();
+            break;
+        }
+
         case CMD_READ_SENSOR: {
             uint8_t sensorId;
-            if (PacketParser::parseReadSensor(payload, length, sensorId)) {
-                // Read sensor and send data
-                // float value = readSensor(sensorId);
-                // protocol.sendSensorData(sensorId, value);
+            if (PacketParser::parseReadSensor(payload, length, sensorId) && sensorId < NUM_SENSORS) {
+                protocol.sendSensorData(sensorId, readSensor(sensorId));
+            } else {
+                protocol.sendNack(CMD_READ_SENSOR);
             }
             break;
         }
 
+        case CMD_SUBSCRIBE: {
+            // One or more [sensor id][uint16 rate Hz] entries, all checked before any is applied
+            if (length == 0 || length % SUBSCRIBE_ENTRY_SIZE != 0) {
+                protocol.sendNack(CMD_SUBSCRIBE);
+                break;
+            }
+            for (uint8_t offset = 0; offset < length; offset += SUBSCRIBE_ENTRY_SIZE) {
+                uint8_t sensorId;
+                uint16_t rate;
+                PacketParser::parseSubscription(&payload[offset], sensorId, rate);
+                if (sensorId >= NUM_SENSORS || rate > MAX_SENSOR_RATE) {
+                    protocol.sendNack(CMD_SUBSCRIBE);
+                    return;
+                }
+            }
+
+            for (uint8_t offset = 0; offset < length; offset += SUBSCRIBE_ENTRY_SIZE) {
+                uint8_t sensorId;
+                uint16_t rate;
+                PacketParser::parseSubscription(&payload[offset], sensorId, rate);
+                SensorStream& stream = sensorStreams[sensorId];
+                stream.intervalUs = rate == 0 ? 0 : 1000000UL / rate;
+                stream.nextSampleUs = micros();
+                stream.count = 0;
+            }
+            protocol.sendAck();
+            break;
+        }
+
         case NACK: {
             break;
         }
@@ -170,7 +364,7 @@ void onPacketReceived(PacketType type, const uint8_t* payload, uint8_t length) {
 
 void setup() {
     initParams();
-    Serial.begin(115200);
+    Serial.begin(BASE_BAUD_RATE);
     protocol.begin(&Serial, onPacketReceived);
 }
 
@@ -185,6 +379,27 @@ void loop() {
         lastStatus = millis();
     }
 
+    // Fail safe if the supervisor stopped talking
+    if (running && millis() - lastPacketMillis > HEARTBEAT_TIMEOUT_MS) {
+        stopMotors();
+        protocol.sendErrorReport(ERROR_HEARTBEAT_TIMEOUT);
+    }
+
+    // A new supervisor session starts with the default link settings, so go back to them when
+    // nothing valid arrives
+    if ((protocol.getIntegrity() != INTEGRITY_XOR || protocol.getFraming() != FRAMING_START_BYTE ||
+         linkBaud != BASE_BAUD_RATE) &&
+        millis() - lastPacketMillis > HEARTBEAT_TIMEOUT_MS) {
+        param_link_integrity = INTEGRITY_XOR;
+        param_link_framing = FRAMING_START_BYTE;
+        param_link_baud = BASE_BAUD_RATE;
+        protocol.setIntegrity(INTEGRITY_XOR);
+        protocol.setFraming(FRAMING_START_BYTE);
+        setLinkBaud(BASE_BAUD_RATE);
+    }
+
+    updateSensorStreams();
+
     tendon1Motor.updatePosition();
     tendon2Motor.updatePosition();
     tendon3Motor.updatePosition();
@@ -0,0 +1,273 @@
+"""
+Compares the headless supervisor core (asyncio SerialTransport and
+PacketCodec) with the GUI stack (QSerialPort SerialManager and the
+PacketStream adapter): start-up time, SENSOR_DATA receive rate and
+PING round trips per second over a pseudo terminal.
+
+Linux/macOS only (needs a pty). Run from the supervisor directory:
+    uv run python -m benchmarks.headless_core
+"""
+
+import asyncio
+import os
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+import tty
+
+from src.config import MCU_BAUD_RATE
+from src.headless import HeadlessSupervisor
+from src.packet_protocol import PacketCodec, PacketProtocol, PacketType
+from src.sensors import SENSOR_BATCH_HEADER
+
+STARTUP_RUNS = 5
+RECEIVE_PACKETS = 50_000
+ROUND_TRIPS = 5_000
+TIMEOUT = 60.0  # Seconds before a run is given up
+
+HEADLESS_STARTUP = """
+import asyncio, os
+from src.headless import HeadlessSupervisor
+
+async def main():
+    master, slave = os.openpty()
+    supervisor = HeadlessSupervisor()
+    supervisor.open(os.ttyname(slave))
+    supervisor.close()
+
+asyncio.run(main())
+"""
+
+GUI_STARTUP = """
+import sys
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+from src.ui import MainWindow
+
+window = MainWindow()
+window.show()
+app.processEvents()
+window.close()
+"""
+
+
+def startup_time(code: str) -> float:
+    """Fastest of a few runs, the whole process from exec to exit"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    times = []
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def sensor_stream() -> bytes:
+    """RECEIVE_PACKETS 16-sample SENSOR_DATA frames back to back"""
+    data = bytearray()
+    for index in range(RECEIVE_PACKETS):
+        values = [random.uniform(0, 100) for _ in range(16)]
+        payload = SENSOR_BATCH_HEADER.pack(0, 16, index * 16, 1000)
+        data += PacketProtocol.create_packet(
+            PacketType.SENSOR_DATA, payload + struct.pack("<16f", *values)
+        )
+    return bytes(data)
+
+
+def open_pty() -> tuple[int, int, str]:
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    return (master, slave, os.ttyname(slave))
+
+
+def write_all(fd: int, data: bytes):
+    """Blocks whenever the pty is full, like a busy executor"""
+    with memoryview(data) as view:
+        while view:
+            view = view[os.write(fd, view) :]
+
+
+def echo(fd: int, stop: threading.Event):
+    """A minimal executor: answers every PING with a PONG"""
+
+    def on_packet(packet_type: int, payload: bytes):
+        if packet_type == PacketType.PING:
+            write_all(fd, codec.encode(PacketType.PONG, payload))
+
+    codec = PacketCodec(on_packet)
+    while not stop.is_set():
+        try:
+            codec.feed(os.read(fd, 65536))
+        except OSError:
+            return
+
+
+def headless_receive(data: bytes) -> float:
+    async def run() -> float:
+        master, slave, name = open_pty()
+        supervisor = HeadlessSupervisor()
+        done = asyncio.get_running_loop().create_future()
+        received = [0]
+
+        def on_data(_: bytes):
+            received[0] += 1
+            if received[0] == RECEIVE_PACKETS:
+                done.set_result(None)
+
+        supervisor.subscribe(PacketType.SENSOR_DATA, on_data)
+        supervisor.open(name)
+        writer = threading.Thread(target=write_all, args=(master, data))
+        start = time.perf_counter()
+        writer.start()
+        await asyncio.wait_for(done, TIMEOUT)
+        elapsed = time.perf_counter() - start
+        writer.join()
+        supervisor.close()
+        os.close(master)
+        os.close(slave)
+        return RECEIVE_PACKETS / elapsed
+
+    return asyncio.run(run())
+
+
+def headless_round_trips() -> float:
+    async def run() -> float:
+        master, slave, name = open_pty()
+        stop = threading.Event()
+        executor = threading.Thread(target=echo, args=(master, stop))
+        executor.start()
+        supervisor = HeadlessSupervisor()
+        done = asyncio.get_running_loop().create_future()
+        returned = [0]
+
+        # Driven from the handler like the Qt version, an awaited ping() costs
+        # an extra loop iteration for resuming the coroutine
+        def on_pong(_: bytes):
+            returned[0] += 1
+            if returned[0] == ROUND_TRIPS:
+                done.set_result(None)
+            else:
+                supervisor.send_packet(PacketType.PING)
+
+        supervisor.open(name)
+        await supervisor.ping()  # The executor is up
+        supervisor.subscribe(PacketType.PONG, on_pong)
+        start = time.perf_counter()
+        supervisor.send_packet(PacketType.PING)
+        await asyncio.wait_for(done, TIMEOUT)
+        elapsed = time.perf_counter() - start
+        supervisor.close()
+        stop.set()
+        os.close(slave)
+        executor.join()
+        os.close(master)
+        return ROUND_TRIPS / elapsed
+
+    return asyncio.run(run())
+
+
+def qt_receive(data: bytes) -> float:
+    from PyQt6.QtCore import QCoreApplication, QTimer
+
+    from src.packet_stream import PacketStream
+    from src.serial_manager import SerialConfig, SerialManager
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    master, slave, name = open_pty()
+    serial = SerialManager(auto_decode=False, add_newline=False)
+    serial.connect(name, SerialConfig(baud_rate=MCU_BAUD_RATE))
+    stream = PacketStream(serial)
+    received = [0]
+
+    def on_packet(packet_type: int, _: bytes):
+        received[0] += 1
+        if received[0] == RECEIVE_PACKETS:
+            app.quit()
+
+    stream.packet_received.connect(on_packet)
+    writer = threading.Thread(target=write_all, args=(master, data))
+    start = time.perf_counter()
+    writer.start()
+    QTimer.singleShot(int(TIMEOUT * 1000), app.quit)
+    app.exec()
+    elapsed = time.perf_counter() - start
+    writer.join()
+    serial.disconnect()
+    os.close(master)
+    os.close(slave)
+    assert received[0] == RECEIVE_PACKETS
+    return RECEIVE_PACKETS / elapsed
+
+
+def qt_round_trips() -> float:
+    from PyQt6.QtCore import QCoreApplication, QTimer
+
+    from src.packet_stream import PacketStream
+    from src.serial_manager import SerialConfig, SerialManager
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    master, slave, name = open_pty()
+    stop = threading.Event()
+    executor = threading.Thread(target=echo, args=(master, stop))
+    executor.start()
+    serial = SerialManager(auto_decode=False, add_newline=False)
+    serial.connect(name, SerialConfig(baud_rate=MCU_BAUD_RATE))
+    stream = PacketStream(serial)
+    returned = [0]
+
+    def on_packet(packet_type: int, _: bytes):
+        if packet_type != PacketType.PONG:
+            return
+        returned[0] += 1
+        if returned[0] == ROUND_TRIPS:
+            app.quit()
+        else:
+            stream.send_packet(PacketType.PING)
+
+    stream.packet_received.connect(on_packet)
+    start = time.perf_counter()
+    stream.send_packet(PacketType.PING)
+    QTimer.singleShot(int(TIMEOUT * 1000), app.quit)
+    app.exec()
+    elapsed = time.perf_counter() - start
+    serial.disconnect()
+    stop.set()
+    os.close(slave)
+    executor.join()
+    os.close(master)
+    assert returned[0] == ROUND_TRIPS
+    return ROUND_TRIPS / elapsed
+
+
+def main():
+    random.seed(0)
+
+    headless = startup_time(HEADLESS_STARTUP)
+    gui = startup_time(GUI_STARTUP)
+    print(f"start-up, fastest of {STARTUP_RUNS} (interpreter included):")
+    print(f"  headless core {headless * 1000:7.0f} ms")
+    print(f"  GUI           {gui * 1000:7.0f} ms  ({gui / headless:.1f}x)")
+
+    data = sensor_stream()
+    print(f"\n{RECEIVE_PACKETS} SENSOR_DATA frames ({len(data) // 1024} KiB):")
+    print(f"  headless core {headless_receive(data):9.0f} packets/s")
+    print(f"  Qt stack      {qt_receive(data):9.0f} packets/s")
+
+    print(f"\n{ROUND_TRIPS} sequential PING round trips:")
+    print(f"  headless core {headless_round_trips():9.0f} round trips/s")
+    print(f"  Qt stack      {qt_round_trips():9.0f} round trips/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Throughput of the batched tip-point IK solver.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.ik_throughput
+"""
+
+import time
+
+import numpy as np
+
+from src.config import MAX_CURVE
+from src.kinematics import TipSolver, forward_kinematics, solve_tip_targets
+
+EVERTED_LENGTH = 1.0  # Meters
+BATCH_SIZES = (1, 1_000, 100_000)
+
+
+def make_targets(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Build reachable targets from random (direction, curvature) pairs"""
+    d = rng.uniform(-np.pi, np.pi, count)
+    c = rng.uniform(0, MAX_CURVE, count)
+    return np.column_stack(forward_kinematics(d, c, EVERTED_LENGTH))
+
+
+def bench(count: int, rng: np.random.Generator, min_time: float = 0.5):
+    targets = make_targets(count, rng)
+
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        solution = solve_tip_targets(targets, EVERTED_LENGTH)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    per_call = elapsed / runs
+    print(
+        f"cold  {count:>7} targets: {per_call * 1e6:10.1f} us/call "
+        f"{count / per_call:14,.0f} targets/s  max err {solution.error.max():.2e} m"
+    )
+
+    # Live use: targets move a little between frames
+    solver = TipSolver()
+    solver.solve(targets, EVERTED_LENGTH)
+    jitter = rng.normal(0, 1e-3, targets.shape)
+
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        solution = solver.solve(targets + jitter, EVERTED_LENGTH)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+
+    per_call = elapsed / runs
+    print(
+        f"warm  {count:>7} targets: {per_call * 1e6:10.1f} us/call "
+        f"{count / per_call:14,.0f} targets/s  max err {solution.error.max():.2e} m"
+    )
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for count in BATCH_SIZES:
+        bench(count, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Runs the baud rate negotiation against a simulated executor and serial
+cable: the rates it settles on, how long that takes, and the probe
+goodput at each rate.
+
+The cable delivers bytes after the time they take at the sender's baud
+rate. Bytes arrive garbled while the two ends run at different rates,
+and each byte is corrupted with a per-rate probability. The simulated
+executor echoes PINGs, applies LINK_BAUD after its PARAM_REPORT, streams
+SENSOR_DATA and returns to the base settings after a second without a
+valid packet or when reset, like the firmware.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.link_negotiation
+"""
+
+import math
+import random
+import struct
+import sys
+import time
+from collections import deque
+
+from PyQt6.QtCore import QCoreApplication, QEventLoop, Qt, QTimer
+
+from src.config import (
+    LINK_BAUD_RATES,
+    LINK_DESYNC_PACKETS,
+    LINK_ERROR_CHECK_INTERVAL,
+    LINK_ERROR_LIMIT,
+    LINK_FALLBACK_WAIT,
+    LINK_FRAMING,
+    LINK_INTEGRITY,
+    LINK_PROBE_PAYLOAD,
+    LINK_PROBE_PINGS,
+    LINK_PROBE_TIMEOUT,
+    LINK_PROBE_WINDOW,
+    MCU_BAUD_RATE,
+    MCU_PRAMS,
+    PARAM_COALESCE_INTERVAL,
+)
+from src.link_speed import LinkSpeedNegotiator, LinkSpeedState
+from src.packet_protocol import Framing, Integrity, PacketBuilder, PacketType
+from src.packet_stream import PacketStream
+from src.param_mirror import ParameterMirror
+from src.params import decode_params, encode_params
+from src.sensors import SENSOR_BATCH_HEADER
+from src.serial_manager import SerialManager
+
+BITS_PER_BYTE = 10  # 8N1
+SILENCE_TIMEOUT = 1.0  # Seconds, HEARTBEAT_TIMEOUT_MS in the executor
+SENSOR_INTERVAL = 16  # Milliseconds between 16-sample batches, 1 kHz
+BASE_SETTINGS = {
+    MCU_PRAMS.LINK_INTEGRITY: Integrity.XOR,
+    MCU_PRAMS.LINK_FRAMING: Framing.START_BYTE,
+    MCU_PRAMS.LINK_BAUD: MCU_BAUD_RATE,
+}  # Every session starts with these
+
+
+class SimulatedPort(SerialManager):
+    """One end of the simulated cable"""
+
+    def __init__(self, cable: "Cable"):
+        super().__init__(auto_decode=False)
+        self.cable = cable
+        self.peer: SimulatedPort | None = None
+        self.baud_rate = MCU_BAUD_RATE
+        self.busy_until = 0.0  # When the last queued byte is out
+        self.in_flight: deque[tuple[float, int, bytes]] = deque()  # (due, rate, data)
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+
+    def is_connected(self) -> bool:
+        return True
+
+    def send_bytes(self, data: bytes, throw_error: bool = True) -> bool:
+        self.cable.transmit(self, data)
+        return True
+
+    def set_baud_rate(self, baud_rate: int) -> bool:
+        self.baud_rate = baud_rate
+        return True
+
+    def get_baud_rate(self) -> int:
+        return self.baud_rate
+
+
+class Cable:
+    def __init__(self, byte_errors: dict[int, float]):
+        """
+        Args:
+            byte_errors: Baud rate -> chance each byte is corrupted
+        """
+        self.byte_errors = byte_errors
+        self.supervisor = SimulatedPort(self)
+        self.executor = SimulatedPort(self)
+        self.supervisor.peer = self.executor
+        self.executor.peer = self.supervisor
+        for port in (self.supervisor, self.executor):
+            port.timer.timeout.connect(lambda port=port: self._arrive(port))
+
+    def transmit(self, sender: SimulatedPort, data: bytes):
+        now = time.monotonic()
+        rate = sender.baud_rate
+        sender.busy_until = max(sender.busy_until, now) + (
+            len(data) * BITS_PER_BYTE / rate
+        )
+        sender.in_flight.append((sender.busy_until, rate, data))
+        if not sender.timer.isActive():
+            self._arrive(sender)
+
+    def _arrive(self, sender: SimulatedPort):
+        """Deliver what is due in order, then wait for the next packet"""
+        while sender.in_flight and sender.in_flight[0][0] <= time.monotonic():
+            _, rate, data = sender.in_flight.popleft()
+            self._deliver(sender.peer, rate, data)
+        if sender.in_flight:
+            wait = sender.in_flight[0][0] - time.monotonic()
+            sender.timer.start(max(0, math.ceil(wait * 1000)))
+
+    def _deliver(self, receiver: SimulatedPort, rate: int, data: bytes):
+        if receiver.baud_rate != rate:
+            data = random.randbytes(len(data) * rate // receiver.baud_rate + 1)
+        else:
+            error = self.byte_errors.get(rate, 0.0)
+            data = bytes(
+                random.randrange(256) if random.random() < error else b for b in data
+            )
+        receiver.data_received_raw.emit(data)
+
+
+class SimulatedExecutor:
+    def __init__(self, port: SimulatedPort):
+        self.port = port
+        self.stream = PacketStream(port)
+        self.stream.packet_received.connect(self._on_packet)
+        self.last_packet = time.monotonic()
+        self.sample = 0
+
+        self.sensor_timer = QTimer()
+        self.sensor_timer.timeout.connect(self._send_sensor_batch)
+        self.sensor_timer.start(SENSOR_INTERVAL)
+        self.watchdog = QTimer()
+        self.watchdog.timeout.connect(self._check_silence)
+        self.watchdog.start(50)
+
+    def _on_packet(self, packet_type: int, payload: bytes):
+        self.last_packet = time.monotonic()
+        if packet_type == PacketType.PING:
+            self.stream.send_packet(PacketType.PONG, payload)
+        elif packet_type == PacketType.CMD_GET_PARAM:
+            self._report(self._link_params())
+        elif packet_type == PacketType.CMD_SET_PARAM:
+            values = self._link_params() | decode_params(payload)
+            if values[MCU_PRAMS.LINK_BAUD] not in LINK_BAUD_RATES:
+                self.stream.send_packet(
+                    PacketType.NACK, PacketBuilder.nack(PacketType.CMD_SET_PARAM)
+                )
+                return
+            self._report(values)  # Still with the old settings
+            self._apply(values)
+
+    def _link_params(self) -> dict[int, int]:
+        return {
+            MCU_PRAMS.LINK_INTEGRITY: self.stream.codec.integrity,
+            MCU_PRAMS.LINK_FRAMING: self.stream.codec.framing,
+            MCU_PRAMS.LINK_BAUD: self.port.baud_rate,
+        }
+
+    def _apply(self, values: dict[int, int]):
+        self.stream.set_integrity(Integrity(values[MCU_PRAMS.LINK_INTEGRITY]))
+        self.stream.set_framing(Framing(values[MCU_PRAMS.LINK_FRAMING]))
+        self._set_baud_rate(values[MCU_PRAMS.LINK_BAUD])
+
+    def reset(self):
+        """Brownout: back to the base settings at once"""
+        self._apply(BASE_SETTINGS)
+        self.stream.clear_buffer()
+
+    def _set_baud_rate(self, rate: int):
+        if rate != self.port.baud_rate:
+            self.port.set_baud_rate(rate)
+            self.stream.clear_buffer()
+
+    def _report(self, values: dict[int, int]):
+        self.stream.send_packet(PacketType.PARAM_REPORT, encode_params(values))
+
+    def _send_sensor_batch(self):
+        values = [random.uniform(0, 30) for _ in range(16)]
+        payload = SENSOR_BATCH_HEADER.pack(0, 16, self.sample, 1000) + struct.pack(
+            "<16f", *values
+        )
+        self.sample += 16
+        self.stream.send_packet(PacketType.SENSOR_DATA, payload)
+
+    def _check_silence(self):
+        if (
+            self._link_params() != BASE_SETTINGS
+            and time.monotonic() - self.last_packet > SILENCE_TIMEOUT
+        ):
+            self.reset()
+
+
+class Supervisor:
+    """The part of the main window that negotiates, wired the same way"""
+
+    def __init__(self, port: SimulatedPort, log):
+        self.port = port
+        self.log = log
+        self.stream = PacketStream(port)
+        self.mirror = ParameterMirror(PARAM_COALESCE_INTERVAL)
+        self.mirror.send_requested.connect(
+            lambda payload: self.stream.send_packet(PacketType.CMD_SET_PARAM, payload)
+        )
+        self.mirror.confirmed.connect(self._on_confirmed)
+        self.mirror.set(MCU_PRAMS.LINK_INTEGRITY, LINK_INTEGRITY)
+        self.mirror.set(MCU_PRAMS.LINK_FRAMING, LINK_FRAMING)
+        self.mirror.set(MCU_PRAMS.LINK_BAUD, MCU_BAUD_RATE)
+
+        self.negotiator = LinkSpeedNegotiator(
+            self.stream,
+            MCU_BAUD_RATE,
+            LINK_BAUD_RATES,
+            LINK_PROBE_PINGS,
+            LINK_PROBE_WINDOW,
+            LINK_PROBE_PAYLOAD,
+            LINK_PROBE_TIMEOUT,
+            LINK_FALLBACK_WAIT,
+            LINK_ERROR_CHECK_INTERVAL,
+            LINK_ERROR_LIMIT,
+            LINK_DESYNC_PACKETS,
+        )
+        self.negotiator.rate_requested.connect(
+            lambda rate: self.mirror.set(MCU_PRAMS.LINK_BAUD, rate)
+        )
+        self.negotiator.fallback_requested.connect(self._on_fallback)
+        self.negotiator.resync_requested.connect(self._on_resync)
+        self.negotiator.rate_verified.connect(
+            lambda rate, trips, goodput: log(
+                f"verified {rate:>7} baud: {trips:5.0f} round trips/s, "
+                f"goodput {goodput / 1000:6.1f} kB/s"
+            )
+        )
+        self.stream.packet_received.connect(self._on_packet)
+
+        self.heartbeat = QTimer()
+        self.heartbeat.timeout.connect(
+            lambda: self.stream.send_packet(PacketType.PING, PacketBuilder.ping())
+        )
+
+    def connect(self):
+        self.heartbeat.start(250)
+        self.mirror.set_online(True)
+        self.stream.send_packet(PacketType.CMD_GET_PARAM)
+
+    def _on_packet(self, packet_type: int, payload: bytes):
+        if packet_type == PacketType.PARAM_REPORT:
+            self.mirror.confirm(decode_params(payload))
+        elif packet_type == PacketType.NACK:
+            self.mirror.reject()
+            self.negotiator.rejected()
+
+    def _on_confirmed(self, param_id: int, value: int):
+        if param_id == MCU_PRAMS.LINK_INTEGRITY:
+            self.stream.set_integrity(Integrity(value))
+        elif param_id == MCU_PRAMS.LINK_FRAMING:
+            self.stream.set_framing(Framing(value))
+        elif param_id == MCU_PRAMS.LINK_BAUD:
+            if value != self.port.baud_rate:
+                self.port.set_baud_rate(value)
+                self.stream.clear_buffer()
+            self.negotiator.confirmed(value)
+        if self.negotiator.state == LinkSpeedState.IDLE and self.mirror.settled():
+            self.negotiator.start(self.port.baud_rate)
+
+    def _on_fallback(self, reason: str):
+        self.log(f"falling back to {MCU_BAUD_RATE} baud: {reason}")
+        self.mirror.set_online(False)
+        self.stream.set_integrity(Integrity.XOR)
+        self.stream.set_framing(Framing.START_BYTE)
+        self.port.set_baud_rate(MCU_BAUD_RATE)
+        self.stream.clear_buffer()
+
+    def _on_resync(self):
+        self.log("resyncing")
+        self.mirror.set_online(True)
+        self.stream.send_packet(PacketType.CMD_GET_PARAM)
+
+
+def run_until(condition, timeout: float):
+    loop = QEventLoop()
+    check = QTimer()
+    check.timeout.connect(lambda: condition() and loop.quit())
+    check.start(10)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec()
+    check.stop()
+
+
+def scenario(
+    name: str,
+    byte_errors: dict[int, float],
+    degrade: float | None = None,
+    reset: bool = False,
+):
+    """
+    Args:
+        name: Printed heading
+        byte_errors: Baud rate -> chance each byte is corrupted
+        degrade: Byte error rate at the settled rate once settled, if any
+        reset: Reset the executor once settled
+    """
+    print(f"\n{name}:")
+    start = time.monotonic()
+
+    def log(text: str):
+        print(f"  {time.monotonic() - start:6.2f} s  {text}")
+
+    cable = Cable(byte_errors)
+    executor = SimulatedExecutor(cable.executor)
+    supervisor = Supervisor(cable.supervisor, log)
+    supervisor.connect()
+
+    def stable():
+        return supervisor.negotiator.state == LinkSpeedState.STABLE
+
+    run_until(stable, 20)
+    log(f"stable at {cable.supervisor.baud_rate} baud")
+
+    if degrade is not None:
+        rate = cable.supervisor.baud_rate
+        cable.byte_errors[rate] = degrade
+        log(f"cable starts corrupting {degrade:.1%} of bytes at {rate} baud")
+        run_until(lambda: stable() and cable.supervisor.baud_rate != rate, 20)
+        log(f"stable at {cable.supervisor.baud_rate} baud")
+
+    if reset:
+        run_until(lambda: False, 0.5)
+        executor.reset()
+        log("executor reset")
+        run_until(lambda: supervisor.negotiator.state != LinkSpeedState.STABLE, 5)
+        run_until(stable, 20)
+        log(f"stable at {cable.supervisor.baud_rate} baud")
+
+    assert cable.supervisor.baud_rate == cable.executor.baud_rate
+    assert supervisor.stream.codec.integrity == executor.stream.codec.integrity
+    assert supervisor.stream.codec.framing == executor.stream.codec.framing
+    supervisor.heartbeat.stop()
+    supervisor.negotiator.stop()
+    executor.sensor_timer.stop()
+    executor.watchdog.stop()
+
+
+def main():
+    _app = QCoreApplication(sys.argv)
+    random.seed(0)
+
+    scenario("clean cable", {})
+    scenario("cable too long for 1 Mbaud", {1_000_000: 2e-3})
+    scenario("noise appears while running", {}, degrade=5e-3)
+    scenario("executor resets at 1 Mbaud", {}, reset=True)
+    scenario(
+        "executor resets on a cable only good for the base rate",
+        {rate: 5e-2 for rate in LINK_BAUD_RATES if rate != MCU_BAUD_RATE},
+        reset=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
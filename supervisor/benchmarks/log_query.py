@@ -0,0 +1,101 @@
+"""
+Query latency over a full packet log.
+
+Fills a PacketLog with a simulated session (tendon and spool commands,
+ACKs, status updates and the odd NACK) and times typical diagnostic
+queries.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.log_query
+"""
+
+import struct
+import time
+
+import numpy as np
+
+from src.config import MAX_TENDON_VALUE
+from src.packet_log import PacketDirection, PacketLog
+from src.packet_protocol import PacketType
+
+PACKETS = 500_000
+PACKET_RATE = 150  # Packets per second
+
+
+def fill(log: PacketLog, rng: np.random.Generator):
+    tendons = rng.uniform(-MAX_TENDON_VALUE, MAX_TENDON_VALUE, (PACKETS, 3))
+    start = time.perf_counter()
+    for i in range(PACKETS):
+        timestamp = i / PACKET_RATE
+        kind = i % 10
+        if kind < 4:
+            log.append(
+                PacketDirection.SENT,
+                PacketType.CMD_SET_TENDONS,
+                struct.pack("<fff", *tendons[i]),
+                timestamp,
+            )
+        elif kind == 4:
+            log.append(
+                PacketDirection.SENT,
+                PacketType.CMD_SET_SPOOL,
+                struct.pack("<f", 1.0),
+                timestamp,
+            )
+        elif kind == 9 and i % 1000 == 9:
+            log.append(PacketDirection.RECEIVED, PacketType.NACK, b"\xff", timestamp)
+        elif kind == 9 and i % 150 == 9:
+            log.append(
+                PacketDirection.RECEIVED,
+                PacketType.STATUS_UPDATE,
+                struct.pack("<BBI", 0, 0, int(timestamp * 1000)),
+                timestamp,
+            )
+        else:
+            log.append(PacketDirection.RECEIVED, PacketType.ACK, b"\x00", timestamp)
+    elapsed = time.perf_counter() - start
+    print(f"append: {elapsed / PACKETS * 1e9:.0f} ns/packet ({len(log)} in log)")
+
+
+def bench(name: str, query, repeat: int = 20):
+    result = query()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        query()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{name:<40} {elapsed * 1000:8.3f} ms  {len(result):>7} matches")
+
+
+def main():
+    log = PacketLog()
+    fill(log, np.random.default_rng(0))
+    now = (PACKETS - 1) / PACKET_RATE
+
+    bench(
+        "NACK in the last 10 minutes",
+        lambda: log.query(PacketType.NACK, since=now - 600),
+    )
+    bench(
+        "CMD_SET_TENDONS with tendon 2 > 3 rad",
+        lambda: log.query(
+            PacketType.CMD_SET_TENDONS, where=lambda f: f["tendon_2"] > 3
+        ),
+    )
+    bench(
+        "CMD_SET_TENDONS in the last minute",
+        lambda: log.query(PacketType.CMD_SET_TENDONS, since=now - 60),
+    )
+    bench(
+        "everything received",
+        lambda: log.query(direction=PacketDirection.RECEIVED),
+    )
+    bench(
+        "STATUS_UPDATE with uptime > 1000 s",
+        lambda: log.query(
+            PacketType.STATUS_UPDATE, where=lambda f: f["uptime"] > 1_000_000
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
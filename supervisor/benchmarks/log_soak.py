@@ -0,0 +1,94 @@
+"""
+Soak test for the serial log: an hour of simulated traffic through
+PacketLog and its table view, reporting memory and per-packet cost
+for each simulated 5 minutes. Both should stay flat once the ring is
+full.
+
+Run from the supervisor directory:
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.log_soak
+"""
+
+import struct
+import sys
+import time
+import tracemalloc
+
+from PyQt6.QtWidgets import QApplication, QTableView
+
+from src.config import LOG_REFRESH_INTERVAL
+from src.log_view import PacketLogView
+from src.packet_log import PacketDirection, PacketLog
+from src.packet_protocol import PacketType
+
+PACKET_RATE = 150  # Packets per second, tendons + spool + ACKs
+DURATION = 60 * 60  # Simulated seconds
+REPORT_INTERVAL = 5 * 60  # Simulated seconds
+FRAME_TIME = LOG_REFRESH_INTERVAL / 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    tracemalloc.start()
+    view = QTableView()
+    view.resize(800, 600)
+    log = PacketLog()
+    log_view = PacketLogView(view, log, LOG_REFRESH_INTERVAL)
+    log_view.timer.stop()  # Flushed by hand on simulated time
+    view.show()
+    app.processEvents()
+
+    packets_per_frame = PACKET_RATE * FRAME_TIME
+
+    sim_time = 0.0
+    next_report = REPORT_INTERVAL
+    next_paint = 1.0
+    owed = 0.0
+    append_time = 0.0
+    flush_time = 0.0
+    appended = 0
+
+    print(
+        f"{'minute':>6} {'rows':>8} {'memory KiB':>11} {'append ns/pkt':>14} {'flush us/frame':>15}"
+    )
+    frames = 0
+    while sim_time < DURATION:
+        owed += packets_per_frame
+        count = int(owed)
+        owed -= count
+        # Fresh payload objects, like the parser hands out
+        payloads = [struct.pack("<fff", sim_time, -0.2, 0.3) for _ in range(count)]
+
+        start = time.perf_counter_ns()
+        for payload in payloads:
+            if appended % 2:
+                log.append(PacketDirection.RECEIVED, PacketType.ACK, b"\x00", sim_time)
+            else:
+                log.append(
+                    PacketDirection.SENT, PacketType.CMD_SET_TENDONS, payload, sim_time
+                )
+            appended += 1
+        append_time += time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        log_view.refresh()
+        flush_time += time.perf_counter_ns() - start
+        frames += 1
+
+        sim_time += FRAME_TIME
+        if sim_time >= next_paint:
+            app.processEvents()
+            next_paint += 1.0
+
+        if sim_time >= next_report:
+            current, _ = tracemalloc.get_traced_memory()
+            print(
+                f"{sim_time / 60:6.0f} {log_view.model.rowCount():8} {current / 1024:11.0f} "
+                f"{append_time / appended:14.0f} {flush_time / frames / 1000:15.1f}"
+            )
+            append_time = flush_time = 0.0
+            appended = frames = 0
+            next_report += REPORT_INTERVAL
+
+
+if __name__ == "__main__":
+    main()
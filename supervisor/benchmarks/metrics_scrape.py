@@ -0,0 +1,126 @@
+"""
+Scrapes the supervisor's Prometheus endpoint on localhost while packets
+stream through an offscreen MainWindow, then once more while the GUI
+thread is stuck in a slow slot. Checks the text format, that the packet
+counts match what was fed in and that the stuck GUI thread does not
+hold up the scrape. Exits with status 1 on any failure, for CI.
+
+Run from the supervisor directory:
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.metrics_scrape
+"""
+
+import re
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+from src.packet_protocol import PacketCodec, PacketType
+from src.ui import MainWindow
+
+PACKETS = 20_000
+BATCH = 200  # Packets fed per timer tick
+SCRAPES = 200
+STALL = 1.0  # Seconds the GUI thread is kept busy
+SCRAPE_LIMIT = 0.2  # Seconds a scrape may take while the GUI thread is busy
+
+SAMPLE_LINE = re.compile(
+    r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"'
+    r'(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? \S+$'
+)
+
+
+def scrape(url: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=5) as response:
+        body = response.read().decode()
+    return (body, time.perf_counter() - start)
+
+
+def sample(body: str, name: str) -> float | None:
+    for line in body.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[-1])
+    return None
+
+
+def main():
+    app = QApplication(sys.argv)
+    window = MainWindow(metrics_port=0)
+    assert window.metrics_server is not None
+    url = f"http://127.0.0.1:{window.metrics_server.port}/metrics"
+
+    codec = PacketCodec(lambda *_: None)
+    chunk = codec.encode(PacketType.STATUS_UPDATE, bytes(12)) * BATCH
+    fed = [0]
+
+    def feed():
+        # Straight into the receive path, as if read from the port
+        window.serial_mgr.bytes_received += len(chunk)
+        window.packet_stream.on_data_received(chunk)
+        fed[0] += BATCH
+        if fed[0] >= PACKETS:
+            feeder.stop()
+            QTimer.singleShot(200, stall)
+
+    def stall():
+        end = time.perf_counter() + STALL
+        while time.perf_counter() < end:
+            pass
+        app.quit()
+
+    times: list[float] = []
+    stalled_times: list[float] = []
+
+    def scraper():
+        for _ in range(SCRAPES):
+            times.append(scrape(url)[1])
+        while fed[0] < PACKETS:
+            time.sleep(0.01)
+        time.sleep(0.4)  # Into the stall
+        stalled_times.append(scrape(url)[1])
+
+    feeder = QTimer()
+    feeder.timeout.connect(feed)
+    feeder.start(1)
+    thread = threading.Thread(target=scraper)
+    thread.start()
+    app.exec()
+    thread.join()
+
+    body, _ = scrape(url)
+    window.close()
+
+    failures = []
+    for line in body.splitlines():
+        if not line.startswith("#") and not SAMPLE_LINE.match(line):
+            failures.append(f"malformed line: {line}")
+    received = sample(body, 'supervisor_packets_received_total{type="STATUS_UPDATE"}')
+    if received != fed[0]:
+        failures.append(f"{received} STATUS_UPDATE counted, {fed[0]} fed")
+    if stalled_times[0] > SCRAPE_LIMIT:
+        failures.append(
+            f"scrape took {stalled_times[0] * 1000:.0f} ms while the GUI thread was busy"
+        )
+
+    times.sort()
+    print(
+        f"{SCRAPES} scrapes while receiving {PACKETS} packets: median "
+        f"{statistics.median(times) * 1000:.2f} ms, "
+        f"p99 {times[int(len(times) * 0.99)] * 1000:.2f} ms"
+    )
+    print(f"scrape with the GUI thread busy: {stalled_times[0] * 1000:.2f} ms")
+    print(f"{len(body)} bytes, {body.count(chr(10))} lines")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
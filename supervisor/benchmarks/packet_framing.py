@@ -0,0 +1,138 @@
+"""
+Compares START_BYTE framing with COBS framing: how fast packets are
+framed and extracted from the receive stream, and how many good packets
+are lost after a single corrupted or dropped byte.
+
+With START_BYTE framing a 0xAA inside a payload can be taken for a
+packet start, whose bogus length then swallows the packets after it.
+A COBS frame always ends at the next 0x00, so only the damaged packet
+is lost.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.packet_framing
+"""
+
+import random
+import struct
+import sys
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from src.packet_protocol import (
+    Framing,
+    Integrity,
+    PacketProtocol,
+    PacketType,
+)
+from src.packet_stream import PacketStream
+from src.sensors import SENSOR_BATCH_HEADER
+from src.serial_manager import SerialManager
+
+STREAM_PACKETS = 20_000
+CHUNK_SIZE = 64  # Bytes per readyRead, roughly what a USB serial adapter delivers
+RECOVERY_TRIALS = 2000
+RECOVERY_PACKETS = 40
+
+
+def sensor_batch(index: int) -> bytes:
+    """A 16-sample SENSOR_DATA batch of noisy floats, some containing 0xAA or 0x00"""
+    values = [random.uniform(-100, 100) for _ in range(16)]
+    payload = SENSOR_BATCH_HEADER.pack(0, 16, index * 16, 1000) + struct.pack(
+        "<16f", *values
+    )
+    return payload
+
+
+def make_stream(framing: Framing, count: int) -> tuple[bytes, list[int]]:
+    """Packets back to back, and the offset each one starts at"""
+    data = bytearray()
+    offsets = []
+    for index in range(count):
+        offsets.append(len(data))
+        data += PacketProtocol.create_packet(
+            PacketType.SENSOR_DATA, sensor_batch(index), Integrity.XOR, framing
+        )
+    return (bytes(data), offsets)
+
+
+def new_stream(framing: Framing) -> tuple[PacketStream, list[bytes]]:
+    stream = PacketStream(SerialManager())
+    stream.set_framing(framing)
+    received: list[bytes] = []
+    stream.packet_received.connect(lambda _, payload: received.append(payload))
+    return (stream, received)
+
+
+def encode_rate(framing: Framing, min_time: float = 0.3) -> float:
+    payload = sensor_batch(0)
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(1000):
+            PacketProtocol.create_packet(
+                PacketType.SENSOR_DATA, payload, Integrity.XOR, framing
+            )
+        runs += 1000
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs / elapsed
+
+
+def decode_rate(framing: Framing) -> float:
+    data, _ = make_stream(framing, STREAM_PACKETS)
+    stream, received = new_stream(framing)
+    start = time.perf_counter()
+    for offset in range(0, len(data), CHUNK_SIZE):
+        stream.on_data_received(data[offset : offset + CHUNK_SIZE])
+    elapsed = time.perf_counter() - start
+    assert len(received) == STREAM_PACKETS
+    return STREAM_PACKETS / elapsed
+
+
+def lost_after_corruption(framing: Framing, drop: bool) -> int:
+    """Good packets lost when one byte of one packet is dropped or replaced"""
+    data, offsets = make_stream(framing, RECOVERY_PACKETS)
+    victim = RECOVERY_PACKETS // 4
+    position = random.randrange(offsets[victim], offsets[victim + 1])
+
+    data = bytearray(data)
+    if drop:
+        del data[position]
+    else:
+        data[position] ^= random.randrange(1, 256)
+
+    stream, received = new_stream(framing)
+    for offset in range(0, len(data), CHUNK_SIZE):
+        stream.on_data_received(bytes(data[offset : offset + CHUNK_SIZE]))
+    return RECOVERY_PACKETS - 1 - len(received)
+
+
+def main():
+    _app = QCoreApplication(sys.argv)
+    random.seed(0)
+
+    print(f"framing rate, 72 B SENSOR_DATA payload ({CHUNK_SIZE} B reads):")
+    for framing in Framing:
+        print(
+            f"  {framing.name:<10} encode {encode_rate(framing):8.0f} packets/s, "
+            f"stream decode {decode_rate(framing):8.0f} packets/s"
+        )
+
+    print(
+        f"\ngood packets lost after one bad byte, {RECOVERY_TRIALS} trials "
+        f"of {RECOVERY_PACKETS} packets:"
+    )
+    for name, drop in (("byte dropped", True), ("byte changed", False)):
+        for framing in Framing:
+            losses = [
+                lost_after_corruption(framing, drop) for _ in range(RECOVERY_TRIALS)
+            ]
+            print(
+                f"  {name}, {framing.name:<10} mean {sum(losses) / len(losses):5.2f}  "
+                f"max {max(losses):2d}  trials with loss {sum(1 for n in losses if n > 0)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Compares the XOR checksum with the CRC-16 integrity mode: how fast
+packets are created and validated, and how many random corruptions
+each lets through.
+
+First checks what CRC-16 guarantees, by trying every error of each
+kind on real packets, with bits numbered in the order the UART sends
+them (LSB first within each byte): every 1 and 2 bit flip and every byte swap
+on packets with GUARANTEE_PAYLOADS bytes of payload, and every burst of
+up to 16 bits (first and last bit flipped) at every offset of one with
+BURST_PAYLOAD bytes. Exits with status 1 if CRC-16 lets any through.
+4 bit flips and longer bursts are only reported.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.packet_integrity
+"""
+
+import itertools
+import random
+import sys
+import time
+
+from src.packet_protocol import (
+    Integrity,
+    PacketProtocol,
+    PacketType,
+    crc16,
+    crc16_table,
+)
+
+PAYLOAD_SIZES = (0, 12, 64, 255)
+TRIALS = 100_000
+GUARANTEE_PAYLOADS = (4, 32)  # Bytes, flips and swaps are tried exhaustively
+BURST_PAYLOAD = 4  # Bytes, every burst at every offset is ~1.6M packets
+MAX_BURST = 16  # Bits, the longest burst CRC-16 always detects
+
+
+def throughput(size: int, integrity: Integrity, min_time: float = 0.3) -> float:
+    """Packets per second created and validated"""
+    payload = random.randbytes(size)
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(1000):
+            packet = PacketProtocol.create_packet(
+                PacketType.SENSOR_DATA, payload, integrity
+            )
+            PacketProtocol.validate_packet(packet, integrity)
+        runs += 1000
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs / elapsed
+
+
+def flip_bits(packet: bytearray, count: int):
+    for bit in random.sample(range(8, len(packet) * 8), count):  # Not START
+        packet[bit // 8] ^= 1 << (bit % 8)
+
+
+def burst(packet: bytearray, length: int):
+    """Flip a run of bits, first and last always flipped"""
+    start = random.randrange(8, len(packet) * 8 - length + 1)
+    for bit in range(start, start + length):
+        if bit in (start, start + length - 1) or random.random() < 0.5:
+            packet[bit // 8] ^= 1 << (bit % 8)
+
+
+def swap_bytes(packet: bytearray):
+    while True:
+        i, j = random.sample(range(3, len(packet) - 1), 2)  # Payload only
+        if packet[i] != packet[j]:
+            packet[i], packet[j] = packet[j], packet[i]
+            return
+
+
+CORRUPTIONS = {
+    "1 bit flip": lambda p: flip_bits(p, 1),
+    "2 bit flips": lambda p: flip_bits(p, 2),
+    "4 bit flips": lambda p: flip_bits(p, 4),
+    "16 bit burst": lambda p: burst(p, 16),
+    "24 bit burst": lambda p: burst(p, 24),
+    "byte swap": swap_bytes,
+}
+
+
+def flip_masks(size: int, count: int):
+    """Every way to flip `count` bits of a packet, START_BYTE excluded"""
+    for bits in itertools.combinations(range(8, size * 8), count):
+        yield sum(1 << bit for bit in bits)
+
+
+def burst_masks(size: int, max_length: int):
+    """Every burst of up to max_length bits at every offset, START_BYTE excluded"""
+    for length in range(1, max_length + 1):
+        inner = range(2 ** (length - 2)) if length >= 2 else (0,)
+        for middle in inner:
+            pattern = 1 | (middle << 1) | (1 << (length - 1))
+            for start in range(8, size * 8 - length + 1):
+                yield pattern << start
+
+
+def swap_masks(packet: bytes):
+    """Every swap of two different bytes, START_BYTE excluded"""
+    for i, j in itertools.combinations(range(1, len(packet)), 2):
+        if packet[i] != packet[j]:
+            difference = packet[i] ^ packet[j]
+            yield difference << (8 * i) | difference << (8 * j)
+
+
+def missed(packet: bytes, masks) -> tuple[int, int]:
+    """Corruptions tried and how many still validated as CRC-16 packets"""
+    value = int.from_bytes(packet, "little")
+    tried = 0
+    passed = 0
+    for mask in masks:
+        tried += 1
+        corrupted = (value ^ mask).to_bytes(len(packet), "little")
+        if PacketProtocol.validate_packet(corrupted, Integrity.CRC16):
+            passed += 1
+    return (tried, passed)
+
+
+def check_guarantees() -> bool:
+    """Print every exhaustive check, True if CRC-16 caught everything"""
+    checks = []
+    for size in GUARANTEE_PAYLOADS:
+        packet = PacketProtocol.create_packet(
+            PacketType.SENSOR_DATA, random.randbytes(size), Integrity.CRC16
+        )
+        checks += [
+            (f"1 bit flips, {size} B", missed(packet, flip_masks(len(packet), 1))),
+            (f"2 bit flips, {size} B", missed(packet, flip_masks(len(packet), 2))),
+            (f"byte swaps, {size} B", missed(packet, swap_masks(packet))),
+        ]
+    packet = PacketProtocol.create_packet(
+        PacketType.SENSOR_DATA, random.randbytes(BURST_PAYLOAD), Integrity.CRC16
+    )
+    checks.append(
+        (
+            f"<= {MAX_BURST} bit bursts, {BURST_PAYLOAD} B",
+            missed(packet, burst_masks(len(packet), MAX_BURST)),
+        )
+    )
+
+    for name, (tried, passed) in checks:
+        print(f"  {name:<22} {passed:>3} of {tried:>7} undetected")
+    return not any(passed for _, (_, passed) in checks)
+
+
+def undetected(integrity: Integrity, corrupt) -> int:
+    missed = 0
+    for _ in range(TRIALS):
+        payload = random.randbytes(random.randint(4, 32))
+        packet = bytearray(
+            PacketProtocol.create_packet(PacketType.SENSOR_DATA, payload, integrity)
+        )
+        corrupt(packet)
+        if PacketProtocol.validate_packet(bytes(packet), integrity):
+            missed += 1
+    return missed
+
+
+def main():
+    random.seed(0)
+    for data in (b"123456789", random.randbytes(255)):
+        assert crc16(data) == crc16_table(data)
+    print(f"CRC-16 implementation: {crc16.__name__}")
+
+    print("\nCRC-16 guarantees, every error of each kind:")
+    guaranteed = check_guarantees()
+
+    print("\ncreate + validate, packets/s:")
+    print(f"  {'payload':>7}  {'XOR':>9}  {'CRC-16':>9}")
+    for size in PAYLOAD_SIZES:
+        xor = throughput(size, Integrity.XOR)
+        crc = throughput(size, Integrity.CRC16)
+        print(f"  {size:>5} B  {xor:9.0f}  {crc:9.0f}")
+
+    print(f"\nundetected corruptions out of {TRIALS}:")
+    print(f"  {'corruption':<13} {'XOR':>6} {'CRC-16':>7}")
+    for name, corrupt in CORRUPTIONS.items():
+        xor = undetected(Integrity.XOR, corrupt)
+        crc = undetected(Integrity.CRC16, corrupt)
+        print(f"  {name:<13} {xor:>6} {crc:>7}")
+
+    if not guaranteed:
+        print("FAIL: CRC-16 missed an error it must always detect")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
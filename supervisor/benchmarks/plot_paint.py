@@ -0,0 +1,69 @@
+"""
+Offscreen paint cost of TelemetryPlot as the amount of history on
+screen grows, with a few new samples arriving between paints. With
+cached min/max columns the cost should follow the widget width, not the
+sample count.
+
+Run from the supervisor directory:
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.plot_paint
+"""
+
+import sys
+import time
+
+import numpy as np
+from PyQt6.QtGui import QColor, QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from src.telemetry_plot import TelemetryPlot
+
+FRAMES = 200
+NEW_SAMPLES = 5  # Per channel between paints, about 100 Hz at 20 paints/s
+WINDOW = 30.0
+SAMPLE_COUNTS = (1_000, 10_000, 100_000, 1_000_000)
+WIDTHS = (400, 1600)
+
+
+def bench(samples: int, width: int):
+    plot = TelemetryPlot(WINDOW, samples, refresh_interval=1000)
+    plot.timer.stop()
+    plot.add_lane("Tendons", [(f"tendon_{i}", QColor(255, 0, 0)) for i in range(3)])
+    plot.add_lane("Spool", [("spool", QColor(0, 0, 255))])
+    plot.resize(width, 300)
+    image = QImage(width, 300, QImage.Format.Format_ARGB32_Premultiplied)
+
+    # Fill the whole visible window, ending now
+    now = time.monotonic()
+    times = np.linspace(now - WINDOW + 1, now, samples)
+    for index, channel in enumerate(("tendon_0", "tendon_1", "tendon_2", "spool")):
+        plot._buffers[channel].extend(times, np.sin(times * (index + 1)))
+
+    plot.render(image)
+
+    channels = ("tendon_0", "tendon_1", "tendon_2", "spool")
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        now = time.monotonic()
+        for channel in channels:
+            for _ in range(NEW_SAMPLES):
+                plot.add_sample(channel, np.sin(now), now)
+        painter = QPainter(image)
+        plot.render(painter)
+        painter.end()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{samples:>9} samples/channel, {width:>4} px: "
+        f"{elapsed / FRAMES * 1e3:7.2f} ms/frame"
+    )
+
+
+def main():
+    app = QApplication(sys.argv)  # noqa: F841
+    for width in WIDTHS:
+        for samples in SAMPLE_COUNTS:
+            bench(samples, width)
+
+
+if __name__ == "__main__":
+    main()
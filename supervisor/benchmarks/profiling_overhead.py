@@ -0,0 +1,85 @@
+"""
+Cost of Profiler.instrument() per call: a slot doing next to nothing,
+and the real receive path (PacketStream.on_data_received down to
+MainWindow-like handlers) with and without timing.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.profiling_overhead
+"""
+
+import time
+
+from src.packet_protocol import PacketCodec, PacketType
+from src.profiling import Profiler
+
+CALLS = 200_000
+PACKETS = 50_000
+
+
+class Slots:
+    def on_axis_motion(self, axis_id: int, value: float):
+        self.value = value
+
+
+class Receiver:
+    """PacketCodec with a handler, as PacketStream and MainWindow use it"""
+
+    def __init__(self):
+        self.codec = PacketCodec(self.on_packet_received)
+        self.received = 0
+
+    def on_data_received(self, data: bytes):
+        self.codec.feed(data)
+
+    def on_packet_received(self, packet_type: int, payload: bytes):
+        self.received += 1
+
+
+def per_call(call, *args) -> float:
+    """Nanoseconds per call, fastest of three runs"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        for _ in range(CALLS):
+            call(*args)
+        best = min(best, (time.perf_counter_ns() - start) / CALLS)
+    return best
+
+
+def receive(chunks: list[bytes]) -> float:
+    """Microseconds per packet through a fresh Receiver"""
+    receiver = Receiver()
+    start = time.perf_counter_ns()
+    for chunk in chunks:
+        receiver.on_data_received(chunk)
+    elapsed = time.perf_counter_ns() - start
+    assert receiver.received == PACKETS
+    return elapsed / PACKETS / 1000
+
+
+def main():
+    profiler = Profiler("profiles")
+
+    plain = per_call(Slots().on_axis_motion, 0, 0.5)
+    profiler.instrument(Slots, "on_axis_motion")
+    timed = per_call(Slots().on_axis_motion, 0, 0.5)
+    print(
+        f"empty slot: {plain:.0f} ns plain, {timed:.0f} ns timed (+{timed - plain:.0f} ns)"
+    )
+
+    encoder = PacketCodec(lambda *_: None)
+    chunks = [encoder.encode(PacketType.PONG, b"\x00" * 8) for _ in range(PACKETS)]
+    plain = receive(chunks)
+    profiler.instrument(Receiver, "on_data_received")
+    profiler.instrument(Receiver, "on_packet_received")
+    timed = receive(chunks)
+    print(
+        f"receive path: {plain:.2f} us plain, {timed:.2f} us timed per packet "
+        f"(+{(timed / plain - 1) * 100:.0f}%)"
+    )
+    print()
+    print(profiler.report())
+
+
+if __name__ == "__main__":
+    main()
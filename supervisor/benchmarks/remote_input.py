@@ -0,0 +1,327 @@
+"""
+Remote pilot input over loopback with an emulated network in between:
+snapshots are sent at REMOTE_INPUT_RATE, dropped or held back by a random
+delay on the way, and received by a RemoteControllerThread that emits to
+this (GUI) thread like it does in the supervisor.
+
+Every snapshot moves the left stick to a value that identifies it, so
+each axis_motion can be matched to the time its snapshot was taken.
+Reports the latency from taking the snapshot to the slot running, what
+the receiver added on top of the emulated network, the jitter of that
+latency and of the intervals between slots, and how many snapshots were
+lost. Runs each network without a jitter buffer and with
+REMOTE_INPUT_DELAY, RUNS times each, and reports the run with the median
+latency sd: on a single core a scheduler stall in one run can otherwise
+make the buffer look worse than none. The buffer must lower the latency
+sd on every network with jitter.
+
+Then checks that stopping the sender releases the controls after
+REMOTE_INPUT_TIMEOUT, that unsigned snapshots are ignored, that a stream
+signed in an earlier session is not played when replayed, and that the
+receiver refuses to start with no pilot or key. Exits with status 1 if
+any of these fail.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.remote_input
+"""
+
+import heapq
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from src import config
+from src.input import Axes
+from src.remote_input import (
+    REST_AXES,
+    RemoteControllerThread,
+    Snapshot,
+    receive_challenge,
+)
+
+DURATION = 3.0  # Seconds of snapshots per run
+STEPS = 50  # Distinct stick positions, a snapshot is identified modulo this
+STEP = 0.02  # Stick change per snapshot, above the motion threshold
+KEY = b"benchmark"  # Snapshots are signed, as the check costs latency too
+RUNS = 3  # Per network and buffer, the median is reported
+
+# Base delay, random extra delay up to, loss probability
+NETWORKS = (
+    ("loopback", 0.0, 0.0, 0.0),
+    ("wifi", 0.005, 0.02, 0.02),
+    ("congested", 0.02, 0.04, 0.1),
+)
+
+
+def stick(sequence: int) -> float:
+    return (sequence % STEPS) * STEP - 0.5
+
+
+def emulate(
+    port: int,
+    delay: float,
+    jitter: float,
+    loss: float,
+    sent: dict[int, float],
+    stop: threading.Event,
+    key: bytes = KEY,
+):
+    """Send snapshots through an emulated network until `stop` is set"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    target = ("127.0.0.1", port)
+    challenge = b""
+    rng = random.Random(1)
+    interval = 1 / config.REMOTE_INPUT_RATE
+    in_flight: list[tuple[float, int, bytes]] = []
+    sequence = 0
+    next_snapshot = time.monotonic()
+
+    while not stop.is_set() or in_flight:
+        now = time.monotonic()
+        if not stop.is_set() and now >= next_snapshot:
+            sequence += 1
+            axes = list(REST_AXES)
+            axes[Axes.LEFT_X] = stick(sequence)
+            sent[sequence] = now
+            if key:
+                challenge = receive_challenge(sock, target, challenge)
+            if rng.random() >= loss:
+                data = Snapshot(sequence, now, 0, tuple(axes)).pack(key, challenge)
+                arrival = now + delay + rng.uniform(0, jitter)
+                heapq.heappush(in_flight, (arrival, sequence, data))
+            next_snapshot += interval
+        while in_flight and in_flight[0][0] <= now:
+            sock.sendto(heapq.heappop(in_flight)[2], target)
+        wake = next_snapshot if not stop.is_set() else now + 0.001
+        if in_flight:
+            wake = min(wake, in_flight[0][0])
+        time.sleep(max(0.0, wake - time.monotonic()))
+    sock.close()
+
+
+def run(
+    app: QCoreApplication, buffer_delay: float, delay: float, jitter: float, loss: float
+) -> tuple[list[float], list[float], int, int]:
+    """Latencies and slot times of the snapshots played, sent and lost"""
+    thread = RemoteControllerThread(
+        "127.0.0.1:0", buffer_delay, config.REMOTE_INPUT_TIMEOUT, key=KEY
+    )
+    sent: dict[int, float] = {}
+    latencies: list[float] = []
+    slot_times: list[float] = []
+    finished = [False]
+
+    def on_axis(axis: int, value: float):
+        now = time.monotonic()
+        # The return to rest when the thread stops is not a snapshot
+        if axis != Axes.LEFT_X or not sent or finished[0]:
+            return
+        # Latest snapshot taken with this stick position
+        newest = max(sent)
+        residue = round((value + 0.5) / STEP) % STEPS
+        sequence = newest - (newest - residue) % STEPS
+        latencies.append(now - sent[sequence])
+        slot_times.append(now)
+
+    thread.axis_motion.connect(on_axis)
+    thread.start()
+    stop = threading.Event()
+    sender = threading.Thread(
+        target=emulate, args=(thread.port, delay, jitter, loss, sent, stop)
+    )
+    sender.start()
+    QTimer.singleShot(int(DURATION * 1000), stop.set)
+    QTimer.singleShot(
+        int((DURATION + delay + jitter + buffer_delay) * 1000) + 100, app.quit
+    )
+    app.exec()
+    finished[0] = True
+    stop.set()  # If a quit left over from the last run ended exec() early
+    sender.join()
+    thread.stop()
+    thread.wait()
+    app.processEvents()
+    return (latencies, slot_times, len(sent), thread.buffer.lost)
+
+
+def check_timeout(app: QCoreApplication) -> tuple[float, bool]:
+    """Seconds from the last snapshot to timed_out, and whether the stick is at rest"""
+    thread = RemoteControllerThread(
+        "127.0.0.1:0", config.REMOTE_INPUT_DELAY, config.REMOTE_INPUT_TIMEOUT, key=KEY
+    )
+    sent: dict[int, float] = {}
+    last_value = [0.0]
+    timed_out = [0.0]
+
+    def on_axis(axis: int, value: float):
+        if axis == Axes.LEFT_X:
+            last_value[0] = value
+
+    def on_timeout():
+        timed_out[0] = time.monotonic()
+        app.quit()
+
+    thread.axis_motion.connect(on_axis)
+    thread.timed_out.connect(on_timeout)
+    thread.start()
+    stop = threading.Event()
+    sender = threading.Thread(
+        target=emulate, args=(thread.port, 0.0, 0.0, 0.0, sent, stop)
+    )
+    sender.start()
+    QTimer.singleShot(500, stop.set)
+    QTimer.singleShot(5000, app.quit)  # Never timed out
+    app.exec()
+    stop.set()
+    sender.join()
+    thread.stop()
+    thread.wait()
+    if not timed_out[0]:
+        return (float("inf"), False)
+    return (timed_out[0] - sent[max(sent)], last_value[0] == REST_AXES[Axes.LEFT_X])
+
+
+def check_rejected(app: QCoreApplication) -> tuple[int, int, bool]:
+    """
+    Snapshots played and ignored from an unsigned sender, and whether a
+    receiver with no pilot or key refused to start
+    """
+    open_thread = RemoteControllerThread(
+        "127.0.0.1:0", config.REMOTE_INPUT_DELAY, config.REMOTE_INPUT_TIMEOUT
+    )
+    open_thread.start()
+    refused = not open_thread.isRunning() and bool(open_thread.error)
+
+    thread = RemoteControllerThread(
+        "127.0.0.1:0", config.REMOTE_INPUT_DELAY, config.REMOTE_INPUT_TIMEOUT, key=KEY
+    )
+    thread.start()
+    stop = threading.Event()
+    sender = threading.Thread(
+        target=emulate, args=(thread.port, 0.0, 0.0, 0.0, {}, stop, b"")
+    )
+    sender.start()
+    QTimer.singleShot(300, stop.set)
+    QTimer.singleShot(400, app.quit)
+    app.exec()
+    stop.set()
+    sender.join()
+    thread.stop()
+    thread.wait()
+    return (thread.buffer.played, thread.ignored, refused)
+
+
+def check_replay() -> tuple[int, int]:
+    """
+    Snapshots played from a signed stream, and from the same datagrams
+    replayed from another port after the session timed out
+    """
+    thread = RemoteControllerThread(
+        "127.0.0.1:0", config.REMOTE_INPUT_DELAY, config.REMOTE_INPUT_TIMEOUT, key=KEY
+    )
+    thread.start()
+    target = ("127.0.0.1", thread.port)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    challenge = b""
+    captured = []
+    for sequence in range(1, 31):
+        challenge = receive_challenge(sock, target, challenge)
+        axes = list(REST_AXES)
+        axes[Axes.LEFT_X] = stick(sequence)
+        data = Snapshot(sequence, time.monotonic(), 0, tuple(axes)).pack(KEY, challenge)
+        sock.sendto(data, target)
+        captured.append(data)
+        time.sleep(1 / config.REMOTE_INPUT_RATE)
+    sock.close()
+    time.sleep(config.REMOTE_INPUT_DELAY + config.REMOTE_INPUT_TIMEOUT + 0.1)
+    live = thread.buffer.played
+
+    replayer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for data in captured:
+        replayer.sendto(data, target)
+        time.sleep(1 / config.REMOTE_INPUT_RATE)
+    replayer.close()
+    time.sleep(config.REMOTE_INPUT_DELAY + 0.1)
+    thread.stop()
+    thread.wait()
+    return (live, thread.buffer.played - live)
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:6.1f}"
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    failed = False
+    interval = 1 / config.REMOTE_INPUT_RATE
+    print(
+        f"{DURATION:.0f} s of snapshots at {config.REMOTE_INPUT_RATE} Hz, "
+        "latencies in ms from snapshot to slot"
+    )
+    for name, delay, jitter, loss in NETWORKS:
+        print(
+            f"\n{name}: {delay * 1000:.0f} ms + up to {jitter * 1000:.0f} ms, "
+            f"{loss * 100:.0f}% loss"
+        )
+        sds = []
+        for buffer_delay in (0.0, config.REMOTE_INPUT_DELAY):
+            runs = [run(app, buffer_delay, delay, jitter, loss) for _ in range(RUNS)]
+            runs.sort(key=lambda result: statistics.pstdev(result[0]))
+            latencies, slot_times, sent, lost = runs[len(runs) // 2]
+            sds.append(statistics.pstdev(latencies))
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[int(len(latencies) * 0.99)]
+            # Network delay averages delay + jitter / 2, the rest is ours
+            added = statistics.mean(latencies) - delay - jitter / 2
+            gaps = [b - a for a, b in zip(slot_times, slot_times[1:])]
+            print(
+                f"  buffer {buffer_delay * 1000:4.0f} ms: p50 {ms(p50)} p99 {ms(p99)}"
+                f" added {ms(added)} latency sd {ms(statistics.pstdev(latencies))}"
+                f" interval sd {ms(statistics.pstdev(gaps))}"
+                f" (nominal {interval * 1000:.0f}),"
+                f" {sent - len(latencies)}/{sent} not played ({lost} skipped)"
+            )
+        if jitter and sds[1] >= sds[0]:
+            failed = True
+            print("  the buffer did not lower the latency sd")
+
+    elapsed, at_rest = check_timeout(app)
+    limit = config.REMOTE_INPUT_DELAY + config.REMOTE_INPUT_TIMEOUT + 0.05
+    print(
+        f"\nsender stopped: timed out after {ms(elapsed).strip()} ms "
+        f"(delay + timeout {ms(limit - 0.05).strip()} ms), "
+        f"stick {'at rest' if at_rest else 'NOT at rest'}"
+    )
+    played, ignored, refused = check_rejected(app)
+    print(
+        f"unsigned sender: {played} played, {ignored} ignored; "
+        f"no pilot or key: {'refused' if refused else 'NOT refused'}"
+    )
+    live, replayed = check_replay()
+    print(f"replay after a timeout: {live} played live, {replayed} replayed")
+    if (
+        failed
+        or elapsed > limit
+        or not at_rest
+        or played
+        or not ignored
+        or not refused
+        or not live
+        or replayed
+    ):
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
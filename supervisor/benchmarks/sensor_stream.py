@@ -0,0 +1,140 @@
+"""
+Streams 1 kHz synthetic tank pressure through a pseudo terminal, the
+way the executor does after CMD_SUBSCRIBE, and receives it with the
+real SerialManager, PacketStream and SensorHub. Reports whether every
+sample arrived in order and how much supervisor time decoding took.
+Exits with status 1 unless every sample sent was received, no frame was
+invalid and the samples are spaced 1 / RATE apart within SPACING_TOLERANCE.
+
+The simulated pressure follows a leakage run from the January 12 test:
+the tank bleeds from 75 psi toward the regulator, plus sensor noise.
+
+Linux/macOS only (needs a pty). Run from the supervisor directory:
+    uv run python -m benchmarks.sensor_stream
+"""
+
+import os
+import sys
+import threading
+import time
+import tty
+
+import numpy as np
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from src.packet_protocol import PacketProtocol, PacketType
+from src.packet_stream import PacketStream
+from src.sensors import SENSOR_BATCH_HEADER, SENSORS, SensorHub, aggregate
+from src.serial_manager import SerialConfig, SerialManager
+
+RATE = 1000  # Hz
+BATCH = 16  # Samples per frame, same as the executor
+DURATION = 10.0  # Seconds
+DISPLAY_INTERVAL = 0.02  # Seconds
+SPACING_TOLERANCE = 1e-6  # Seconds, times are rebuilt from whole milliseconds
+
+
+def pressure(t: np.ndarray) -> np.ndarray:
+    """Tank bleeding from 75 psi with a 20 s time constant, plus noise"""
+    return 25 + 50 * np.exp(-t / 20) + np.random.normal(0, 0.2, len(t))
+
+
+def simulate(fd: int, stop: threading.Event, sent: list[int]):
+    """Write batched SENSOR_DATA frames to the pty master in real time"""
+    interval_us = 1_000_000 // RATE
+    start = time.monotonic()
+    index = 0
+    while not stop.is_set() and index < RATE * DURATION:
+        # Wait until the batch would be full on the executor
+        ready_at = start + (index + BATCH) / RATE
+        delay = ready_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        t = (index + np.arange(BATCH)) / RATE
+        payload = (
+            SENSOR_BATCH_HEADER.pack(
+                SENSORS.TANK_PRESSURE.sensor_id,
+                BATCH,
+                index * 1000 // RATE,
+                interval_us,
+            )
+            + pressure(t).astype("<f4").tobytes()
+        )
+        os.write(fd, PacketProtocol.create_packet(PacketType.SENSOR_DATA, payload))
+        index += BATCH
+        sent[0] = index
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+
+    serial = SerialManager(auto_decode=False, add_newline=False)
+    if not serial.connect(os.ttyname(slave), SerialConfig(baud_rate=115200)):
+        print("Could not open the pty")
+        sys.exit(1)
+    stream = PacketStream(serial)
+    hub = SensorHub()
+
+    decode_time = [0.0]
+    displayed = [0]
+
+    def on_packet(packet_type: int, payload: bytes):
+        if packet_type != PacketType.SENSOR_DATA:
+            return
+        start = time.perf_counter()
+        stored = hub.handle_sensor_data(payload, float("nan"))
+        if stored is not None:
+            _, times, values = stored
+            displayed[0] += len(aggregate(times, values, DISPLAY_INTERVAL)[0])
+        decode_time[0] += time.perf_counter() - start
+
+    stream.packet_received.connect(on_packet)
+
+    stop = threading.Event()
+    sent = [0]
+    simulator = threading.Thread(target=simulate, args=(master, stop, sent))
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    simulator.start()
+
+    QTimer.singleShot(int(DURATION * 1000) + 500, app.quit)
+    app.exec()
+    stop.set()
+    simulator.join()
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    times, values = hub.history(SENSORS.TANK_PRESSURE.sensor_id)
+    steps = np.diff(times)
+    in_order = bool(np.all(np.abs(steps - 1 / RATE) < SPACING_TOLERANCE))
+    invalid = hub.invalid_frames + stream.packets_invalid
+
+    print(f"samples sent:      {sent[0]}")
+    print(f"samples received:  {len(times)} in {hub.frames} frames")
+    print(f"invalid frames:    {invalid}")
+    print(f"evenly spaced:     {in_order}")
+    print(f"display samples:   {displayed[0]} ({1 / DISPLAY_INTERVAL:.0f} Hz)")
+    print(
+        f"decode time:       {decode_time[0] / max(1, hub.frames) * 1e6:.1f} us/frame"
+    )
+    print(f"process CPU:       {cpu / wall * 100:.1f}% (simulator included)")
+    if len(values):
+        print(f"final pressure:    {values[-1]:.1f} psi")
+
+    serial.disconnect()
+    os.close(master)
+    os.close(slave)
+
+    if len(times) != sent[0] or invalid or not in_order:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares the float32 setpoint packets with the int16 CMD_SET_SETPOINTS
+frame: the worst quantization error over the whole setpoint range, and
+the highest combined tendon + spool command rate the serial link and
+the supervisor CPU can sustain with each.
+
+Run from the supervisor directory:
+    uv run python -m benchmarks.setpoint_encoding
+"""
+
+import math
+import time
+
+import numpy as np
+
+from src.config import (
+    MAX_SPOOL_SPEED,
+    MAX_TENDON_VALUE,
+    MCU_BAUD_RATE,
+    MIN_SPOOL_SPEED,
+    TENDON_STEPS_PER_REV,
+)
+from src.control import controller_to_tendon
+from src.packet_protocol import (
+    PacketBuilder,
+    PacketParser,
+    PacketProtocol,
+    PacketType,
+)
+from src.setpoints import SPOOL_LSB, TENDON_LSB
+
+SAMPLES = 200_000
+BITS_PER_BYTE = 10  # 8N1: start bit, 8 data bits, stop bit
+ACK_SIZE = PacketProtocol.MIN_PACKET_SIZE + 1
+
+
+def quantization(rng: np.random.Generator):
+    tendons = rng.uniform(-MAX_TENDON_VALUE, MAX_TENDON_VALUE, (SAMPLES, 3))
+    # Include the exact limits and what the sticks actually produce
+    tendons[:2] = [[MAX_TENDON_VALUE] * 3, [-MAX_TENDON_VALUE] * 3]
+    sticks = rng.uniform(-1, 1, (1000, 2))
+    tendons[2:1002] = [controller_to_tendon(x, y) for x, y in sticks]
+    spools = rng.uniform(MIN_SPOOL_SPEED, MAX_SPOOL_SPEED, SAMPLES)
+    spools[:2] = [MIN_SPOOL_SPEED, MAX_SPOOL_SPEED]
+
+    tendon_error = 0.0
+    spool_error = 0.0
+    for values, spool in zip(tendons, spools):
+        values = tuple(float(v) for v in values)
+        decoded, speed = PacketParser.parse_setpoints(
+            PacketBuilder.set_setpoints(values, float(spool))
+        )
+        tendon_error = max(
+            tendon_error, max(abs(a - b) for a, b in zip(values, decoded))
+        )
+        spool_error = max(spool_error, abs(speed - spool))
+
+    step = 2 * math.pi / TENDON_STEPS_PER_REV
+    print(f"quantization over {SAMPLES} random setpoints:")
+    print(
+        f"  tendon max error {tendon_error:.2e} rad "
+        f"(bound {TENDON_LSB / 2:.2e}, {tendon_error / step:.4f} motor steps)"
+    )
+    print(
+        f"  spool  max error {spool_error:.2e} rpm "
+        f"(bound {SPOOL_LSB / 2:.2e}, {spool_error / MAX_SPOOL_SPEED:.4%} of full speed)"
+    )
+    assert tendon_error <= TENDON_LSB / 2 + 1e-12
+    assert spool_error <= SPOOL_LSB / 2 + 1e-12
+
+
+def cpu_rate(build, min_time: float = 0.5) -> float:
+    """Commands per second the supervisor can build and frame"""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(1000):
+            build()
+        runs += 1000
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return runs / elapsed
+
+
+def command_rate():
+    tendons = (1.2345, -0.5, 3.25)
+    speed = 1.75
+
+    def floats():
+        PacketProtocol.create_packet(
+            PacketType.CMD_SET_TENDONS, PacketBuilder.set_tendons(*tendons)
+        )
+        PacketProtocol.create_packet(
+            PacketType.CMD_SET_SPOOL, PacketBuilder.set_spool_speed(speed)
+        )
+
+    def compact():
+        PacketProtocol.create_packet(
+            PacketType.CMD_SET_SETPOINTS, PacketBuilder.set_setpoints(tendons, speed)
+        )
+
+    link = MCU_BAUD_RATE / BITS_PER_BYTE  # Bytes per second each way
+    print(f"\ncombined tendon + spool commands at {MCU_BAUD_RATE} baud:")
+    for name, build, sent, acks in (
+        ("float32 (2 packets)", floats, 12 + 4 + 4 + 4, 2),
+        ("int16   (1 packet) ", compact, 8 + 4, 1),
+    ):
+        # The ACKs coming back are the same size per command either way
+        link_rate = min(link / sent, link / (acks * ACK_SIZE))
+        print(
+            f"  {name}: {sent:2d} B out, {acks * ACK_SIZE:2d} B back, "
+            f"link {link_rate:6.0f} cmd/s, CPU {cpu_rate(build):8.0f} cmd/s"
+        )
+
+
+def main():
+    quantization(np.random.default_rng(0))
+    command_rate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Measures supervisor start-up: where `import src.ui` spends its time
+(python -X importtime) and how long until the main window first
+paints. Also checks that pygame is only loaded once a controller
+connects and that config does not pull in NumPy.
+
+Exits with status 1 when over budget, so it can guard against
+regressions. Run from the supervisor directory:
+    uv run python -m benchmarks.startup
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+RUNS = 5
+TOP_IMPORTS = 12
+
+# Budgets in milliseconds for the fastest run, measured at about 275 ms
+# and 260 ms on the development machine. NumPy stays, the ring buffers and
+# plots need it from the first frame.
+IMPORT_BUDGET = 400
+FIRST_PAINT_BUDGET = 600
+
+FIRST_PAINT = """
+import time
+
+start = time.perf_counter()
+
+import sys
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication(sys.argv)
+
+from src.ui import MainWindow
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and app.property("painted") is None:
+            app.setProperty("painted", True)
+            print(time.perf_counter() - start)
+            print("pygame" in sys.modules)
+            QTimer.singleShot(0, app.quit)
+        return False
+
+
+window = MainWindow()
+first_paint = FirstPaint()
+window.installEventFilter(first_paint)
+window.show()
+QTimer.singleShot(10_000, app.quit)
+app.exec()
+window.close()
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_times() -> tuple[float, list[tuple[float, str]]]:
+    """
+    Fastest `import src.ui` in ms, and the cumulative ms of each module
+    it imports directly, from that run
+    """
+    best = None
+    for _ in range(RUNS):
+        stderr = run_python("-X", "importtime", "-c", "import src.ui").stderr
+        rows = [IMPORT_LINE.match(line) for line in stderr.splitlines()]
+        rows = [row for row in rows if row]
+        total = next(int(r[2]) for r in rows if r[4] == "src.ui") / 1000
+        if best is None or total < best[0]:
+            # Direct imports are one level deeper than src.ui itself
+            direct = [(int(r[2]) / 1000, r[4]) for r in rows if len(r[3]) == 3]
+            best = (total, sorted(direct, reverse=True))
+    assert best is not None
+    return best
+
+
+def first_paint() -> tuple[float, bool]:
+    """Fastest ms from interpreter start to the first paint, and if pygame was loaded"""
+    best = None
+    for _ in range(RUNS):
+        lines = run_python("-c", FIRST_PAINT).stdout.split()
+        result = (float(lines[0]) * 1000, lines[1] == "True")
+        if best is None or result[0] < best[0]:
+            best = result
+    assert best is not None
+    return best
+
+
+def main():
+    total, direct = import_times()
+    print(f"import src.ui, fastest of {RUNS}: {total:.0f} ms, slowest direct imports:")
+    for ms, name in direct[:TOP_IMPORTS]:
+        print(f"  {ms:7.1f} ms  {name}")
+
+    paint, pygame_loaded = first_paint()
+    print(f"\nfirst paint, fastest of {RUNS}: {paint:.0f} ms")
+
+    config_numpy = run_python(
+        "-c", "import sys, src.config; print('numpy' in sys.modules)"
+    ).stdout.strip()
+
+    failures = []
+    if total > IMPORT_BUDGET:
+        failures.append(f"import {total:.0f} ms is over {IMPORT_BUDGET} ms")
+    if paint > FIRST_PAINT_BUDGET:
+        failures.append(f"first paint {paint:.0f} ms is over {FIRST_PAINT_BUDGET} ms")
+    if pygame_loaded:
+        failures.append("pygame is loaded before a controller connects")
+    if config_numpy == "True":
+        failures.append("src.config imports NumPy")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(
+        f"OK: within {IMPORT_BUDGET} ms import and {FIRST_PAINT_BUDGET} ms "
+        "first paint budgets"
+    )
+
+
+if __name__ == "__main__":
+    main()
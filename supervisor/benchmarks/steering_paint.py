@@ -0,0 +1,57 @@
+"""
+Offscreen paint cost of RobotSteeringWidget with the values changing
+every frame.
+
+Run from the supervisor directory:
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.steering_paint
+"""
+
+import math
+import sys
+import time
+
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from src.control import controller_to_tendon
+from src.steering_widget import RobotSteeringWidget
+
+FRAMES = 2000
+SIZES = (200, 360, 800)
+
+
+def bench(size: int):
+    widget = RobotSteeringWidget()
+    widget.resize(size, size)
+    image = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+
+    # First paint builds any caches
+    widget.render(image)
+
+    states = []
+    for frame in range(FRAMES):
+        t = frame / 60
+        x = math.cos(t)
+        y = math.sin(t)
+        tendons = tuple(float(v) for v in controller_to_tendon(x, y))
+        states.append((tendons, math.atan2(y, x), 1.0))
+
+    start = time.perf_counter()
+    for state in states:
+        widget.setState(*state)
+        painter = QPainter(image)
+        widget.render(painter)
+        painter.end()
+    elapsed = time.perf_counter() - start
+
+    print(f"{size:>4} px: {elapsed / FRAMES * 1e6:8.1f} us/frame")
+
+
+def main():
+    app = QApplication(sys.argv)  # noqa: F841
+    for size in SIZES:
+        bench(size)
+
+
+if __name__ == "__main__":
+    main()
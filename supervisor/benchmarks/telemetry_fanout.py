@@ -0,0 +1,302 @@
+"""
+Telemetry fan-out over loopback: the headless supervisor receives
+SENSOR_DATA over a pty and answers PINGs while its TelemetryServer
+publishes every packet to 0 to 50 subscribers, all in a separate
+process, plus one that never reads and must be dropped.
+
+The server shares the serial loop, as in headless mode. First the
+executor streams at the fastest link rate: every
+frame must arrive, with the p99 delay from when it was written within
+LAG_TOLERANCE of the run without subscribers, or the benchmark fails.
+
+Then, as a ceiling, the pty is flooded far past any link rate. Reports
+the receive rate and round trips as subscribers are added, the
+supervisor process's own CPU time per packet (the subscribers' process
+is not counted) and whether every reading subscriber got every packet.
+On a single core the subscribers also take CPU from the supervisor, so
+these rates understate what it can do.
+
+Linux/macOS only (needs a pty). Run from the supervisor directory:
+    uv run python -m benchmarks.telemetry_fanout
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+from benchmarks.headless_core import (
+    RECEIVE_PACKETS,
+    ROUND_TRIPS,
+    TIMEOUT,
+    echo,
+    open_pty,
+    sensor_stream,
+    write_all,
+)
+from src import config
+from src.headless import HeadlessSupervisor
+from src.packet_protocol import PacketType
+from src.telemetry_server import TelemetryServer
+
+SUBSCRIBERS = (0, 1, 20, 50)
+RUNS = 3  # Best of, the subscribers make single core runs noisy
+PACED_PACKETS = 5_000  # About 4 s at the fastest link rate
+LINK_BITS_PER_BYTE = 10  # 8N1 framing
+LAG_TOLERANCE = 1e-3  # Seconds the p99 delay may grow with subscribers
+
+# Connects the subscribers, prints "ready", then the messages each one got
+# once the server closes
+CLIENTS = """
+import selectors, socket, sys
+
+host, port = sys.argv[1].rsplit(":", 1)
+count, slow = int(sys.argv[2]), sys.argv[3] == "1"
+selector = selectors.DefaultSelector()
+for index in range(count):
+    client = socket.create_connection((host, int(port)))
+    client.setblocking(False)
+    selector.register(client, selectors.EVENT_READ, index)
+stalled = None
+if slow:
+    stalled = socket.socket()
+    stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    stalled.connect((host, int(port)))
+print("ready", flush=True)
+
+messages = [0] * count
+remaining = count
+while remaining:
+    for key, _ in selector.select():
+        data = key.fileobj.recv(1 << 20)
+        if not data:
+            selector.unregister(key.fileobj)
+            remaining -= 1
+        else:
+            messages[key.data] += data.count(b"\\n")
+print(" ".join(map(str, messages)), flush=True)
+"""
+
+
+async def connect_clients(
+    server: TelemetryServer, count: int, slow: bool
+) -> asyncio.subprocess.Process:
+    clients = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        CLIENTS,
+        server.address,
+        str(count),
+        "1" if slow else "0",
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert clients.stdout is not None
+    await clients.stdout.readline()
+    while len(server.subscribers) < count + slow:
+        await asyncio.sleep(0.01)
+    return clients
+
+
+async def finish_clients(
+    server: TelemetryServer, clients: asyncio.subprocess.Process
+) -> list[int]:
+    """Let the subscribers catch up, then close and collect their counts"""
+    await asyncio.sleep(0.5)
+    server.close()
+    assert clients.stdout is not None
+    line = await asyncio.wait_for(clients.stdout.readline(), TIMEOUT)
+    await clients.wait()
+    return [int(count) for count in line.split()]
+
+
+def write_paced(fd: int, frames: list[bytes], period: float, start: float):
+    """Writes frame i at start + i * period, like the executor's UART"""
+    for index, frame in enumerate(frames):
+        delay = start + index * period - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        write_all(fd, frame)
+
+
+async def paced(frames: list[bytes], period: float, count: int) -> list[float]:
+    """Seconds from each frame being due until it was received"""
+    master, slave, name = open_pty()
+    server = TelemetryServer(
+        config.TELEMETRY_CLIENT_QUEUE,
+        config.TELEMETRY_FLUSH_INTERVAL,
+        config.TELEMETRY_FLUSH_BATCH,
+    )
+    await server.start("127.0.0.1:0")
+    supervisor = HeadlessSupervisor(telemetry=server)
+    clients = await connect_clients(server, count, slow=count > 0)
+
+    done = asyncio.get_running_loop().create_future()
+    lags: list[float] = []
+    start = time.perf_counter() + 0.1  # Open before the first frame
+
+    def on_data(_: bytes):
+        lags.append(time.perf_counter() - start - len(lags) * period)
+        if len(lags) == len(frames):
+            done.set_result(None)
+
+    supervisor.subscribe(PacketType.SENSOR_DATA, on_data)
+    supervisor.open(name)
+    writer = threading.Thread(target=write_paced, args=(master, frames, period, start))
+    writer.start()
+    await asyncio.wait_for(done, TIMEOUT)
+    writer.join()
+    supervisor.close()
+    os.close(master)
+    os.close(slave)
+    await finish_clients(server, clients)
+    return lags
+
+
+def p99(values: list[float]) -> float:
+    return statistics.quantiles(values, n=100)[98]
+
+
+async def receive(data: bytes, count: int) -> tuple[float, float, list[int], int]:
+    """
+    Packets/s received, CPU us per packet, messages per subscriber and
+    clients dropped
+    """
+    master, slave, name = open_pty()
+    server = TelemetryServer(
+        config.TELEMETRY_CLIENT_QUEUE,
+        config.TELEMETRY_FLUSH_INTERVAL,
+        config.TELEMETRY_FLUSH_BATCH,
+    )
+    await server.start("127.0.0.1:0")
+    supervisor = HeadlessSupervisor(telemetry=server)
+    clients = await connect_clients(server, count, slow=count > 0)
+
+    done = asyncio.get_running_loop().create_future()
+    received = [0]
+
+    def on_data(_: bytes):
+        received[0] += 1
+        if received[0] == RECEIVE_PACKETS:
+            done.set_result(None)
+
+    supervisor.subscribe(PacketType.SENSOR_DATA, on_data)
+    supervisor.open(name)
+    writer = threading.Thread(target=write_all, args=(master, data))
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    writer.start()
+    await asyncio.wait_for(done, TIMEOUT)
+    elapsed = time.perf_counter() - start
+    writer.join()
+    supervisor.close()
+    os.close(master)
+    os.close(slave)
+    messages = await finish_clients(server, clients)
+    # Includes the last flushes and the pty writer thread, same for every count
+    cpu = (time.process_time() - cpu_start) / RECEIVE_PACKETS * 1e6
+    return (RECEIVE_PACKETS / elapsed, cpu, messages, server.clients_dropped)
+
+
+async def round_trips(count: int) -> float:
+    master, slave, name = open_pty()
+    stop = threading.Event()
+    executor = threading.Thread(target=echo, args=(master, stop))
+    executor.start()
+    server = TelemetryServer(
+        config.TELEMETRY_CLIENT_QUEUE,
+        config.TELEMETRY_FLUSH_INTERVAL,
+        config.TELEMETRY_FLUSH_BATCH,
+    )
+    await server.start("127.0.0.1:0")
+    supervisor = HeadlessSupervisor(telemetry=server)
+    clients = await connect_clients(server, count, slow=False)
+    done = asyncio.get_running_loop().create_future()
+    returned = [0]
+
+    def on_pong(_: bytes):
+        returned[0] += 1
+        if returned[0] == ROUND_TRIPS:
+            done.set_result(None)
+        else:
+            supervisor.send_packet(PacketType.PING)
+
+    supervisor.open(name)
+    await supervisor.ping()
+    supervisor.subscribe(PacketType.PONG, on_pong)
+    start = time.perf_counter()
+    supervisor.send_packet(PacketType.PING)
+    await asyncio.wait_for(done, TIMEOUT)
+    elapsed = time.perf_counter() - start
+    supervisor.close()
+    stop.set()
+    os.close(slave)
+    executor.join()
+    os.close(master)
+    await finish_clients(server, clients)
+    return ROUND_TRIPS / elapsed
+
+
+def main():
+    data = sensor_stream()
+    frame_size = len(data) // RECEIVE_PACKETS
+    frames = [
+        data[index * frame_size : (index + 1) * frame_size]
+        for index in range(PACED_PACKETS)
+    ]
+    baud_rate = config.LINK_BAUD_RATES[-1]
+    period = frame_size * LINK_BITS_PER_BYTE / baud_rate
+    print(
+        f"{PACED_PACKETS} SENSOR_DATA frames at {baud_rate} baud "
+        f"({1 / period:.0f}/s), delay from when each was written:"
+    )
+    failed = False
+    baseline = None
+    for count in SUBSCRIBERS:
+        lags = asyncio.run(paced(frames, period, count))
+        lag = p99(lags)
+        baseline = lag if baseline is None else baseline
+        within = lag <= baseline + LAG_TOLERANCE
+        failed |= not within
+        print(
+            f"  {count:3} subscribers {len(lags)} received, "
+            f"median {statistics.median(lags) * 1000:5.2f} ms, "
+            f"p99 {lag * 1000:5.2f} ms" + ("" if within else "  FAIL")
+        )
+
+    print(
+        f"\nFlooded, {RECEIVE_PACKETS} SENSOR_DATA frames, one more subscriber "
+        f"never reads, best of {RUNS}:"
+    )
+    baseline = None
+    for count in SUBSCRIBERS:
+        runs = [asyncio.run(receive(data, count)) for _ in range(RUNS)]
+        rate, _, messages, dropped = max(runs)
+        cpu = min(run[1] for run in runs)
+        baseline = baseline or rate
+        delivered = f", min {min(messages)} messages each" if messages else ""
+        print(
+            f"  {count:3} subscribers {rate:9.0f} packets/s "
+            f"({rate / baseline * 100:3.0f}%), {cpu:5.1f} us CPU/packet{delivered}"
+            + (f", {dropped} dropped" if count else "")
+        )
+
+    print(f"\n{ROUND_TRIPS} sequential PING round trips:")
+    baseline = None
+    for count in (0, 20):
+        rate = max(asyncio.run(round_trips(count)) for _ in range(RUNS))
+        baseline = baseline or rate
+        print(
+            f"  {count:3} subscribers {rate:9.0f} round trips/s "
+            f"({rate / baseline * 100:3.0f}%)"
+        )
+
+    if failed:
+        print("\nFAIL: subscribers delayed packets from the executor")
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Paint calls per second under a 1 kHz input burst, with widgets updated
+directly on every event (the old on_axis_motion path) and through
+UiPresenter.
+
+Run from the supervisor directory:
+    QT_QPA_PLATFORM=offscreen uv run python -m benchmarks.ui_paint_rate
+"""
+
+import math
+import sys
+import time
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QApplication, QLabel, QProgressBar, QVBoxLayout, QWidget
+
+from src.config import UI_FRAME_INTERVAL
+from src.control import controller_to_tendon
+from src.presenter import UiPresenter
+from src.steering_widget import RobotSteeringWidget
+
+DURATION = 2.0  # Seconds
+EVENT_INTERVAL = 1  # Milliseconds between simulated input events
+
+
+class PaintCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, a0, a1):
+        if a1 is not None and a1.type() == QEvent.Type.Paint:
+            self.paints += 1
+        return False
+
+
+def build():
+    window = QWidget()
+    layout = QVBoxLayout(window)
+    bars = (QProgressBar(), QProgressBar(), QProgressBar())
+    for bar in bars:
+        bar.setRange(-300, 300)
+        layout.addWidget(bar)
+    spool = QProgressBar()
+    spool.setRange(0, 250)
+    layout.addWidget(spool)
+    label = QLabel()
+    layout.addWidget(label)
+    steering = RobotSteeringWidget()
+    layout.addWidget(steering)
+
+    counter = PaintCounter()
+    for widget in (*bars, spool, label, steering):
+        widget.installEventFilter(counter)
+
+    window.show()
+    return window, bars, spool, label, steering, counter
+
+
+def run(app: QApplication, mode: str):
+    window, bars, spool, label, steering, counter = build()
+    presenter = None
+    if mode == "presenter":
+        presenter = UiPresenter(bars, steering, spool, label, UI_FRAME_INTERVAL)
+    app.processEvents()
+    counter.paints = 0
+
+    events = 0
+    start = time.monotonic()
+
+    def on_input():
+        nonlocal events
+        t = time.monotonic() - start
+        if t >= DURATION:
+            app.quit()
+            return
+        events += 1
+
+        x = math.cos(t * 3)
+        y = math.sin(t * 3)
+        tendons = tuple(float(v) for v in controller_to_tendon(x, y))
+        speed = 2.5 * math.sin(t)
+
+        if presenter is None:
+            steering.setTendonValues(*tendons)
+            steering.setSteering(math.atan2(y, x), 1.0)
+            for bar, value in zip(bars, tendons):
+                bar.setValue(int(value * 100))
+            spool.setValue(int(abs(speed) * 100))
+            spool.setFormat(f"{speed:.2f} rpm")
+        else:
+            presenter.set_tendon_values(tendons)
+            presenter.set_steering(math.atan2(y, x), 1.0)
+            presenter.set_spool_speed(speed)
+
+    timer = QTimer()
+    timer.setTimerType(Qt.TimerType.PreciseTimer)
+    timer.timeout.connect(on_input)
+    timer.start(EVENT_INTERVAL)
+    app.exec()
+    timer.stop()
+
+    elapsed = time.monotonic() - start
+    print(
+        f"{mode:<10} {events / elapsed:8.0f} events/s {counter.paints / elapsed:8.0f} paints/s"
+    )
+    window.close()
+
+
+def main():
+    app = QApplication(sys.argv)
+    run(app, "direct")
+    run(app, "presenter")
+
+
+if __name__ == "__main__":
+    main()
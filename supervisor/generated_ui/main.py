@@ -138,16 +138,53 @@ class Ui_MainWindow(object):
         self.logTab.setObjectName("logTab")
         self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.logTab)
         self.verticalLayout_2.setObjectName("verticalLayout_2")
-        self.serialText = QtWidgets.QTextBrowser(parent=self.logTab)
-        self.serialText.setEnabled(True)
+        self.logFilterLayout = QtWidgets.QHBoxLayout()
+        self.logFilterLayout.setObjectName("logFilterLayout")
+        self.logFilterLabel = QtWidgets.QLabel(parent=self.logTab)
+        self.logFilterLabel.setObjectName("logFilterLabel")
+        self.logFilterLayout.addWidget(self.logFilterLabel)
+        self.logTypeFilter = QtWidgets.QComboBox(parent=self.logTab)
+        self.logTypeFilter.setObjectName("logTypeFilter")
+        self.logFilterLayout.addWidget(self.logTypeFilter)
+        self.logDirectionFilter = QtWidgets.QComboBox(parent=self.logTab)
+        self.logDirectionFilter.setObjectName("logDirectionFilter")
+        self.logFilterLayout.addWidget(self.logDirectionFilter)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.logFilterLayout.addItem(spacerItem1)
+        self.verticalLayout_2.addLayout(self.logFilterLayout)
+        self.serialLog = QtWidgets.QTableView(parent=self.logTab)
         font = QtGui.QFont()
         font.setFamily("Monospace")
-        self.serialText.setFont(font)
-        self.serialText.setMouseTracking(False)
-        self.serialText.setAcceptDrops(False)
-        self.serialText.setObjectName("serialText")
-        self.verticalLayout_2.addWidget(self.serialText)
+        self.serialLog.setFont(font)
+        self.serialLog.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.serialLog.setAlternatingRowColors(True)
+        self.serialLog.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.serialLog.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.serialLog.setWordWrap(False)
+        self.serialLog.setObjectName("serialLog")
+        self.serialLog.horizontalHeader().setStretchLastSection(True)
+        self.serialLog.verticalHeader().setVisible(False)
+        self.verticalLayout_2.addWidget(self.serialLog)
         self.tabs.addTab(self.logTab, "")
+        self.notificationTab = QtWidgets.QWidget()
+        self.notificationTab.setObjectName("notificationTab")
+        self.notificationLayout = QtWidgets.QVBoxLayout(self.notificationTab)
+        self.notificationLayout.setObjectName("notificationLayout")
+        self.notificationList = QtWidgets.QListWidget(parent=self.notificationTab)
+        self.notificationList.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.notificationList.setAlternatingRowColors(True)
+        self.notificationList.setWordWrap(True)
+        self.notificationList.setObjectName("notificationList")
+        self.notificationLayout.addWidget(self.notificationList)
+        self.notificationButtonLayout = QtWidgets.QHBoxLayout()
+        self.notificationButtonLayout.setObjectName("notificationButtonLayout")
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.notificationButtonLayout.addItem(spacerItem2)
+        self.notificationClearBtn = QtWidgets.QPushButton(parent=self.notificationTab)
+        self.notificationClearBtn.setObjectName("notificationClearBtn")
+        self.notificationButtonLayout.addWidget(self.notificationClearBtn)
+        self.notificationLayout.addLayout(self.notificationButtonLayout)
+        self.tabs.addTab(self.notificationTab, "")
         self.rightFrame = QtWidgets.QFrame(parent=self.mainSplitter)
         self.rightFrame.setObjectName("rightFrame")
         self.rightLayout = QtWidgets.QVBoxLayout(self.rightFrame)
@@ -190,8 +227,8 @@ class Ui_MainWindow(object):
         self.tendonSlidersLayout.addLayout(self.tendon3Layout)
         self.tendonInfoLayout.addLayout(self.tendonSlidersLayout)
         self.rightLayout.addLayout(self.tendonInfoLayout)
-        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
-        self.rightLayout.addItem(spacerItem1)
+        spacerItem3 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Policy.Minimum, QtWidgets.QSizePolicy.Policy.Expanding)
+        self.rightLayout.addItem(spacerItem3)
         self.horizontalLayout_8.addWidget(self.mainSplitter)
         MainWindow.setCentralWidget(self.centralWidget)
         self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
@@ -221,15 +258,10 @@ class Ui_MainWindow(object):
         self.tendonSpeedSettingLabel.setText(_translate("MainWindow", "Tendon Speed: "))
         self.activationButton.setText(_translate("MainWindow", "Disabled"))
         self.tabs.setTabText(self.tabs.indexOf(self.mainTab), _translate("MainWindow", "Tab 1"))
-        self.serialText.setHtml(_translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
-"<html><head><meta name=\"qrichtext\" content=\"1\" /><meta charset=\"utf-8\" /><style type=\"text/css\">\n"
-"p, li { white-space: pre-wrap; }\n"
-"hr { height: 1px; border-width: 0; }\n"
-"li.unchecked::marker { content: \"\\2610\"; }\n"
-"li.checked::marker { content: \"\\2612\"; }\n"
-"</style></head><body style=\" font-family:\'Monospace\'; font-size:11pt; font-weight:400; font-style:normal;\">\n"
-"<p style=\"-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px; font-size:9pt;\"><br /></p></body></html>"))
+        self.logFilterLabel.setText(_translate("MainWindow", "Filter: "))
         self.tabs.setTabText(self.tabs.indexOf(self.logTab), _translate("MainWindow", "Tab 2"))
+        self.notificationClearBtn.setText(_translate("MainWindow", "Clear"))
+        self.tabs.setTabText(self.tabs.indexOf(self.notificationTab), _translate("MainWindow", "Notifications"))
         self.tendon1Label.setText(_translate("MainWindow", "Tendon 1: "))
         self.tendon2Label.setText(_translate("MainWindow", "Tendon 2: "))
         self.tendon3Label.setText(_translate("MainWindow", "Tendon 3: "))
@@ -0,0 +1,161 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from src.config import CLOCK_SYNC_MIN_SPAN, CLOCK_SYNC_RTT_WINDOW, CLOCK_SYNC_WINDOW
+
+_UPTIME_WRAP = 2**32  # millis() is a uint32
+_MAX_CLOCK_DRIFT = 1e-3  # Crystals and resonators are well within 0.1%
+
+
+def _line_fit(x: np.ndarray, y: np.ndarray) -> tuple[float, float]:
+    """Least squares (slope, intercept)"""
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    denominator = np.dot(dx, dx)
+    if denominator == 0:
+        return (1.0, float(y_mean - x_mean))
+    slope = float(np.dot(dx, y - y_mean) / denominator)
+    return (slope, float(y_mean - slope * x_mean))
+
+
+class ClockSync:
+    """
+    Estimates the executor clock from the uptime in STATUS_UPDATE.
+
+    Each uptime (executor milliseconds) is paired with the host time the
+    packet arrived, minus half the smallest recent PING round trip as the
+    one-way delay. A line fitted through the last `window` pairs gives
+    the offset between the clocks and their drift, so any host timestamp
+    can be converted to executor time and back. Queueing only ever
+    delays packets, so the fit favours the pairs that arrived fastest.
+
+    Uptime wraparound after ~49 days is unwrapped. If uptime jumps
+    backwards otherwise, the executor was reset and the fit starts over.
+    """
+
+    def __init__(
+        self,
+        window: int = CLOCK_SYNC_WINDOW,
+        rtt_window: int = CLOCK_SYNC_RTT_WINDOW,
+        min_span: float = CLOCK_SYNC_MIN_SPAN,
+    ):
+        """
+        Args:
+            window: Number of uptime samples in the fit
+            rtt_window: Number of recent round trip times to take the minimum of
+            min_span: Seconds the samples must cover before drift is fitted
+        """
+        self.min_span = min_span
+        self._samples: deque[tuple[float, float]] = deque(maxlen=window)
+        self._rtts: deque[float] = deque(maxlen=rtt_window)
+        self._last_uptime: int | None = None
+        self._wraps: int = 0
+
+        # Fit: executor seconds = slope * (host - origin) + intercept
+        self._origin: float = 0.0
+        self._slope: float = 1.0
+        self._intercept: float = 0.0
+        self.resets: int = 0
+
+    @property
+    def ready(self) -> bool:
+        return len(self._samples) > 0
+
+    @property
+    def one_way_delay(self) -> float:
+        """Estimated host <- executor delay in seconds"""
+        return min(self._rtts) / 2 if self._rtts else 0.0
+
+    @property
+    def offset(self) -> float:
+        """Host minus executor time in seconds, at the newest sample"""
+        if not self._samples:
+            return 0.0
+        host = self._samples[-1][0]
+        return host - self.to_executor(host)
+
+    @property
+    def drift(self) -> float:
+        """How much faster the executor clock runs, in parts per million"""
+        return (self._slope - 1.0) * 1e6
+
+    def add_rtt(self, rtt: float):
+        """Record a PING round trip time in seconds"""
+        self._rtts.append(rtt)
+
+    def add_uptime(self, uptime_ms: int, host_time: float):
+        """
+        Record the uptime from a STATUS_UPDATE.
+
+        Args:
+            uptime_ms: Executor millis() when the packet was sent
+            host_time: Host time in seconds when the packet arrived
+        """
+        if self._last_uptime is not None and uptime_ms < self._last_uptime:
+            if self._last_uptime - uptime_ms > _UPTIME_WRAP // 2:
+                self._wraps += 1
+            else:
+                self.reset()
+                self.resets += 1
+        self._last_uptime = uptime_ms
+
+        executor_time = (uptime_ms + self._wraps * _UPTIME_WRAP) / 1000
+        self._samples.append((host_time - self.one_way_delay, executor_time))
+        self._fit()
+
+    def _fit(self):
+        samples = np.array(self._samples)
+        host = samples[:, 0]
+        executor = samples[:, 1]
+        self._origin = float(host[-1])
+        x = host - self._origin  # Centered for precision, host times can be large
+
+        if host[-1] - host[0] < self.min_span:
+            # Not enough spread for a slope yet, assume the clocks tick together
+            self._slope = 1.0
+            self._intercept = float(np.max(executor - x))
+            return
+
+        slope, intercept = _line_fit(x, executor)
+
+        # Late packets only ever make the executor look behind, so refit
+        # through the half that arrived fastest
+        residuals = executor - (slope * x + intercept)
+        fastest = residuals >= np.median(residuals)
+        if np.count_nonzero(fastest) >= 2:
+            slope, intercept = _line_fit(x[fastest], executor[fastest])
+
+        if abs(slope - 1.0) > _MAX_CLOCK_DRIFT:
+            # Not a real clock, e.g. a stalled host; keep tracking the offset only
+            slope = 1.0
+            intercept = float(np.max(executor - x))
+        self._slope = float(slope)
+        self._intercept = float(intercept)
+
+    def to_executor(self, host_time: float) -> float:
+        """Executor time in seconds (uptime / 1000) at a host time"""
+        return self._slope * (host_time - self._origin) + self._intercept
+
+    def to_host(self, executor_time: float) -> float:
+        """Host time at an executor time in seconds"""
+        return (executor_time - self._intercept) / self._slope + self._origin
+
+    def one_way_latency(self, uptime_ms: int, host_time: float) -> float:
+        """
+        How long a packet stamped with uptime_ms took to arrive, in
+        seconds. Only meaningful once a few samples have been fitted.
+        """
+        if not self.ready:
+            return math.nan
+        executor_time = (uptime_ms + self._wraps * _UPTIME_WRAP) / 1000
+        return host_time - self.to_host(executor_time)
+
+    def reset(self):
+        self._samples.clear()
+        self._last_uptime = None
+        self._wraps = 0
+        self._slope = 1.0
+        self._intercept = 0.0
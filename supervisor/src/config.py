@@ -1,6 +1,9 @@
-from numpy import cos, pi
+from math import cos, pi
 
 CONTROLLER_POLL_RATE = 0.05
+CONTROL_POSITION_RATE = 50  # Hz, tendon setpoints
+CONTROL_SPEED_RATE = 20  # Hz, spool speed
+SETPOINT_REFRESH_INTERVAL = 0.5  # Seconds between resends of unchanged setpoints
 MCU_BAUD_RATE = 115200
 JOYSTICK_DEADZONE = 0.05
 TRIGGER_DEADZONE = 0.1
@@ -22,6 +25,105 @@ TENDON_SPOOL_RADIUS = TENDON_SPOOL_DIAMETER / 2
 MAX_CURVE = 1.5  # radians per meter
 MAX_TENDON_VALUE = (MAX_CURVE * BODY_RADIUS * cos(0)) / TENDON_SPOOL_RADIUS
 
+# Must match the executor
+TENDON_STEPS_PER_REV = 400
+SPOOL_STEPS_PER_REV = 47 * 400  # 47:1 and 400 steps per rev
+DEFAULT_TENDON_MOTOR_SPEED = 2  # rpm, used until TENDON_MOTOR_SPEED is set
+
+BODY_SPOOL_DIAMETER = 0.0508  # Meters (2 inches)
+EVERSION_RATIO = 0.5  # The tip grows half as fast as the tail is let out
+
+ODOMETRY_HISTORY_SIZE = 4096
+ODOMETRY_HISTORY_INTERVAL = 0.1  # Seconds
+
+HEARTBEAT_INTERVAL = 0.25  # Seconds between PINGs while connected
+HEARTBEAT_CHECK_INTERVAL = 0.02  # Seconds between link health checks
+HEARTBEAT_LATENCY_LIMIT = 0.5  # Seconds of PONG latency before stopping
+STATUS_GAP_LIMIT = (
+    2.5  # Seconds without a STATUS_UPDATE before stopping (sent every 1 s)
+)
+HEARTBEAT_RECOVERY_TIME = 2.0  # Seconds of good health before the link recovers
+
+SETPOINT_ENCODING = 1  # Preferred, 0 float32 or 1 int16 (src/setpoints.py)
+LINK_INTEGRITY = 1  # Preferred packet check, 0 XOR or 1 CRC-16 (Integrity)
+LINK_FRAMING = 1  # Preferred framing, 0 start byte or 1 COBS (Framing)
+LINK_BAUD_RATES = (115200, 250000, 500000, 1000000)  # Tried fastest last
+LINK_PROBE_PINGS = 64  # Echoed PINGs a baud rate must pass
+LINK_PROBE_WINDOW = 4  # Probe PINGs outstanding at once
+LINK_PROBE_PAYLOAD = 32  # Bytes echoed per probe PING
+LINK_PROBE_TIMEOUT = 1.0  # Seconds a probe or baud change may take
+LINK_FALLBACK_WAIT = 1.5  # Seconds for the executor to return to MCU_BAUD_RATE
+LINK_ERROR_CHECK_INTERVAL = 1.0  # Seconds between error rate checks
+LINK_ERROR_LIMIT = 0.01  # Share of invalid packets that steps the baud rate down
+LINK_DESYNC_PACKETS = 3  # Invalid packets in a row that renegotiate the link
+
+PARAM_COALESCE_INTERVAL = 100  # Milliseconds without changes before params are sent
+SERIAL_WRITE_QUEUE_LIMIT = 64 * 1024  # Bytes the headless transport queues
+
+CLOCK_SYNC_WINDOW = 64  # STATUS_UPDATE uptimes in the clock fit (about a minute)
+CLOCK_SYNC_RTT_WINDOW = 32  # Round trip times the one-way delay is taken from
+CLOCK_SYNC_MIN_SPAN = 10.0  # Seconds of uptime samples before drift is fitted
+
+UI_FRAME_INTERVAL = 16  # Milliseconds between widget updates (~60 Hz)
+
+LOOP_LAG_INTERVAL = 5  # Milliseconds between event loop lag samples
+LOOP_LAG_WINDOW = 2000  # Lag samples the percentiles are over (10 s)
+LOOP_STALL_LIMIT = 0.1  # Seconds of event loop lag reported as a stall
+LOOP_LAG_REPORT_INTERVAL = 500  # Milliseconds between lag display updates
+
+PROFILE_FLAG = "--profile"  # Command line flag that turns on slot profiling
+PROFILE_ENV = "SUPERVISOR_PROFILE"  # Or this environment variable set to 1
+PROFILE_DIR = "profiles"  # Where profiles and snapshots are written
+
+METRICS_FLAG = "--metrics"  # Command line flag that serves Prometheus metrics
+METRICS_ENV = "SUPERVISOR_METRICS_PORT"  # Or this environment variable set to a port
+METRICS_HOST = "127.0.0.1"  # Only reachable from this machine
+METRICS_PORT = 9464  # Port used with the flag
+
+TELEMETRY_FLAG = "--telemetry"  # Command line flag that serves telemetry to dashboards
+TELEMETRY_ENV = "SUPERVISOR_TELEMETRY"  # Or this set to "host:port" or a socket path
+TELEMETRY_ADDRESS = "127.0.0.1:9465"  # Address used with the flag
+TELEMETRY_CLIENT_QUEUE = 1024 * 1024  # Bytes a client may fall behind before dropped
+TELEMETRY_FLUSH_INTERVAL = 0.01  # Seconds messages are batched before sending
+TELEMETRY_FLUSH_BATCH = 256  # Messages encoded per loop pass, the rest on the next
+
+REMOTE_INPUT_FLAG = "--remote-input"  # Command line flag that takes a remote pilot
+REMOTE_INPUT_ENV = "SUPERVISOR_REMOTE_INPUT"  # Or this set to "host:port" to listen on
+REMOTE_INPUT_ADDRESS = "127.0.0.1:9466"  # Address used with the flag, local only
+REMOTE_INPUT_PILOT_ENV = "SUPERVISOR_REMOTE_PILOT"  # Host snapshots are taken from
+REMOTE_INPUT_KEY_ENV = (
+    "SUPERVISOR_REMOTE_KEY"  # Or a key they are signed with, one needed
+)
+REMOTE_INPUT_RATE = 100  # Hz, snapshots sent by the pilot's machine
+REMOTE_INPUT_DELAY = 0.03  # Seconds of jitter buffer on top of the fastest path
+REMOTE_INPUT_TIMEOUT = 0.25  # Seconds without input before the controls are released
+
+PACKET_LOG_CAPACITY = 500_000  # Packets kept in the serial log
+PACKET_LOG_ARENA_SIZE = 8 * 1024 * 1024  # Bytes of payload kept in the serial log
+LOG_REFRESH_INTERVAL = 16  # Milliseconds between serial log view updates
+
+NOTIFICATION_HISTORY = 200  # Distinct messages kept
+NOTIFICATION_REFRESH_INTERVAL = 250  # Milliseconds between notification updates
+
+SENSOR_HISTORY_SIZE = 600_000  # Samples kept per sensor, 10 minutes at 1 kHz
+SENSOR_DISPLAY_INTERVAL = 0.02  # Seconds per aggregated sample sent to the plot
+SENSOR_STREAM_FLAG = "--sensor-stream"  # Command line flag that streams sensors
+SENSOR_STREAM_ENV = "SUPERVISOR_SENSOR_STREAM"  # Or this set to "id:Hz,id:Hz"
+SENSOR_STREAM_RATES = "0:1000"  # Rates used with the flag, 1 kHz is ~40% of 115200 baud
+
+PLOT_WINDOW = 30  # Seconds of telemetry shown
+PLOT_CAPACITY = 16384  # Samples kept per telemetry channel
+PLOT_REFRESH_INTERVAL = 50  # Milliseconds, at most 20 repaints per second
+PLOT_RATE_INTERVAL = 250  # Milliseconds between packet rate samples
+
 
 class MCU_PRAMS:
     TENDON_MOTOR_SPEED = 0x00
+    SETPOINT_ENCODING = 0x01
+    LINK_INTEGRITY = 0x02
+    LINK_FRAMING = 0x03
+    LINK_BAUD = 0x04
+
+
+class EXECUTOR_ERRORS:
+    HEARTBEAT_TIMEOUT = 0x01
@@ -0,0 +1,163 @@
+"""
+Supervisor link to the executor without Qt, for scripted tests,
+benchmarks and unattended runs. Checks a connected executor when run:
+    uv run python -m src.headless /dev/ttyACM0
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable
+
+from src import config
+from src.packet_protocol import PacketCodec, PacketParser, PacketType
+from src.serial_transport import SerialTransport
+from src.telemetry_server import TelemetryServer
+
+
+class HeadlessSupervisor:
+    """
+    Talks to the executor over an asyncio SerialTransport with the same
+    PacketCodec as the GUI's PacketStream.
+
+    Handlers added with subscribe() are called for every packet of their
+    type, and request() waits for the next packet of a reply type. PINGs
+    from the executor are answered like the GUI does.
+    """
+
+    def __init__(
+        self,
+        max_queued: int = config.SERIAL_WRITE_QUEUE_LIMIT,
+        telemetry: TelemetryServer | None = None,
+    ):
+        """
+        Args:
+            max_queued: Bytes queued for writing before sends are refused
+            telemetry: Optional server every packet is published to, on this loop
+        """
+        self.codec = PacketCodec(self._on_packet)
+        self.transport = SerialTransport(self.codec.feed, max_queued=max_queued)
+        self.handlers: dict[int, list[Callable[[bytes], None]]] = defaultdict(list)
+        self._waiters: dict[int, deque[asyncio.Future[bytes]]] = defaultdict(deque)
+        self.telemetry = telemetry
+
+    def open(self, path: str, baud_rate: int = config.MCU_BAUD_RATE):
+        """Open the port, from within the running loop"""
+        self.codec.clear_buffer()
+        self.transport.open(path, baud_rate)
+
+    def close(self):
+        self.transport.close()
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                waiter.cancel()
+            waiters.clear()
+
+    def subscribe(self, packet_type: PacketType, handler: Callable[[bytes], None]):
+        """Call handler(payload) for every packet of this type"""
+        self.handlers[packet_type].append(handler)
+
+    def send_packet(self, packet_type: PacketType, payload: bytes = b"") -> bool:
+        if not self.transport.send(self.codec.encode(packet_type, payload)):
+            return False
+        self.codec.count_sent(packet_type)
+        if self.telemetry is not None:
+            self.telemetry.publish_packet("tx", packet_type, payload)
+        return True
+
+    async def request(
+        self,
+        packet_type: PacketType,
+        payload: bytes = b"",
+        reply_type: PacketType = PacketType.ACK,
+        timeout: float = 1.0,
+    ) -> bytes:
+        """
+        Send a packet and wait for the next one of `reply_type`.
+
+        Returns:
+            The reply payload
+
+        Raises:
+            ConnectionError: The packet could not be sent
+            TimeoutError: No reply within `timeout` seconds
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters[reply_type].append(waiter)
+        if not self.send_packet(packet_type, payload):
+            self._waiters[reply_type].remove(waiter)
+            raise ConnectionError(f"Could not send {packet_type.name}")
+
+        # Cheaper than wait_for(), which wraps every request in a task
+        expiry = loop.call_later(
+            timeout,
+            lambda: (
+                waiter.done()
+                or waiter.set_exception(
+                    TimeoutError(f"No {reply_type.name} after {packet_type.name}")
+                )
+            ),
+        )
+        try:
+            return await waiter
+        finally:
+            expiry.cancel()
+            if waiter in self._waiters[reply_type]:
+                self._waiters[reply_type].remove(waiter)
+
+    async def ping(self, timeout: float = 1.0) -> float:
+        """Round trip time in seconds"""
+        start = time.perf_counter()
+        await self.request(PacketType.PING, b"", PacketType.PONG, timeout)
+        return time.perf_counter() - start
+
+    def _on_packet(self, packet_type: int, payload: bytes):
+        if self.telemetry is not None:
+            self.telemetry.publish_packet("rx", packet_type, payload)
+        waiters = self._waiters.get(packet_type)
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(payload)
+                break
+        for handler in self.handlers.get(packet_type, ()):
+            handler(payload)
+        if packet_type == PacketType.PING:
+            self.send_packet(PacketType.PONG)
+
+
+async def check(path: str, baud_rate: int, pings: int):
+    supervisor = HeadlessSupervisor()
+    supervisor.open(path, baud_rate)
+    try:
+        params = PacketParser.parse_params(
+            await supervisor.request(
+                PacketType.CMD_GET_PARAM, reply_type=PacketType.PARAM_REPORT
+            )
+        )
+        print(f"params: {params}")
+
+        rtts = [await supervisor.ping() * 1000 for _ in range(pings)]
+        print(
+            f"{pings} pings: median {statistics.median(rtts):.2f} ms, "
+            f"max {max(rtts):.2f} ms"
+        )
+        print(f"packets: {supervisor.codec.get_statistics()}")
+    finally:
+        supervisor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a connected executor")
+    parser.add_argument("port", help="e.g. /dev/ttyACM0")
+    parser.add_argument("--baud", type=int, default=config.MCU_BAUD_RATE)
+    parser.add_argument("--pings", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(check(args.port, args.baud, args.pings))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ import sys
 from time import sleep
 from typing import Callable, final
 
-import pygame
 from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout, QWidget
 
@@ -32,6 +31,9 @@ class ControllerThread(QThread):
 
     def run(self):
         """Main thread loop - initializes pygame and polls controller."""
+        # Imported on first connect, pygame and SDL take a while to load
+        import pygame
+
         pygame.init()
         pygame.joystick.init()
 
@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config import MAX_CURVE
+from src.control import get_tendon_steering
+
+# Below this bend angle (curvature * length) the closed form expressions lose
+# precision, so the Taylor expansions are used instead
+SMALL_BEND_ANGLE = 1e-4
+
+
+@dataclass
+class TipSolution:
+    """
+    Batched inverse kinematics result. Every field has one entry per target.
+
+    direction: bending direction in radians (same frame as the tendon angles)
+    curvature: curvature in radians per meter, clamped to [0, MAX_CURVE]
+    tendons: (N, 3) relative tendon motor positions in radians
+    error: distance in meters between the reached tip and the target
+    """
+
+    direction: np.ndarray
+    curvature: np.ndarray
+    tendons: np.ndarray
+    error: np.ndarray
+
+
+def forward_kinematics(
+    d: np.ndarray | float, c: np.ndarray | float, length: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Takes the direction (d) in radians, the curvature (c) in radians
+    per meter and the everted length in meters, and returns the tip
+    position (x, y, z) of a single constant curvature segment.
+    z points along the unbent body, x and y match the controller axes.
+    """
+    d = np.asarray(d, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    radial, axial, _, _ = _arc(c, length)
+    return (radial * np.cos(d), radial * np.sin(d), axial)
+
+
+def _arc(
+    c: np.ndarray, length: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the in-plane tip position (radial, axial) of an arc and
+    its derivatives with respect to curvature.
+    """
+    theta = c * length
+    small = np.abs(theta) < SMALL_BEND_ANGLE
+    safe_c = np.where(small, 1.0, c)
+
+    sin_t = np.sin(theta)
+    cos_t = np.cos(theta)
+
+    radial = np.where(
+        small,
+        c * length**2 / 2 - c**3 * length**4 / 24,
+        (1 - cos_t) / safe_c,
+    )
+    axial = np.where(
+        small,
+        length - c**2 * length**3 / 6,
+        sin_t / safe_c,
+    )
+    d_radial = np.where(
+        small,
+        length**2 / 2 - c**2 * length**4 / 8,
+        (length * sin_t * safe_c - (1 - cos_t)) / safe_c**2,
+    )
+    d_axial = np.where(
+        small,
+        -c * length**3 / 3,
+        (length * cos_t * safe_c - sin_t) / safe_c**2,
+    )
+
+    return (radial, axial, d_radial, d_axial)
+
+
+def solve_tip_targets(
+    targets: np.ndarray,
+    length: float,
+    initial_curvature: np.ndarray | None = None,
+    iterations: int = 6,
+) -> TipSolution:
+    """
+    Find the direction, curvature and tendon positions that bring the
+    tip as close as possible to each target.
+
+    The direction is solved in closed form. The curvature starts at the
+    arc that passes through the target (or the warm start, if given) and
+    is refined with Gauss-Newton steps on the tip distance, since a fixed
+    everted length can not reach every point exactly.
+
+    Args:
+        targets: (N, 3) or (3,) array of tip positions in meters
+        length: Current everted length in meters
+        initial_curvature: Optional (N,) warm start, e.g. the previous solution
+        iterations: Number of Gauss-Newton steps
+
+    Returns:
+        TipSolution with one entry per target
+    """
+    targets = np.atleast_2d(np.asarray(targets, dtype=np.float64))
+    if targets.shape[1] != 3:
+        raise ValueError(f"Targets must have shape (N, 3), got {targets.shape}")
+    if length <= 0:
+        raise ValueError(f"Everted length must be positive, got {length}")
+
+    x = targets[:, 0]
+    y = targets[:, 1]
+    z = targets[:, 2]
+
+    direction = np.arctan2(y, x)
+    radial_target = np.hypot(x, y)
+
+    if initial_curvature is None:
+        # Curvature of the circle tangent to the body axis through the target
+        dist_sq = radial_target**2 + z**2
+        curvature = np.divide(
+            2 * radial_target,
+            dist_sq,
+            out=np.zeros_like(dist_sq),
+            where=dist_sq > 0,
+        )
+    else:
+        curvature = np.broadcast_to(
+            np.asarray(initial_curvature, dtype=np.float64), direction.shape
+        ).copy()
+
+    np.clip(curvature, 0, MAX_CURVE, out=curvature)
+
+    for _ in range(iterations):
+        radial, axial, d_radial, d_axial = _arc(curvature, length)
+        e_radial = radial - radial_target
+        e_axial = axial - z
+
+        jtj = d_radial**2 + d_axial**2
+        step = np.divide(
+            e_radial * d_radial + e_axial * d_axial,
+            jtj,
+            out=np.zeros_like(jtj),
+            where=jtj > 0,
+        )
+        curvature -= step
+        np.clip(curvature, 0, MAX_CURVE, out=curvature)
+
+    radial, axial, _, _ = _arc(curvature, length)
+    error = np.hypot(radial - radial_target, axial - z)
+
+    tendons = np.column_stack(get_tendon_steering(direction, curvature))
+
+    return TipSolution(direction, curvature, tendons, error)
+
+
+class TipSolver:
+    """
+    Stateful wrapper around solve_tip_targets for live use.
+    Warm-starts every solve from the previous curvature when the
+    number of targets has not changed.
+    """
+
+    def __init__(self, iterations: int = 3):
+        self.iterations = iterations
+        self._last: TipSolution | None = None
+
+    def solve(self, targets: np.ndarray, length: float) -> TipSolution:
+        targets = np.atleast_2d(np.asarray(targets, dtype=np.float64))
+
+        initial = None
+        if self._last is not None and len(self._last.curvature) == len(targets):
+            initial = self._last.curvature
+
+        if initial is None:
+            # A cold start needs a few more steps to converge
+            solution = solve_tip_targets(targets, length, None, self.iterations * 2)
+        else:
+            solution = solve_tip_targets(targets, length, initial, self.iterations)
+
+        self._last = solution
+        return solution
+
+    def reset(self):
+        """Forget the previous solution"""
+        self._last = None
@@ -0,0 +1,349 @@
+import struct
+import time
+from enum import Enum
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src.packet_protocol import PacketType
+from src.packet_stream import PacketStream
+
+# Probe PING payload: uint16 sequence number, then a pattern holding both
+# 0x00 and the 0xAA start byte, so either framing is exercised
+_PROBE_SEQUENCE = struct.Struct("<H")
+_SYNC_SEQUENCE = 0xFFFF  # Resent until echoed, before the probe is timed
+_SYNC_INTERVAL = 50  # Milliseconds
+
+
+class LinkSpeedState(str, Enum):
+    IDLE = "idle"  # Not connected, or waiting to start over
+    PROBING = "probing"  # Measuring the current rate
+    REQUESTED = "requested"  # Waiting for the executor to confirm a new rate
+    STABLE = "stable"  # Done, watching the error rate
+    FALLING_BACK = "falling back"  # Both ends returning to the base rate
+
+
+class LinkSpeedNegotiator(QObject):
+    """
+    Steps the serial link up to faster baud rates while connected.
+
+    The rate in effect is first probed: PINGs whose payload the executor
+    echoes are kept `probe_window` outstanding until `probe_pings` have
+    come back. A sync PING is resent until it comes back first, as bytes
+    sent at the old rate during a switch arrive as garbage and can hide
+    the next few packets. If all do, unchanged, with no invalid packets, the rate is
+    verified and its goodput reported. The next faster rate is then
+    asked for through the LINK_BAUD parameter. The executor switches
+    right after its PARAM_REPORT, and once the port is switched too,
+    confirmed() starts the next probe.
+
+    A probe that fails, or a rate change that is never confirmed, rules
+    that rate out for the session and falls back: the supervisor returns
+    to the base rate, where the executor goes by itself after a second
+    without valid packets, then resyncs and asks for the best rate that
+    worked. While stable, a share of invalid packets above `error_limit`
+    steps down to the next slower rate while the link still works.
+
+    The executor also returns to the base settings when it resets or
+    hears nothing valid for a second, e.g. while the GUI was stalled.
+    resync() is called when the link degrades, and `desync_packets`
+    invalid packets in a row with nothing valid call it as well: both
+    ends go back to the base settings the same way, then the session is
+    negotiated again from IDLE.
+
+    Signals:
+        rate_requested(int): Ask the executor for this baud rate
+        fallback_requested(str): Go back to the base settings and stop
+            sending, with the reason
+        resync_requested(): The executor is back at the base rate,
+            start sending again
+        rate_verified(int, float, float): Baud rate, probe round trips
+            per second and goodput in bytes per second
+    """
+
+    rate_requested = pyqtSignal(int)
+    fallback_requested = pyqtSignal(str)
+    resync_requested = pyqtSignal()
+    rate_verified = pyqtSignal(int, float, float)
+
+    def __init__(
+        self,
+        stream: PacketStream,
+        base_rate: int,
+        rates: tuple[int, ...],
+        probe_pings: int,
+        probe_window: int,
+        probe_payload: int,
+        timeout: float,
+        fallback_wait: float,
+        check_interval: float,
+        error_limit: float,
+        desync_packets: int,
+    ):
+        """
+        Args:
+            stream: Packet stream to the executor
+            base_rate: Baud rate every session starts at
+            rates: Baud rates to try
+            probe_pings: Round trips per probe
+            probe_window: PINGs outstanding at once, keeps the executor's
+                receive buffer from overflowing
+            probe_payload: Bytes echoed per PING, at least 2
+            timeout: Seconds a probe or rate change may take
+            fallback_wait: Seconds for the executor to return to the base rate
+            check_interval: Seconds between error rate checks while stable
+            error_limit: Share of invalid packets that steps the rate down
+            desync_packets: Invalid packets in a row that start over
+        """
+        super().__init__()
+        self.stream = stream
+        self.base_rate = base_rate
+        self.rates = tuple(sorted(set(rates) | {base_rate}))
+        self.probe_pings = probe_pings
+        self.probe_window = probe_window
+        self.probe_payload = probe_payload
+        self.error_limit = error_limit
+        self.desync_packets = desync_packets
+
+        self.state = LinkSpeedState.IDLE
+        self.rate = base_rate
+        self.target = base_rate
+        self.ceiling = self.rates[-1]  # Lowered when a rate fails
+        self.verified: dict[int, tuple[float, float]] = {}  # Rate -> probe result
+
+        self._pattern = bytes((i * 0x55) & 0xFF for i in range(probe_payload - 2))
+        self._sync = _PROBE_SEQUENCE.pack(_SYNC_SEQUENCE) + self._pattern
+        self._syncing = False
+        self._sent = 0
+        self._returned = 0
+        self._probe_start = 0.0
+        self._counts = (0, 0)  # Received and invalid packets at the last check
+        self._invalid_run = 0  # Invalid packets since the last valid one
+        self._restarting = False  # Negotiating again once resynced
+
+        self.timer = QTimer(self)  # Probe and rate change timeout
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(int(timeout * 1000))
+        self.timer.timeout.connect(self._on_timeout)
+
+        self.resync_timer = QTimer(self)
+        self.resync_timer.setSingleShot(True)
+        self.resync_timer.setInterval(int(fallback_wait * 1000))
+        self.resync_timer.timeout.connect(self._resync)
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(_SYNC_INTERVAL)
+        self.sync_timer.timeout.connect(self._send_sync)
+
+        self.check_timer = QTimer(self)
+        self.check_timer.setInterval(int(check_interval * 1000))
+        self.check_timer.timeout.connect(self._check_errors)
+
+        self.stream.packet_received.connect(self._on_packet)
+
+    def start(self, rate: int):
+        """Start from the rate both ends run at, once the other link settings are in effect"""
+        self.rate = rate
+        self.ceiling = self.rates[-1]
+        self.verified.clear()
+        self.state = LinkSpeedState.PROBING
+        self._probe()
+
+    def stop(self):
+        self.state = LinkSpeedState.IDLE
+        self._restarting = False
+        self._syncing = False
+        self._invalid_run = 0
+        self.timer.stop()
+        self.resync_timer.stop()
+        self.sync_timer.stop()
+        self.check_timer.stop()
+
+    def confirmed(self, rate: int):
+        """The executor reported LINK_BAUD, and the port now runs at `rate`"""
+        self.rate = rate
+        if (
+            self.state in (LinkSpeedState.REQUESTED, LinkSpeedState.FALLING_BACK)
+            and rate == self.target
+            and not self.resync_timer.isActive()
+        ):
+            # Let the other link settings in the same report apply first
+            self.state = LinkSpeedState.PROBING
+            self.timer.stop()
+            QTimer.singleShot(50, self._probe)
+
+    def resync(self):
+        """
+        The executor may have gone back to the base settings by itself:
+        do the same, wait for it and negotiate again
+        """
+        if self._restarting:
+            return
+        self.stop()
+        self._restarting = True
+        self.state = LinkSpeedState.FALLING_BACK
+        self.rate = self.target = self.base_rate
+        self.fallback_requested.emit("the executor lost the link settings")
+        self.rate_requested.emit(self.base_rate)
+        self.resync_timer.start()
+
+    def rejected(self):
+        """The executor refused LINK_BAUD, stay where it is"""
+        if self.state == LinkSpeedState.REQUESTED:
+            self.ceiling = self.rate
+            self._settle()
+
+    def _probe(self):
+        if self.state != LinkSpeedState.PROBING:
+            return
+        self._syncing = True
+        self.timer.start()
+        self.sync_timer.start()
+        self._send_sync()
+
+    def _send_sync(self):
+        self.stream.send_packet(PacketType.PING, self._sync, False)
+
+    def _start_timing(self):
+        self._syncing = False
+        self.sync_timer.stop()
+        self._sent = 0
+        self._returned = 0
+        self._counts = (self.stream.packets_received, self.stream.packets_invalid)
+        self._probe_start = time.monotonic()
+        for _ in range(min(self.probe_window, self.probe_pings)):
+            self._send_probe()
+
+    def _send_probe(self):
+        payload = _PROBE_SEQUENCE.pack(self._sent) + self._pattern
+        self._sent += 1
+        self.stream.send_packet(PacketType.PING, payload, False)
+
+    def _on_packet(self, packet_type: int, payload: bytes):
+        if packet_type != PacketType.PONG or len(payload) != self.probe_payload:
+            return  # Heartbeat PONGs are empty
+        if self.state == LinkSpeedState.FALLING_BACK:
+            if self._syncing and payload == self._sync:
+                self._resynced()
+            return
+        if self.state != LinkSpeedState.PROBING:
+            return
+
+        if payload == self._sync:
+            if self._syncing:
+                self._start_timing()
+            return  # Late echoes of earlier sync PINGs
+        if self._syncing:
+            return
+        if payload != _PROBE_SEQUENCE.pack(self._returned) + self._pattern:
+            self._fail()
+            return
+        self._returned += 1
+        if self._sent < self.probe_pings:
+            self._send_probe()
+        elif self._returned == self.probe_pings:
+            self._probe_done()
+
+    def _probe_done(self):
+        self.timer.stop()
+        elapsed = time.monotonic() - self._probe_start
+        if self.stream.packets_invalid != self._counts[1]:
+            self._fail()
+            return
+
+        round_trips = self.probe_pings / elapsed
+        goodput = 2 * self.probe_pings * self.probe_payload / elapsed
+        self.verified[self.rate] = (round_trips, goodput)
+        self.rate_verified.emit(self.rate, round_trips, goodput)
+
+        faster = [r for r in self.rates if self.rate < r <= self.ceiling]
+        if faster:
+            self._request(faster[0])
+        else:
+            self._settle()
+
+    def _request(self, rate: int):
+        self.state = LinkSpeedState.REQUESTED
+        self.target = rate
+        self.timer.start()
+        self.rate_requested.emit(rate)
+
+    def _settle(self):
+        self.timer.stop()
+        self.state = LinkSpeedState.STABLE
+        self._counts = (self.stream.packets_received, self.stream.packets_invalid)
+        self.check_timer.start()
+
+    def _fail(self):
+        """The rate being probed, or one of the two in a rate change, does not work"""
+        failed = self.rate
+        if self.state == LinkSpeedState.REQUESTED:
+            failed = max(self.rate, self.target)
+        self.verified.pop(failed, None)
+        self.ceiling = max(
+            [r for r in self.verified if r < failed], default=self.base_rate
+        )
+        self.timer.stop()
+        self.sync_timer.stop()
+        self.check_timer.stop()
+
+        if failed == self.base_rate:
+            # Nothing slower to go to, the watchdog deals with a bad link
+            self._settle()
+            return
+
+        self.state = LinkSpeedState.FALLING_BACK
+        self.target = self.ceiling
+        self.rate = self.base_rate
+        self.fallback_requested.emit("errors at the faster baud rate")
+        self.rate_requested.emit(self.target)  # Sent once resynced
+        self.resync_timer.start()
+
+    def _resync(self):
+        # Garbage from before the switch can hold up the executor's parser,
+        # so a sync PING must come back before anything else is sent
+        self._syncing = True
+        self.sync_timer.start()
+        self._send_sync()
+        if not self._restarting:
+            self.timer.start()  # For the target rate to be confirmed
+
+    def _resynced(self):
+        self._syncing = False
+        self.sync_timer.stop()
+        if self._restarting:
+            # Started over like a new session once the parameters are settled
+            self._restarting = False
+            self.state = LinkSpeedState.IDLE
+        self.resync_requested.emit()
+
+    def _on_timeout(self):
+        if self.state in (LinkSpeedState.PROBING, LinkSpeedState.REQUESTED):
+            self._fail()
+        elif self.state == LinkSpeedState.FALLING_BACK:
+            if self._syncing:
+                self._resynced()  # Send anyway, the watchdog reports a dead link
+            self.ceiling = self.base_rate
+            self._settle()
+
+    def _check_errors(self):
+        received, invalid = self.stream.packets_received, self.stream.packets_invalid
+        new_received = received - self._counts[0]
+        new_invalid = invalid - self._counts[1]
+        self._counts = (received, invalid)
+
+        self._invalid_run = self._invalid_run + new_invalid if not new_received else 0
+        if self.state == LinkSpeedState.STABLE and (
+            self._invalid_run >= self.desync_packets
+        ):
+            self.resync()
+            return
+
+        if self.state != LinkSpeedState.STABLE or self.rate == self.base_rate:
+            return
+        if new_invalid >= 3 and new_invalid / (new_received + new_invalid) > (
+            self.error_limit
+        ):
+            # Step down while the link still mostly works, _fail() if it does not
+            self.check_timer.stop()
+            self.ceiling = max(r for r in self.rates if r < self.rate)
+            self._request(self.ceiling)
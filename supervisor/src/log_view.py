@@ -0,0 +1,246 @@
+import math
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt6.QtWidgets import QComboBox, QHeaderView, QTableView
+
+from src.packet_log import PacketDirection, PacketLog, SequenceIndex
+from src.packet_protocol import PacketParser, PacketType
+
+
+class PacketLogModel(QAbstractTableModel):
+    """
+    Table model over a PacketLog.
+
+    Appending to the log does not touch the model. Instead flush() is
+    called on a timer, which tells the view about every row that was
+    added or overwritten since the last flush in one go. Text is only
+    built in data(), so only the rows on screen are ever formatted.
+
+    With a filter set, only the packets matching PacketLog.query are
+    shown, and each flush only queries the packets appended since the
+    last one.
+    """
+
+    COLUMNS = ("Time", "MCU time", "Dir", "Type", "Payload")
+
+    def __init__(self, log: PacketLog, parent=None):
+        super().__init__(parent)
+        self.log = log
+        # Sequence numbers of the rows the view currently knows about
+        self._first: int = log.first
+        self._end: int = log.total
+
+        # Filtered rows, None when showing everything
+        self._filter: dict[str, Any] | None = None
+        self._rows: SequenceIndex | None = None
+
+    def rowCount(self, parent: QModelIndex | None = None):
+        if parent is not None and parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return self._end - self._first
+
+    def columnCount(self, parent: QModelIndex | None = None):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        if self._rows is not None:
+            sequence = self._rows[index.row()]
+        else:
+            sequence = self._first + index.row()
+        if not self.log.contains(sequence):
+            # Overwritten since the last flush, the row is about to go away
+            return None
+
+        timestamp, direction, packet_type, payload = self.log.record(sequence)
+        column = index.column()
+        if column == 0:
+            return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S.%f")
+        elif column == 1:
+            executor_time = self.log.executor_time(sequence)
+            return "" if math.isnan(executor_time) else f"{executor_time:.3f}"
+        elif column == 2:
+            return "->" if direction == PacketDirection.SENT else "<-"
+        elif column == 3:
+            return PacketParser.type_name(packet_type)
+        elif column == 4:
+            return payload.hex(" ")
+        return None
+
+    def flush(self) -> bool:
+        """
+        Publish everything appended since the last flush.
+
+        Returns:
+            True if any rows changed
+        """
+        first = self.log.first
+        end = self.log.total
+        if first == self._first and end == self._end:
+            return False
+
+        if self._rows is not None:
+            return self._flush_filtered(first, end)
+
+        # Rows that fell out of the ring
+        dropped = min(first, self._end) - self._first
+        if dropped > 0:
+            self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+            self._first += dropped
+            self.endRemoveRows()
+
+        if first > self._first:
+            # Everything the view knew about is gone
+            self._first = first
+            self._end = first
+
+        added = end - self._end
+        if added > 0:
+            rows = self._end - self._first
+            self.beginInsertRows(QModelIndex(), rows, rows + added - 1)
+            self._end = end
+            self.endInsertRows()
+
+        return True
+
+    def _flush_filtered(self, first: int, end: int) -> bool:
+        rows = self._rows
+        assert rows is not None and self._filter is not None
+
+        live = rows.data[rows.start : rows.end]
+        dropped = int(np.searchsorted(live, first))
+        if dropped > 0:
+            self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+            rows.start += dropped
+            self.endRemoveRows()
+
+        matches = self.log.query(**self._filter, start=self._end)
+        self._first = first
+        self._end = end
+        if len(matches) > 0:
+            count = len(rows)
+            self.beginInsertRows(QModelIndex(), count, count + len(matches) - 1)
+            rows.extend(matches, first)
+            self.endInsertRows()
+
+        return dropped > 0 or len(matches) > 0
+
+    def set_filter(self, **query: Any):
+        """
+        Only show packets matching a PacketLog.query, e.g.
+        set_filter(packet_type=PacketType.NACK). No arguments shows everything.
+        """
+        self.beginResetModel()
+        self._first = self.log.first
+        self._end = self.log.total
+        if query:
+            self._filter = query
+            self._rows = SequenceIndex()
+            self._rows.extend(self.log.query(**query), self._first)
+        else:
+            self._filter = None
+            self._rows = None
+        self.endResetModel()
+
+    def reset(self):
+        """Resync with the log after it was cleared"""
+        if self._filter is not None:
+            self.set_filter(**self._filter)
+        else:
+            self.set_filter()
+
+
+class PacketLogView:
+    """
+    Hooks a PacketLogModel up to a QTableView and flushes it at the
+    display refresh rate. Keeps following new packets while the view is
+    scrolled to the bottom.
+    """
+
+    def __init__(
+        self,
+        view: QTableView,
+        log: PacketLog,
+        refresh_interval: int,
+        type_filter: QComboBox | None = None,
+        direction_filter: QComboBox | None = None,
+    ):
+        """
+        Args:
+            view: Table to show the log in
+            log: Log to show
+            refresh_interval: Milliseconds between flushes
+            type_filter: Optional combo box to filter by packet type
+            direction_filter: Optional combo box to filter by direction
+        """
+        self.view = view
+        self.model = PacketLogModel(log, view)
+        view.setModel(self.model)
+
+        # Fixed row heights and no row header let the view skip measuring every row
+        vertical = view.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(view.fontMetrics().height() + 4)
+        horizontal = view.horizontalHeader()
+        horizontal.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        view.setColumnWidth(0, view.fontMetrics().horizontalAdvance("00:00:00.000000 "))
+        view.setColumnWidth(1, view.fontMetrics().horizontalAdvance("000000.000 "))
+        view.setColumnWidth(2, view.fontMetrics().horizontalAdvance(" <- "))
+        view.setColumnWidth(
+            3, view.fontMetrics().horizontalAdvance("CMD_READ_SENSOR  ")
+        )
+
+        self.type_filter = type_filter
+        if type_filter is not None:
+            type_filter.addItem("All types", None)
+            for packet_type in PacketType:
+                type_filter.addItem(packet_type.name, int(packet_type))
+            type_filter.currentIndexChanged.connect(self.apply_filter)
+
+        self.direction_filter = direction_filter
+        if direction_filter is not None:
+            direction_filter.addItem("Both ways", None)
+            direction_filter.addItem("Sent ->", int(PacketDirection.SENT))
+            direction_filter.addItem("Received <-", int(PacketDirection.RECEIVED))
+            direction_filter.currentIndexChanged.connect(self.apply_filter)
+
+        self.timer = QTimer(view)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_interval)
+
+    def apply_filter(self):
+        query = {}
+        if self.type_filter is not None and self.type_filter.currentData() is not None:
+            query["packet_type"] = self.type_filter.currentData()
+        if (
+            self.direction_filter is not None
+            and self.direction_filter.currentData() is not None
+        ):
+            query["direction"] = PacketDirection(self.direction_filter.currentData())
+        self.model.set_filter(**query)
+        self.view.scrollToBottom()
+
+    def refresh(self):
+        scrollbar = self.view.verticalScrollBar()
+        following = scrollbar.value() >= scrollbar.maximum()
+
+        if self.model.flush() and following:
+            self.view.scrollToBottom()
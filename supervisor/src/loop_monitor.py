@@ -0,0 +1,200 @@
+import sys
+import threading
+import time
+from collections import deque
+from types import FrameType
+
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+
+class EventLoopMonitor(QThread):
+    """
+    Measures how late the GUI thread's event loop services timers.
+
+    A precise timer on the GUI thread fires every `interval` and records
+    how much later than expected it ran. That lag is what every
+    readyRead, axis signal and timer sees on top of its own work.
+
+    This thread watches the timer's heartbeat. When it is overdue by the
+    stall limit, the GUI thread is stuck in something, and the slot it is
+    in is looked up from its stack: the frame at the same depth as the
+    timer's own slot, which is whatever the event loop called. When the
+    timer fires again the stall is reported with that slot, or as
+    "outside Python" for e.g. a long native paint or a blocking call.
+
+    Signals:
+        lag_updated(float, float, float): p50, p99 and max lag in ms over
+            the window, every report interval
+        stalled(float, str): Lag in seconds of a stall and the slot the
+            GUI thread was in
+    """
+
+    lag_updated = pyqtSignal(float, float, float)
+    stalled = pyqtSignal(float, str)
+
+    def __init__(
+        self, interval: int, window: int, stall_limit: float, report_interval: int
+    ):
+        """
+        Args:
+            interval: Milliseconds between lag samples
+            window: Samples the percentiles are taken over
+            stall_limit: Seconds of lag reported as a stall
+            report_interval: Milliseconds between lag_updated signals
+        """
+        super().__init__()
+        self.interval = interval / 1000
+        self.stall_limit = stall_limit
+
+        self.samples = 0
+        self.stalls = 0
+        self.max_lag = 0.0  # Seconds, since start
+        self.total_lag = 0.0  # Seconds, summed over every sample
+        self.last_stall: tuple[float, str] | None = None
+        self._lags: deque[float] = deque(maxlen=window)
+        self._expected = 0.0
+        self._slot_depth: int | None = None
+        self._main_thread = threading.get_ident()
+
+        self.running = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        # Guarded by _lock
+        self._last_beat = 0.0
+        self._culprit: str | None = None
+
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self._on_tick)
+        self.report_timer = QTimer()
+        self.report_timer.setInterval(report_interval)
+        self.report_timer.timeout.connect(self._report)
+
+    def start(self):
+        """Start sampling, from the GUI thread"""
+        now = time.perf_counter()
+        self._main_thread = threading.get_ident()
+        self._expected = now + self.interval
+        with self._lock:
+            self._last_beat = now
+            self._culprit = None
+        self.timer.start()
+        self.report_timer.start()
+        super().start()
+
+    def stop(self):
+        self.timer.stop()
+        self.report_timer.stop()
+        self.running = False
+        self._wake.set()
+
+    def percentiles(self) -> tuple[float, float, float]:
+        """p50, p99 and max lag in ms over the window"""
+        if not self._lags:
+            return (0.0, 0.0, 0.0)
+        lags = sorted(self._lags)
+        return (
+            lags[len(lags) // 2] * 1000,
+            lags[min(len(lags) - 1, int(len(lags) * 0.99))] * 1000,
+            lags[-1] * 1000,
+        )
+
+    def as_dict(self) -> dict[str, float]:
+        """Lags are in milliseconds"""
+        p50, p99, window_max = self.percentiles()
+        return {
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "p50": p50,
+            "p99": p99,
+            "window_max": window_max,
+            "max": self.max_lag * 1000,
+        }
+
+    def _on_tick(self):
+        now = time.perf_counter()
+        if self._slot_depth is None:
+            self._slot_depth = _depth(sys._getframe())
+
+        lag = max(0.0, now - self._expected)
+        self._expected = now + self.interval
+        with self._lock:
+            self._last_beat = now
+            culprit = self._culprit
+            self._culprit = None
+
+        self.samples += 1
+        self._lags.append(lag)
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.stall_limit:
+            self.stalls += 1
+            self.last_stall = (lag, culprit or "outside Python")
+            self.stalled.emit(*self.last_stall)
+
+    def _report(self):
+        self.lag_updated.emit(*self.percentiles())
+
+    def run(self):
+        self.running = True
+        while self.running:
+            self._wake.wait(self.stall_limit / 4)
+            self._wake.clear()
+
+            with self._lock:
+                beat = self._last_beat
+                if self._culprit is not None:
+                    continue
+            if time.perf_counter() - beat < self.interval + self.stall_limit:
+                continue
+
+            frame = sys._current_frames().get(self._main_thread)
+            culprit = self._describe(frame)
+            with self._lock:
+                if self._last_beat == beat:  # Still the same stall
+                    self._culprit = culprit
+
+    def _describe(self, frame: FrameType | None) -> str | None:
+        """The slot the event loop called and where in it the stack is"""
+        if frame is None or self._slot_depth is None:
+            return None
+        stack = []
+        while frame is not None:
+            stack.append(frame)
+            frame = frame.f_back
+        stack.reverse()
+        if len(stack) < self._slot_depth:
+            return None  # Back in the event loop, stuck in native code
+
+        # Skip the timing wrappers added by the profiler
+        index = self._slot_depth - 1
+        while (
+            index + 1 < len(stack)
+            and stack[index].f_globals.get("__name__") == "src.profiling"
+        ):
+            index += 1
+        slot = stack[index]
+        inner = stack[-1]
+        where = _location(slot)
+        if inner is not slot:
+            where += f", in {_location(inner)}"
+        return where
+
+
+def _depth(frame: FrameType | None) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def _location(frame: FrameType) -> str:
+    code = frame.f_code
+    file = code.co_filename.replace("\\", "/").rsplit("/", 1)[-1]
+    owner = frame.f_locals.get("self")
+    name = code.co_name
+    if owner is not None:
+        name = f"{type(owner).__name__}.{name}"
+    return f"{name} ({file}:{frame.f_lineno})"
@@ -0,0 +1,202 @@
+import math
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# A sample is its labels and value, a metric reader returns all of its samples
+Labels = tuple[tuple[str, str], ...]
+Samples = list[tuple[Labels, float]]
+
+
+class Counter:
+    """
+    Monotonic count without a lock.
+
+    Only one thread may call inc(), then `value` is always a consistent
+    int or float to readers, the GIL makes the rebinding atomic.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Last set value, same threading rules as Counter"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value: float = 0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class MetricsRegistry:
+    """
+    Named metrics rendered in the Prometheus text format (0.0.4).
+
+    counter() and gauge() create value holders updated by their owner.
+    collect() registers a reader for counts kept elsewhere, like the
+    packet counts in PacketStream, and summary() the readers of a
+    summary's quantiles, sum and count. render() runs on the exporter's
+    thread, so readers must only copy plain values and never call into
+    Qt or iterate something the GUI thread may change.
+    """
+
+    def __init__(self, prefix: str = ""):
+        self.prefix = prefix
+        # Name, help, type and each series' name suffix and reader
+        self._metrics: list[
+            tuple[str, str, str, tuple[tuple[str, Callable[[], Samples]], ...]]
+        ] = []
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        counter = Counter()
+        self.collect(name, help_text, "counter", lambda: [((), counter.value)])
+        return counter
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        gauge = Gauge()
+        self.collect(name, help_text, "gauge", lambda: [((), gauge.value)])
+        return gauge
+
+    def collect(
+        self,
+        name: str,
+        help_text: str,
+        metric_type: str,
+        read: Callable[[], Samples],
+    ):
+        """
+        Args:
+            name: Metric name, without the registry prefix
+            help_text: One line description
+            metric_type: "counter" or "gauge", summaries go through summary()
+            read: Returns the samples, called on every scrape
+        """
+        self._metrics.append(
+            (self.prefix + name, help_text, metric_type, (("", read),))
+        )
+
+    def summary(
+        self,
+        name: str,
+        help_text: str,
+        quantiles: Callable[[], Samples],
+        total: Callable[[], float],
+        count: Callable[[], float],
+    ):
+        """
+        Args:
+            name: Metric name, without the registry prefix
+            help_text: One line description
+            quantiles: Returns the samples, each with a "quantile" label
+            total: Sum of every observation, rendered as name_sum
+            count: Number of observations, rendered as name_count
+        """
+        series = (
+            ("", quantiles),
+            ("_sum", lambda: [((), total())]),
+            ("_count", lambda: [((), count())]),
+        )
+        self._metrics.append((self.prefix + name, help_text, "summary", series))
+
+    def render(self) -> str:
+        lines = []
+        for name, help_text, metric_type, series in self._metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix, read in series:
+                for labels, value in read():
+                    lines.append(
+                        f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves a MetricsRegistry at /metrics over HTTP from its own threads,
+    so a scrape is answered even while the GUI thread is busy.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        """
+        Args:
+            registry: Metrics to serve
+            host: Address to listen on, keep it on localhost
+            port: Port to listen on, 0 for any free one
+        """
+        self.registry = registry
+        self.host = host
+        self.listen_port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """Port being listened on, 0 when stopped"""
+        return self._server.server_address[1] if self._server is not None else 0
+
+    def start(self):
+        """
+        Raises:
+            OSError: The port is not available
+        """
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # No line per scrape on stderr
+
+        self._server = ThreadingHTTPServer((self.host, self.listen_port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
@@ -0,0 +1,114 @@
+import math
+
+from src.config import DEFAULT_TENDON_MOTOR_SPEED, TENDON_STEPS_PER_REV
+
+
+class PositionStepperModel:
+    """
+    Supervisor-side copy of the executor's PositionStepper.
+
+    Mirrors the firmware rules: setpoints are ignored while stopped,
+    stopping halts the motor where it is, and starting does not resume
+    an old move until a new setpoint arrives. Targets are truncated to
+    whole steps the same way rotationsToSteps does.
+    """
+
+    def __init__(self, speed: float = DEFAULT_TENDON_MOTOR_SPEED):
+        self.position: float = 0.0  # Steps
+        self.target: int = 0  # Steps
+        self.moving: bool = False
+        self.stopped: bool = True
+        self.set_speed(speed)
+
+    def set_speed(self, rpm: float):
+        """Set the step rate from an rpm value, like PositionStepper::setSpeed"""
+        steps_per_second = rpm * TENDON_STEPS_PER_REV / 60
+        # The firmware falls back to one step per second for non-positive speeds
+        self.steps_per_second = steps_per_second if steps_per_second > 0 else 1.0
+
+    def start(self):
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+        self.moving = False
+
+    def move_to(self, radians: float) -> bool:
+        """Start a move to a position in radians, returns False if stopped"""
+        if self.stopped:
+            return False
+        self.target = int(radians / (2 * math.pi) * TENDON_STEPS_PER_REV)
+        self.moving = True
+        return True
+
+    def advance(self, dt: float):
+        if not self.moving or dt <= 0:
+            return
+
+        remaining = self.target - self.position
+        step = self.steps_per_second * dt
+        if abs(remaining) <= step:
+            self.position = float(self.target)
+            self.moving = False
+        else:
+            self.position += math.copysign(step, remaining)
+
+    @property
+    def radians(self) -> float:
+        return self.position / TENDON_STEPS_PER_REV * 2 * math.pi
+
+
+class ExecutorModel:
+    """
+    Dead-reckoning estimate of where the executor's tendon motors are,
+    built only from the commands the supervisor sends. Costs nothing on
+    the serial link.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Back to how the executor boots: at zero, stopped, default speed"""
+        self.tendons: tuple[PositionStepperModel, ...] = (
+            PositionStepperModel(),
+            PositionStepperModel(),
+            PositionStepperModel(),
+        )
+        self._last_time: float | None = None
+
+    def advance(self, timestamp: float):
+        """Move every motor forward to timestamp (seconds)"""
+        if self._last_time is not None:
+            dt = timestamp - self._last_time
+            for motor in self.tendons:
+                motor.advance(dt)
+        self._last_time = timestamp
+
+    def set_tendons(self, targets: tuple[float, float, float], timestamp: float):
+        """Record a CMD_SET_TENDONS (radians)"""
+        self.advance(timestamp)
+        for motor, target in zip(self.tendons, targets):
+            # The executor gives up on the remaining motors after one refuses
+            if not motor.move_to(target):
+                break
+
+    def set_tendon_speed(self, rpm: float, timestamp: float):
+        """Record a TENDON_MOTOR_SPEED parameter change"""
+        self.advance(timestamp)
+        for motor in self.tendons:
+            motor.set_speed(rpm)
+
+    def set_running(self, running: bool, timestamp: float):
+        """Record a CMD_START (True) or CMD_STOP (False)"""
+        self.advance(timestamp)
+        for motor in self.tendons:
+            if running:
+                motor.start()
+            else:
+                motor.stop()
+
+    def tendon_positions(self) -> tuple[float, float, float]:
+        """Estimated tendon motor positions in radians"""
+        t1, t2, t3 = self.tendons
+        return (t1.radians, t2.radians, t3.radians)
@@ -0,0 +1,159 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QBrush
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QStatusBar
+
+
+class NotificationLevel(IntEnum):
+    INFO = 0
+    WARNING = 1
+    ERROR = 2
+
+
+@dataclass
+class Notification:
+    """One deduplicated message"""
+
+    key: str
+    text: str  # Most recent text for this key
+    level: NotificationLevel
+    first_seen: float
+    last_seen: float
+    count: int = 1
+
+
+class NotificationCenter(QObject):
+    """
+    Non-modal replacement for popping up a QMessageBox per error.
+
+    notify() only records the message, so it is safe to call from the
+    serial and packet paths however often they fail. Messages with the
+    same key are merged into one entry with a count, and at most
+    `history` entries are kept. Widgets are updated from a timer, at
+    most once per refresh interval and only when something changed.
+
+    Signals:
+        changed(int): Emitted with the number of unseen messages on refresh
+            and when they are marked seen
+    """
+
+    changed = pyqtSignal(int)
+
+    def __init__(
+        self,
+        history: int,
+        refresh_interval: int,
+        list_widget: QListWidget | None = None,
+        status_bar: QStatusBar | None = None,
+    ):
+        """
+        Args:
+            history: Maximum number of distinct messages kept
+            refresh_interval: Minimum milliseconds between widget updates
+            list_widget: Optional list showing every kept message
+            status_bar: Optional status bar to flash the latest message on
+        """
+        super().__init__()
+        self.history = history
+        self.list_widget = list_widget
+        self.status_bar = status_bar
+
+        self._entries: OrderedDict[str, Notification] = OrderedDict()
+        self._dirty = False
+        self._latest: Notification | None = None
+        self.unseen: int = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(refresh_interval)
+
+    def notify(
+        self,
+        text: str,
+        level: NotificationLevel = NotificationLevel.ERROR,
+        key: str | None = None,
+    ):
+        """
+        Record a message. Never blocks and never touches a widget.
+
+        Args:
+            text: Message to show
+            level: Severity
+            key: Messages with the same key are merged, defaults to the
+                text before any ": " detail, so e.g. every
+                "Invalid packet received: ..." counts as one message
+        """
+        if key is None:
+            key = text.partition(": ")[0]
+
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = Notification(key, text, level, now, now)
+            self._entries[key] = entry
+            if len(self._entries) > self.history:
+                self._entries.popitem(last=False)
+        else:
+            entry.text = text
+            entry.level = max(entry.level, level)
+            entry.last_seen = now
+            entry.count += 1
+            self._entries.move_to_end(key)
+
+        self._latest = entry
+        self.unseen += 1
+        self._dirty = True
+
+    def entries(self) -> list[Notification]:
+        """Kept messages, most recent last"""
+        return list(self._entries.values())
+
+    def mark_seen(self):
+        if self.unseen:
+            self.unseen = 0
+            self.changed.emit(0)
+
+    def clear(self):
+        self._entries.clear()
+        self._latest = None
+        self._dirty = True
+        self.mark_seen()
+
+    def refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        if self.list_widget is not None:
+            self._fill_list(self.list_widget)
+
+        if self.status_bar is not None and self._latest is not None:
+            latest = self._latest
+            suffix = f" (x{latest.count})" if latest.count > 1 else ""
+            self.status_bar.showMessage(f"{latest.text}{suffix}", 5000)
+            self._latest = None
+
+        self.changed.emit(self.unseen)
+
+    def _fill_list(self, list_widget: QListWidget):
+        list_widget.setUpdatesEnabled(False)
+        list_widget.clear()
+        for entry in reversed(self._entries.values()):
+            stamp = datetime.fromtimestamp(entry.last_seen).strftime("%H:%M:%S")
+            text = f"[{stamp}] {entry.text}"
+            if entry.count > 1:
+                since = datetime.fromtimestamp(entry.first_seen).strftime("%H:%M:%S")
+                text += f"  (x{entry.count} since {since})"
+
+            item = QListWidgetItem(text)
+            if entry.level == NotificationLevel.ERROR:
+                item.setForeground(QBrush(Qt.GlobalColor.red))
+            elif entry.level == NotificationLevel.WARNING:
+                item.setForeground(QBrush(Qt.GlobalColor.darkYellow))
+            list_widget.addItem(item)
+        list_widget.setUpdatesEnabled(True)
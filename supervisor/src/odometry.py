@@ -0,0 +1,122 @@
+import math
+
+import numpy as np
+
+from src.config import (
+    BODY_SPOOL_DIAMETER,
+    EVERSION_RATIO,
+    ODOMETRY_HISTORY_INTERVAL,
+    ODOMETRY_HISTORY_SIZE,
+)
+
+
+class SpoolOdometry:
+    """
+    Dead-reckons spool rotation and everted length from the spool
+    speed commands sent to the executor.
+
+    The executor holds each CMD_SET_SPOOL speed until the next one, so
+    between commands the speed is piecewise constant and every update
+    is a single multiply-add. CMD_STOP pauses the spool without
+    clearing its speed, and CMD_START resumes it, which is tracked with
+    set_running.
+
+    History is kept in a fixed size array. When it fills up every other
+    sample is dropped and the sample interval doubles, so the whole run
+    stays covered with bounded memory.
+    """
+
+    def __init__(
+        self,
+        initial_length: float = 0.0,
+        history_size: int = ODOMETRY_HISTORY_SIZE,
+        history_interval: float = ODOMETRY_HISTORY_INTERVAL,
+    ):
+        """
+        Args:
+            initial_length: Everted length in meters at rotation zero
+            history_size: Number of (time, rotations) samples kept
+            history_interval: Starting time in seconds between history samples
+        """
+        self.initial_length = initial_length
+        self.meters_per_rev = math.pi * BODY_SPOOL_DIAMETER * EVERSION_RATIO
+
+        self._rotations = 0.0  # Revolutions at self._last_time
+        self._speed = 0.0  # rpm
+        self._running = False
+        self._last_time: float | None = None
+
+        self._history = np.zeros((history_size, 2), dtype=np.float64)
+        self._history_count = 0
+        self._base_history_interval = history_interval
+        self._history_interval = history_interval
+        self._next_history_time = 0.0
+
+    def _advance(self, timestamp: float):
+        """Integrate the current speed up to timestamp"""
+        if self._last_time is not None and self._running:
+            dt = timestamp - self._last_time
+            if dt > 0:
+                self._rotations += self._speed * dt / 60
+        if self._last_time is None or timestamp > self._last_time:
+            self._last_time = timestamp
+
+        if timestamp >= self._next_history_time:
+            self._record(timestamp)
+
+    def _record(self, timestamp: float):
+        if self._history_count == len(self._history):
+            # Halve the resolution instead of forgetting the start of the run
+            kept = self._history[::2].copy()
+            self._history_count = len(kept)
+            self._history[: self._history_count] = kept
+            self._history_interval *= 2
+
+        self._history[self._history_count] = (timestamp, self._rotations)
+        self._history_count += 1
+        self._next_history_time = timestamp + self._history_interval
+
+    def set_speed(self, rpm: float, timestamp: float):
+        """Record a spool speed command sent at timestamp (seconds)"""
+        self._advance(timestamp)
+        self._speed = rpm
+
+    def set_running(self, running: bool, timestamp: float):
+        """Record a CMD_START (True) or CMD_STOP (False)"""
+        self._advance(timestamp)
+        self._running = running
+
+    def reset(self, initial_length: float | None = None):
+        """Zero the rotation count and history, e.g. after re-spooling the body"""
+        if initial_length is not None:
+            self.initial_length = initial_length
+        self._rotations = 0.0
+        self._last_time = None
+        self._history_count = 0
+        self._history_interval = self._base_history_interval
+        self._next_history_time = 0.0
+
+    def rotations(self, timestamp: float | None = None) -> float:
+        """Estimated spool rotations, extrapolated to timestamp if given"""
+        if (
+            timestamp is None
+            or self._last_time is None
+            or not self._running
+            or timestamp <= self._last_time
+        ):
+            return self._rotations
+        return self._rotations + self._speed * (timestamp - self._last_time) / 60
+
+    def everted_length(self, timestamp: float | None = None) -> float:
+        """Estimated everted length in meters, never below zero"""
+        length = self.initial_length + self.rotations(timestamp) * self.meters_per_rev
+        return max(0.0, length)
+
+    @property
+    def speed(self) -> float:
+        """Spool speed in rpm, zero while stopped"""
+        return self._speed if self._running else 0.0
+
+    def history(self) -> np.ndarray:
+        """(N, 2) array of (timestamp, rotations) samples, oldest first"""
+        return self._history[: self._history_count].copy()
@@ -0,0 +1,21 @@
+import os
+
+
+def requested(argv: list[str], env_var: str, flag: str, default: str) -> str | None:
+    """
+    Value of an opt-in feature: `env_var` if set, else `default` when
+    `flag` is on the command line, else None for off.
+
+    Args:
+        argv: Command line
+        env_var: Environment variable holding the value
+        flag: Command line flag that turns the feature on with `default`
+        default: Value used for the flag alone
+
+    Returns:
+        The value as a string, or None when the feature is not wanted
+    """
+    value = os.environ.get(env_var, "")
+    if value:
+        return value
+    return default if flag in argv else None
@@ -0,0 +1,364 @@
+import math
+import struct
+from collections.abc import Callable
+from enum import IntEnum
+
+import numpy as np
+
+from src.config import PACKET_LOG_ARENA_SIZE, PACKET_LOG_CAPACITY
+from src.packet_protocol import PacketParser, PacketType
+from src.sensors import decode_sensor_batch
+
+# numpy equivalents of the struct codes used in PacketParser.LAYOUTS
+_STRUCT_TO_DTYPE = {
+    "B": "u1",
+    "b": "i1",
+    "H": "<u2",
+    "h": "<i2",
+    "I": "<u4",
+    "i": "<i4",
+    "f": "<f4",
+}
+
+
+class PacketDirection(IntEnum):
+    """Which way a logged packet went"""
+
+    SENT = 0  # Supervisor -> Executor
+    RECEIVED = 1  # Executor -> Supervisor
+
+
+class SequenceIndex:
+    """
+    Growable, sorted array of sequence numbers, e.g. every packet of one
+    type. Sequences that fell out of the log are dropped lazily.
+    """
+
+    def __init__(self, size: int = 1024):
+        self.data = np.zeros(size, dtype=np.int64)
+        self.start = 0
+        self.end = 0
+
+    def append(self, sequence: int, first: int):
+        if self.end == len(self.data):
+            self._compact(first, 1)
+        self.data[self.end] = sequence
+        self.end += 1
+
+    def extend(self, sequences: np.ndarray, first: int):
+        if self.end + len(sequences) > len(self.data):
+            self._compact(first, len(sequences))
+        self.data[self.end : self.end + len(sequences)] = sequences
+        self.end += len(sequences)
+
+    def _compact(self, first: int, extra: int):
+        """Drop sequences that fell out of the log, grow if still over half full"""
+        live = self.live(first)
+        count = len(live)
+        size = len(self.data)
+        while (count + extra) * 2 >= size:
+            size *= 2
+        if size != len(self.data):
+            data = np.zeros(size, dtype=np.int64)
+            data[:count] = live
+            self.data = data
+        else:
+            self.data[:count] = live
+        self.start = 0
+        self.end = count
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, position: int) -> int:
+        return int(self.data[self.start + position])
+
+    def live(self, first: int) -> np.ndarray:
+        view = self.data[self.start : self.end]
+        skip = int(np.searchsorted(view, first))
+        self.start += skip
+        return view[skip:]
+
+
+class PacketLog:
+    """
+    Columnar, fixed-capacity packet history.
+
+    Timestamps, directions, types and payload lengths live in
+    preallocated NumPy rings, and payload bytes in a separate byte ring
+    (the arena). A record is dropped once either its row or its payload
+    bytes are overwritten, so memory and the cost of an append stay
+    constant however long the supervisor runs. Nothing is formatted
+    here; that is left to whatever displays it.
+
+    Records are addressed by their sequence number, which counts every
+    packet ever appended. Each packet type keeps an index of its
+    sequence numbers so queries only look at matching packets.
+    """
+
+    def __init__(
+        self,
+        capacity: int = PACKET_LOG_CAPACITY,
+        arena_size: int = PACKET_LOG_ARENA_SIZE,
+    ):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.executor_times = np.zeros(capacity, dtype=np.float64)  # NaN if unknown
+        self.directions = np.zeros(capacity, dtype=np.uint8)
+        self.types = np.zeros(capacity, dtype=np.uint8)
+        self.lengths = np.zeros(capacity, dtype=np.uint8)
+        self.offsets = np.zeros(capacity, dtype=np.int64)  # Into the arena
+
+        self.arena_size = arena_size
+        self.arena = bytearray(arena_size)
+        self._arena_view = np.frombuffer(self.arena, dtype=np.uint8)
+        self.arena_total: int = 0  # Payload bytes ever written
+
+        self.total: int = 0  # Number of packets ever appended
+        self.first: int = 0  # Sequence number of the oldest stored record
+        self._indexes: dict[int, SequenceIndex] = {}
+
+    def append(
+        self,
+        direction: PacketDirection,
+        packet_type: int,
+        payload: bytes,
+        timestamp: float,
+        executor_time: float = math.nan,
+    ):
+        length = len(payload)
+        start = self.arena_total % self.arena_size
+        end = start + length
+        if end <= self.arena_size:
+            self.arena[start:end] = payload
+        else:
+            split = self.arena_size - start
+            self.arena[start:] = payload[:split]
+            self.arena[: end - self.arena_size] = payload[split:]
+
+        sequence = self.total
+        slot = sequence % self.capacity
+        self.timestamps[slot] = timestamp
+        self.executor_times[slot] = executor_time
+        self.directions[slot] = direction
+        self.types[slot] = packet_type
+        self.lengths[slot] = length
+        self.offsets[slot] = self.arena_total
+
+        self.arena_total += length
+        self.total += 1
+        self._evict()
+
+        index = self._indexes.get(packet_type)
+        if index is None:
+            index = self._indexes[packet_type] = SequenceIndex()
+        index.append(sequence, self.first)
+
+    def _evict(self):
+        """Move first past rows or payloads that have been overwritten"""
+        if self.total > self.capacity and self.first < self.total - self.capacity:
+            self.first = self.total - self.capacity
+        if self.arena_total > self.arena_size:
+            oldest_byte = self.arena_total - self.arena_size
+            first = self.first
+            while (
+                first < self.total and self.offsets[first % self.capacity] < oldest_byte
+            ):
+                first += 1
+            self.first = first
+
+    def __len__(self) -> int:
+        return self.total - self.first
+
+    def contains(self, sequence: int) -> bool:
+        return self.first <= sequence < self.total
+
+    def record(self, sequence: int) -> tuple[float, int, int, bytes]:
+        """Get (timestamp, direction, packet_type, payload) by sequence number"""
+        if not self.contains(sequence):
+            raise IndexError(f"Packet {sequence} is not in the log")
+        slot = sequence % self.capacity
+        start = int(self.offsets[slot]) % self.arena_size
+        end = start + int(self.lengths[slot])
+        if end <= self.arena_size:
+            payload = bytes(self.arena[start:end])
+        else:
+            payload = bytes(self.arena[start:]) + bytes(
+                self.arena[: end - self.arena_size]
+            )
+        return (
+            float(self.timestamps[slot]),
+            int(self.directions[slot]),
+            int(self.types[slot]),
+            payload,
+        )
+
+    def executor_time(self, sequence: int) -> float:
+        """Executor clock in seconds when the packet was logged, NaN if unknown"""
+        if not self.contains(sequence):
+            raise IndexError(f"Packet {sequence} is not in the log")
+        return float(self.executor_times[sequence % self.capacity])
+
+    def sequences(self, packet_type: int | None = None, start: int = 0) -> np.ndarray:
+        """Sequence numbers still in the log, optionally of one type only"""
+        first = max(self.first, start)
+        if packet_type is None:
+            return np.arange(first, self.total, dtype=np.int64)
+
+        index = self._indexes.get(packet_type)
+        if index is None:
+            return np.zeros(0, dtype=np.int64)
+        live = index.live(self.first)
+        if first > self.first:
+            live = live[np.searchsorted(live, first) :]
+        return live
+
+    def sequence_at(self, timestamp: float) -> int:
+        """
+        First stored sequence number logged at or after timestamp.
+        Relies on packets being appended in time order.
+        """
+        low = self.first
+        high = self.total
+        while low < high:
+            middle = (low + high) // 2
+            if self.timestamps[middle % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def fields(self, sequences: np.ndarray, packet_type: int) -> np.ndarray:
+        """
+        Decode the payloads of packets of one type into a structured array,
+        using the layout from PacketParser.LAYOUTS.
+
+        Args:
+            sequences: Sequence numbers of packets of packet_type
+            packet_type: Type that selects the layout
+
+        Returns:
+            Structured array with one named field per payload value.
+            Packets too short for the layout decode as zeros.
+        """
+        dtype = _layout_dtype(packet_type)
+        slots = sequences % self.capacity
+        offsets = self.offsets[slots] % self.arena_size
+
+        columns = np.arange(dtype.itemsize)
+        raw = np.take(self._arena_view, offsets[:, None] + columns, mode="wrap")
+        raw[self.lengths[slots] < dtype.itemsize] = 0
+        return raw.view(dtype).ravel()
+
+    def sensor_samples(
+        self, sequences: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decode SENSOR_DATA packets, batched or one-shot, into their samples.
+
+        Example, every sample of tank pressure above 50 psi:
+            ids, times, values = log.sensor_samples(log.query(PacketType.SENSOR_DATA))
+            times[(ids == SENSORS.TANK_PRESSURE.sensor_id) & (values > 50)]
+
+        Args:
+            sequences: Sequence numbers of SENSOR_DATA packets
+
+        Returns:
+            (sensor ids, executor times in seconds, values), one entry
+            per sample in packet order. One-shot replies carry no
+            timestamp and get the executor time they were logged at.
+            Malformed payloads are skipped
+        """
+        ids, times, values = [], [], []
+        for sequence in sequences:
+            payload = self.record(int(sequence))[3]
+            batch = decode_sensor_batch(payload)
+            if batch is None and len(payload) == 5:
+                sensor_id, value = struct.unpack("<Bf", payload)
+                batch = (
+                    sensor_id,
+                    np.array([self.executor_time(int(sequence))]),
+                    np.array([value]),
+                )
+            if batch is None:
+                continue
+            ids.append(np.full(len(batch[1]), batch[0], dtype=np.uint8))
+            times.append(batch[1])
+            values.append(batch[2])
+        if not ids:
+            return (np.zeros(0, dtype=np.uint8), np.zeros(0), np.zeros(0))
+        return (np.concatenate(ids), np.concatenate(times), np.concatenate(values))
+
+    def query(
+        self,
+        packet_type: int | None = None,
+        direction: PacketDirection | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        where: Callable[[np.ndarray], np.ndarray] | None = None,
+        start: int = 0,
+    ) -> np.ndarray:
+        """
+        Find packets in the log.
+
+        Example, every CMD_SET_TENDONS with tendon 2 above 3 rad:
+            log.query(PacketType.CMD_SET_TENDONS, where=lambda f: f["tendon_2"] > 3)
+
+        Args:
+            packet_type: Only packets of this type
+            direction: Only sent or only received packets
+            since: Only packets logged at or after this timestamp
+            until: Only packets logged before this timestamp
+            where: Predicate over the decoded fields (needs packet_type)
+            start: Only packets with at least this sequence number
+
+        Returns:
+            Matching sequence numbers, oldest first
+        """
+        if since is not None:
+            start = max(start, self.sequence_at(since))
+        sequences = self.sequences(packet_type, start)
+        if until is not None:
+            end = self.sequence_at(until)
+            sequences = sequences[: np.searchsorted(sequences, end)]
+        if len(sequences) == 0:
+            return sequences
+
+        slots = sequences % self.capacity
+        mask = np.ones(len(sequences), dtype=bool)
+        if direction is not None:
+            mask &= self.directions[slots] == direction
+        if where is not None:
+            if packet_type is None:
+                raise ValueError("Field predicates need a packet type")
+            decoded = self.fields(sequences, packet_type)
+            mask &= self.lengths[slots] >= decoded.dtype.itemsize
+            mask &= where(decoded)
+
+        return sequences[mask]
+
+    def clear(self):
+        self.total = 0
+        self.first = 0
+        self.arena_total = 0
+        self._indexes.clear()
+
+
+_dtype_cache: dict[int, np.dtype] = {}
+
+
+def _layout_dtype(packet_type: int) -> np.dtype:
+    dtype = _dtype_cache.get(packet_type)
+    if dtype is None:
+        layout = PacketParser.LAYOUTS.get(PacketType(packet_type))
+        if layout is None:
+            raise ValueError(f"No payload layout for {PacketType(packet_type).name}")
+        fmt, names = layout
+        dtype = np.dtype(
+            [
+                (name, _STRUCT_TO_DTYPE[code])
+                for name, code in zip(names, fmt.lstrip("<"))
+            ]
+        )
+        _dtype_cache[packet_type] = dtype
+    return dtype
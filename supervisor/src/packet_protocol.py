@@ -1,12 +1,14 @@
+import binascii
 import string
 import struct
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Any
+from typing import Any, ClassVar
 
-from PyQt6.QtCore import QObject, pyqtSignal
-
-from src.serial_manager import SerialManager
+from src.params import decode_params, encode_params
+from src.sensors import encode_subscriptions
+from src.setpoints import decode_setpoints, encode_setpoints
 
 
 class PacketType(IntEnum):
@@ -22,21 +24,117 @@ class PacketType(IntEnum):
 
     # Supervisor -> Executor (Commands)
     CMD_SET_MODE = 0x10  # Set operating mode
-    CMD_SET_PARAM = 0x11  # Set a parameter (Float or int-32)
+    CMD_SET_PARAM = 0x11  # Set parameters (Float or int-32), one or more entries
     CMD_START = 0x12  # Start Operation
     CMD_STOP = 0x13  # Stop Operation
     CMD_RESET = 0x14  # Reset Command
     CMD_READ_SENSOR = 0x15  # Request sensor data
     CMD_SET_TENDONS = 0x16  # Set tendon steering
     CMD_SET_SPOOL = 0x17  # Set spool position
+    CMD_GET_PARAM = 0x18  # Request a PARAM_REPORT of every parameter
+    CMD_SUBSCRIBE = 0x19  # Stream sensors at given rates as batched SENSOR_DATA
+    CMD_SET_SETPOINTS = 0x1A  # Tendons and spool as int16, once negotiated
 
     # Space left here
 
     # Executor -> Supervisor (Data/Status)
     STATUS_UPDATE = 0x20  # Status update
-    SENSOR_DATA = 0x21  # Sensor data response
+    SENSOR_DATA = 0x21  # Sensor data response, one value or a streamed batch
     ERROR_REPORT = 0x22  # Error report
     DEBUG_MESSAGE = 0x23  # Debug message
+    PARAM_REPORT = 0x24  # Parameter values in effect
+
+
+class Integrity(IntEnum):
+    """Check value at the end of each packet, chosen per session"""
+
+    XOR = 0  # 1 byte XOR, what the executor starts with
+    CRC16 = 1  # 2 byte CRC-16/MCRF4XX, little endian
+
+
+def _crc16_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8408 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC16_TABLE = _crc16_table()  # Same table as the executor
+
+
+def crc16_table(data: bytes, crc: int = 0xFFFF) -> int:
+    """
+    CRC-16/MCRF4XX (poly 0x1021 reflected, init 0xFFFF) one table lookup
+    per byte. Reflected, i.e. LSB first like the UART sends each byte,
+    so any burst of up to 16 bits on the wire is detected
+    """
+    for byte in data:
+        crc = (crc >> 8) ^ CRC16_TABLE[(crc ^ byte) & 0xFF]
+    return crc
+
+
+_REVERSED_BITS = bytes(int(f"{byte:08b}"[::-1], 2) for byte in range(256))
+
+
+def _reverse16(value: int) -> int:
+    return _REVERSED_BITS[value & 0xFF] << 8 | _REVERSED_BITS[value >> 8]
+
+
+def _crc16_hqx(data: bytes, crc: int = 0xFFFF) -> int:
+    # binascii only does the MSB first CRC, which is this one on mirrored bits
+    mirrored = data.translate(_REVERSED_BITS)
+    return _reverse16(binascii.crc_hqx(mirrored, _reverse16(crc)))
+
+
+# binascii computes the same CRC in C, use it unless it disagrees with the table
+crc16 = (
+    _crc16_hqx if _crc16_hqx(b"123456789") == crc16_table(b"123456789") else crc16_table
+)
+
+
+class Framing(IntEnum):
+    """How packets are delimited on the wire, chosen per session"""
+
+    START_BYTE = 0  # START_BYTE then the length, what the executor starts with
+    COBS = 1  # Packet without START_BYTE, COBS encoded, then a 0x00 delimiter
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """Consistent Overhead Byte Stuffing, the result contains no 0x00"""
+    out = bytearray()
+    pieces = data.split(b"\x00")
+    last = len(pieces) - 1
+    for index, piece in enumerate(pieces):
+        while len(piece) >= 254:
+            out.append(0xFF)
+            out += piece[:254]
+            piece = piece[254:]
+            if not piece and index == last:
+                return bytes(out)
+        out.append(len(piece) + 1)
+        out += piece
+    return bytes(out)
+
+
+def cobs_decode(frame: bytes | memoryview) -> bytes | None:
+    """Undo cobs_encode on a frame without its delimiter, None if malformed"""
+    view = memoryview(frame)
+    out = bytearray()
+    index = 0
+    end = len(view)
+    while index < end:
+        code = view[index]
+        block_end = index + code
+        if code == 0 or block_end > end:
+            return None
+        out += view[index + 1 : block_end]
+        index = block_end
+        if code < 0xFF and index < end:
+            out.append(0)
+    return bytes(out)
 
 
 class PacketModels:
@@ -57,24 +155,49 @@ class PacketProtocol:
     - TYPE: PacketType (1 byte) - packet identifier
     - LENGTH: payload length (1 byte) - 0-255 bytes
     - PAYLOAD: variable length data
-    - CHECKSUM: XOR of all bytes except START_BYTE (1 byte)
+    - CHECKSUM: XOR of all bytes except START_BYTE (1 byte), or in
+      Integrity.CRC16 sessions the CRC-16 of the same bytes (2 bytes)
+
+    In Framing.COBS sessions everything after START_BYTE is COBS
+    encoded and followed by 0x00 instead, so a frame boundary can never
+    be mistaken for payload.
     """
 
     START_BYTE: int = 0xAA
+    HEADER_SIZE: int = 3  # START + TYPE + LENGTH
     MIN_PACKET_SIZE: int = 4  # START + TYPE + LENGTH + CHECKSUM
     MAX_PAYLOAD_SIZE: int = 255
+    CHECK_SIZES: ClassVar[dict[Integrity, int]] = {Integrity.XOR: 1, Integrity.CRC16: 2}
+    # Largest packet without START_BYTE, plus 2 bytes COBS overhead and 0x00
+    MAX_COBS_FRAME_SIZE: int = HEADER_SIZE - 1 + MAX_PAYLOAD_SIZE + 2 + 2 + 1
+
+    @staticmethod
+    def packet_size(payload_length: int, integrity: Integrity = Integrity.XOR) -> int:
+        """Size on the wire of a packet with this much payload"""
+        return (
+            PacketProtocol.HEADER_SIZE
+            + payload_length
+            + PacketProtocol.CHECK_SIZES[integrity]
+        )
 
     @staticmethod
-    def create_packet(packet_type: PacketType, payload: bytes = b"") -> bytes:
+    def create_packet(
+        packet_type: PacketType,
+        payload: bytes = b"",
+        integrity: Integrity = Integrity.XOR,
+        framing: Framing = Framing.START_BYTE,
+    ) -> bytes:
         """
         Create a packet from type and payload.
 
         Args:
             packet_type: Type of packet
             payload: Payload data (max 255 bytes)
+            integrity: Check value to append
+            framing: How to delimit the packet
 
         Returns:
-            Complete packet as bytes
+            Complete packet as bytes, ready to write
         """
         if len(payload) > PacketProtocol.MAX_PAYLOAD_SIZE:
             raise ValueError(
@@ -88,21 +211,27 @@ class PacketProtocol:
         packet.append(len(payload))
         packet.extend(payload)
 
-        # Calculate checksum (XOR of TYPE + LENGTH + PAYLOAD)
-        checksum = 0
-        for byte in packet[1:]:  # Skip START_BYTE
-            checksum ^= byte
-        packet.append(checksum)
-
+        if integrity == Integrity.CRC16:
+            packet += struct.pack("<H", crc16(packet[1:]))
+        else:
+            # Calculate checksum (XOR of TYPE + LENGTH + PAYLOAD)
+            checksum = 0
+            for byte in packet[1:]:  # Skip START_BYTE
+                checksum ^= byte
+            packet.append(checksum)
+
+        if framing == Framing.COBS:
+            return cobs_encode(packet[1:]) + b"\x00"
         return bytes(packet)
 
     @staticmethod
-    def validate_packet(packet: bytes) -> bool:
+    def validate_packet(packet: bytes, integrity: Integrity = Integrity.XOR) -> bool:
         """
         Validate packet structure and checksum.
 
         Args:
             packet: Complete packet bytes
+            integrity: Check value the packet should end with
 
         Returns:
             True if valid, False otherwise
@@ -114,11 +243,17 @@ class PacketProtocol:
             return False
 
         payload_length = packet[2]
-        expected_length = PacketProtocol.MIN_PACKET_SIZE + payload_length
+        expected_length = PacketProtocol.packet_size(payload_length, integrity)
 
         if len(packet) != expected_length:
             return False
 
+        if integrity == Integrity.CRC16:
+            return (
+                crc16(packet[1:-2])
+                == struct.unpack_from("<H", packet, len(packet) - 2)[0]
+            )
+
         # Verify checksum
         checksum = 0
         for byte in packet[1:-1]:  # Skip START_BYTE and CHECKSUM
@@ -127,20 +262,26 @@ class PacketProtocol:
         return checksum == packet[-1]
 
     @staticmethod
-    def parse_packet(packet: bytes) -> tuple[PacketType, bytes] | None:
+    def parse_packet(
+        packet: bytes, integrity: Integrity = Integrity.XOR
+    ) -> tuple[PacketType, bytes] | None:
         """
         Parse a validated packet.
 
         Args:
             packet: Complete packet bytes
+            integrity: Check value the packet should end with
 
         Returns:
             Tuple of (packet_type, payload) or None if invalid
         """
-        if not PacketProtocol.validate_packet(packet):
+        if not PacketProtocol.validate_packet(packet, integrity):
             return None
 
-        packet_type = PacketType(packet[1])
+        try:
+            packet_type = PacketType(packet[1])
+        except ValueError:
+            return None  # Corrupted, but the checksum happened to match
         payload_length = packet[2]
 
         if payload_length > 0:
@@ -189,6 +330,11 @@ class PacketBuilder:
         """Set a parameter with float value"""
         return struct.pack("<Bf", param_id, value)
 
+    @staticmethod
+    def set_params(values: dict[int, int | float]) -> bytes:
+        """Set several parameters in one packet, typed by src.params.PARAMETERS"""
+        return encode_params(values)
+
     @staticmethod
     def start() -> bytes:
         """Create START command"""
@@ -209,6 +355,11 @@ class PacketBuilder:
         """Request sensor reading"""
         return struct.pack("<B", sensor_id)
 
+    @staticmethod
+    def subscribe(rates: dict[int, int]) -> bytes:
+        """Stream sensors, {sensor_id: rate in Hz}, a rate of 0 stops one"""
+        return encode_subscriptions(rates)
+
     @staticmethod
     def set_tendons(tendon_1: float, tendon_2: float, tendon_3: float) -> bytes:
         """Update tendon setpoints (3 floats)"""
@@ -219,10 +370,35 @@ class PacketBuilder:
         """Update spool speed (float)"""
         return struct.pack("<f", speed)
 
+    @staticmethod
+    def set_setpoints(
+        tendons: tuple[float, float, float] | None, spool_speed: float | None
+    ) -> bytes:
+        """Update tendons (radians) and spool speed (rpm) as int16, None keeps one"""
+        return encode_setpoints(tendons, spool_speed)
+
 
 class PacketParser:
     """Helper class to parse common packet payloads"""
 
+    # struct format and field names of the fixed part of each payload.
+    # SENSOR_DATA and CMD_SET_PARAM are left out, they carry a variable
+    # number of entries (see PacketLog.sensor_samples and parse_params)
+    LAYOUTS: ClassVar[dict[PacketType, tuple[str, tuple[str, ...]]]] = {
+        PacketType.ACK: ("<B", ("sequence_num",)),
+        PacketType.NACK: ("<B", ("error_code",)),
+        PacketType.CMD_SET_MODE: ("<B", ("mode",)),
+        PacketType.CMD_READ_SENSOR: ("<B", ("sensor_id",)),
+        PacketType.CMD_SET_TENDONS: ("<fff", ("tendon_1", "tendon_2", "tendon_3")),
+        PacketType.CMD_SET_SPOOL: ("<f", ("speed",)),
+        PacketType.CMD_SET_SETPOINTS: (
+            "<hhhh",
+            ("tendon_1", "tendon_2", "tendon_3", "spool"),
+        ),
+        PacketType.STATUS_UPDATE: ("<BBI", ("mode", "state", "uptime")),
+        PacketType.ERROR_REPORT: ("<B", ("error_code",)),
+    }
+
     @staticmethod
     def parse_status_update(payload: bytes) -> PacketModels.StatusUpdate | None:
         """Parse status update payload (example: mode, state, uptime)"""
@@ -248,6 +424,40 @@ class PacketParser:
             return {"error_code": error_code, "error_data": error_data}
         return {}
 
+    @staticmethod
+    def parse_tendons(payload: bytes) -> tuple[float, float, float] | None:
+        """Parse a CMD_SET_TENDONS payload back into the setpoints (radians)"""
+        if len(payload) >= 12:
+            return struct.unpack("<fff", payload[:12])
+        return None
+
+    @staticmethod
+    def parse_params(payload: bytes) -> dict[int, int | float]:
+        """Parse CMD_SET_PARAM or PARAM_REPORT entries as {param_id: value}"""
+        return decode_params(payload)
+
+    @staticmethod
+    def parse_spool_speed(payload: bytes) -> float | None:
+        """Parse a CMD_SET_SPOOL payload back into the speed (rpm)"""
+        if len(payload) >= 4:
+            return struct.unpack("<f", payload[:4])[0]
+        return None
+
+    @staticmethod
+    def parse_setpoints(
+        payload: bytes,
+    ) -> tuple[tuple[float, float, float] | None, float | None] | None:
+        """Parse a CMD_SET_SETPOINTS payload into (tendons, spool speed), None if kept"""
+        return decode_setpoints(payload)
+
+    @staticmethod
+    def type_name(packet_type: int) -> str:
+        """PacketType name, or the hex value of an unknown type"""
+        try:
+            return PacketType(packet_type).name
+        except ValueError:
+            return f"0x{packet_type:02X}"
+
     @staticmethod
     def parse_ack(payload: bytes) -> int:
         """Parse ACK sequence number"""
@@ -256,91 +466,137 @@ class PacketParser:
         return 0
 
 
-class PacketStream(QObject):
+class PacketCodec:
     """
-    Handles packet streaming over serial connection.
-    Assembles incoming bytes into complete packets.
+    Assembles incoming bytes into packets and frames outgoing ones,
+    without any I/O or event loop.
+
+    feed() calls on_packet(packet_type, payload) for every valid packet
+    and on_invalid(packet) for every one that fails its check. Both
+    directions use the same Integrity and Framing, which start as XOR
+    and START_BYTE every session and are changed with set_integrity and
+    set_framing once the executor confirms the LINK_INTEGRITY and
+    LINK_FRAMING parameters.
     """
 
-    # Signals
-    packet_received: pyqtSignal = pyqtSignal(int, bytes)  # (packet_type, payload)
-    packet_sent: pyqtSignal = pyqtSignal(int, bytes)  # (packet_type, payload)
-    error_occurred: pyqtSignal = pyqtSignal(str)  # (error_message)
-
-    def __init__(self, serial_manager: SerialManager):
-        super().__init__()
-        self.serial_mgr: SerialManager = serial_manager
+    def __init__(
+        self,
+        on_packet: Callable[[int, bytes], Any],
+        on_invalid: Callable[[bytes], Any] | None = None,
+    ):
+        """
+        Args:
+            on_packet: Called with (packet_type, payload) per valid packet
+            on_invalid: Called with the raw packet per invalid one
+        """
+        self.on_packet = on_packet
+        self.on_invalid = on_invalid
         self.buffer: bytearray = bytearray()
-
-        # Connect to raw data signal
-        _ = self.serial_mgr.data_received_raw.connect(self.on_data_received)
+        self.integrity: Integrity = Integrity.XOR
+        self.framing: Framing = Framing.START_BYTE
 
         # Statistics
         self.packets_sent: int = 0
         self.packets_received: int = 0
         self.packets_invalid: int = 0
+        self.sent_by_type: list[int] = [0] * 256
+        self.received_by_type: list[int] = [0] * 256
 
-    def on_data_received(self, data: bytes):
+    def feed(self, data: bytes):
         """Process incoming raw data and extract packets"""
         self.buffer.extend(data)
-        self._process_buffer()
-
-    def _process_buffer(self):
-        """Extract complete packets from buffer"""
-        while len(self.buffer) >= PacketProtocol.MIN_PACKET_SIZE:
-            # Find start byte
-            start_idx = self.buffer.find(PacketProtocol.START_BYTE)
 
-            if start_idx == -1:
-                # No start byte found, clear buffer
-                self.buffer.clear()
+        # Framing is checked per packet, as a PARAM_REPORT can change it midway
+        while True:
+            if self.framing == Framing.COBS:
+                packet = self._next_cobs_packet()
+            else:
+                packet = self._next_packet()
+            if packet is None:
                 return
 
-            if start_idx > 0:
-                # Remove data before start byte
-                self.buffer = self.buffer[start_idx:]
+            result = PacketProtocol.parse_packet(packet, self.integrity)
+            if result:
+                self.packets_received += 1
+                self.received_by_type[result[0]] += 1
+                self.on_packet(*result)
+            else:
+                self.packets_invalid += 1
+                if self.on_invalid is not None:
+                    self.on_invalid(packet)
+
+    def encode(self, packet_type: PacketType, payload: bytes = b"") -> bytes:
+        """Frame an outgoing packet, count it with count_sent() once written"""
+        return PacketProtocol.create_packet(
+            packet_type, payload, self.integrity, self.framing
+        )
+
+    def count_sent(self, packet_type: int):
+        self.packets_sent += 1
+        self.sent_by_type[packet_type] += 1
+
+    def _next_packet(self) -> bytes | None:
+        """Take the next START_BYTE framed packet off the buffer, if complete"""
+        if len(self.buffer) < PacketProtocol.MIN_PACKET_SIZE:
+            return None
 
-            # Check if we have enough data for header
-            if len(self.buffer) < 3:
-                return  # Wait for more data
+        # Find start byte
+        start_idx = self.buffer.find(PacketProtocol.START_BYTE)
 
-            # Get payload length
-            payload_length = self.buffer[2]
-            packet_length = PacketProtocol.MIN_PACKET_SIZE + payload_length
+        if start_idx == -1:
+            # No start byte found, clear buffer
+            self.buffer.clear()
+            return None
 
-            # Check if complete packet is available
-            if len(self.buffer) < packet_length:
-                return  # Wait for more data
+        if start_idx > 0:
+            # Remove data before start byte
+            del self.buffer[:start_idx]
 
-            # Extract packet
-            packet = bytes(self.buffer[:packet_length])
-            self.buffer = self.buffer[packet_length:]
+        # Check if we have enough data for header
+        if len(self.buffer) < 3:
+            return None  # Wait for more data
 
-            # Parse and emit
-            result = PacketProtocol.parse_packet(packet)
-            if result:
-                packet_type, payload = result
-                self.packets_received += 1
-                self.packet_received.emit(packet_type, payload)
-            else:
-                self.packets_invalid += 1
-                self.error_occurred.emit(f"Invalid packet received: {packet.hex()}")
+        # Get payload length
+        payload_length = self.buffer[2]
+        packet_length = PacketProtocol.packet_size(payload_length, self.integrity)
 
-    def send_packet(
-        self, packet_type: PacketType, payload: bytes = b"", throw_error: bool = True
-    ) -> bool:
-        """Send a packet"""
-        try:
-            packet = PacketProtocol.create_packet(packet_type, payload)
-            success = self.serial_mgr.send_bytes(packet, throw_error)
-            if success:
-                self.packets_sent += 1
-                self.packet_sent.emit(packet_type, payload)
-            return success
-        except Exception as e:
-            if throw_error:
-                self.error_occurred.emit(f"Failed to send packet: {str(e)}")
-            return False
+        # Check if complete packet is available
+        if len(self.buffer) < packet_length:
+            return None  # Wait for more data
+
+        # Extract packet
+        packet = bytes(self.buffer[:packet_length])
+        del self.buffer[:packet_length]  # In place, no copy of the rest
+        return packet
+
+    def _next_cobs_packet(self) -> bytes | None:
+        """
+        Take the next COBS frame off the buffer and decode it. A bad
+        frame only costs itself, the next one starts after its 0x00.
+        """
+        end = self.buffer.find(0)
+        if end == -1:
+            if len(self.buffer) > PacketProtocol.MAX_COBS_FRAME_SIZE:
+                # No delimiter where one must be, e.g. start byte framing from
+                # an executor that went back to it
+                self.buffer.clear()
+                return b""  # Counted as invalid
+            return None
+
+        with memoryview(self.buffer) as view:
+            decoded = cobs_decode(view[:end])
+        del self.buffer[: end + 1]  # Cheap, bytearray trims its start in place
+        if decoded is None:
+            return b""  # Fails parsing, counted as invalid
+        return bytes([PacketProtocol.START_BYTE]) + decoded
+
+    def set_integrity(self, integrity: Integrity):
+        """Check packets with this from the next one on, in both directions"""
+        self.integrity = Integrity(integrity)
+
+    def set_framing(self, framing: Framing):
+        """Delimit packets with this from the next one on, in both directions"""
+        self.framing = Framing(framing)
 
     def get_statistics(self) -> dict[str, int]:
         """Get packet statistics"""
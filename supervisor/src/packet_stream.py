@@ -0,0 +1,91 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.packet_protocol import Framing, Integrity, PacketCodec, PacketType
+from src.serial_manager import SerialManager
+
+
+class PacketStream(QObject):
+    """
+    Handles packet streaming over serial connection.
+    Assembles incoming bytes into complete packets.
+
+    A Qt adapter over PacketCodec, which does the framing and checks. The
+    headless supervisor (src/headless.py) runs the same codec on asyncio.
+
+    Signals:
+        packet_received(int, bytes): (packet_type, payload) of a valid packet
+        packet_sent(int, bytes): (packet_type, payload) of a sent packet
+        error_occurred(str): Emitted when an error occurs
+    """
+
+    # Signals
+    packet_received: pyqtSignal = pyqtSignal(int, bytes)  # (packet_type, payload)
+    packet_sent: pyqtSignal = pyqtSignal(int, bytes)  # (packet_type, payload)
+    error_occurred: pyqtSignal = pyqtSignal(str)  # (error_message)
+
+    def __init__(self, serial_manager: SerialManager):
+        super().__init__()
+        self.serial_mgr: SerialManager = serial_manager
+        self.codec = PacketCodec(self.packet_received.emit, self._on_invalid)
+
+        # Connect to raw data signal
+        _ = self.serial_mgr.data_received_raw.connect(self.on_data_received)
+
+    @property
+    def integrity(self) -> Integrity:
+        return self.codec.integrity
+
+    @property
+    def framing(self) -> Framing:
+        return self.codec.framing
+
+    @property
+    def packets_sent(self) -> int:
+        return self.codec.packets_sent
+
+    @property
+    def packets_received(self) -> int:
+        return self.codec.packets_received
+
+    @property
+    def packets_invalid(self) -> int:
+        return self.codec.packets_invalid
+
+    def on_data_received(self, data: bytes):
+        """Process incoming raw data and extract packets"""
+        self.codec.feed(data)
+
+    def _on_invalid(self, packet: bytes):
+        self.error_occurred.emit(f"Invalid packet received: {packet.hex()}")
+
+    def send_packet(
+        self, packet_type: PacketType, payload: bytes = b"", throw_error: bool = True
+    ) -> bool:
+        """Send a packet"""
+        try:
+            packet = self.codec.encode(packet_type, payload)
+            success = self.serial_mgr.send_bytes(packet, throw_error)
+            if success:
+                self.codec.count_sent(packet_type)
+                self.packet_sent.emit(packet_type, payload)
+            return success
+        except Exception as e:
+            if throw_error:
+                self.error_occurred.emit(f"Failed to send packet: {str(e)}")
+            return False
+
+    def set_integrity(self, integrity: Integrity):
+        """Check packets with this from the next one on, in both directions"""
+        self.codec.set_integrity(integrity)
+
+    def set_framing(self, framing: Framing):
+        """Delimit packets with this from the next one on, in both directions"""
+        self.codec.set_framing(framing)
+
+    def get_statistics(self) -> dict[str, int]:
+        """Get packet statistics"""
+        return self.codec.get_statistics()
+
+    def clear_buffer(self):
+        """Clear the receive buffer"""
+        self.codec.clear_buffer()
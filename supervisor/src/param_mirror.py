@@ -0,0 +1,98 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src.params import MAX_PARAM_ENTRIES, PARAMETERS, encode_params
+
+
+class ParameterMirror(QObject):
+    """
+    Supervisor side copy of the executor parameters.
+
+    set() only records the wanted value. Changes are sent after a short
+    quiet period, so dragging a slider sends its final value once, and
+    only parameters that differ from what the executor last confirmed
+    are sent, all in one CMD_SET_PARAM. The executor answers with a
+    PARAM_REPORT of the values now in effect, which is passed to
+    confirm().
+
+    Signals:
+        send_requested(bytes): A CMD_SET_PARAM payload to send
+        confirmed(int, object): The executor confirmed (param_id, value)
+    """
+
+    send_requested = pyqtSignal(bytes)
+    confirmed = pyqtSignal(int, object)
+
+    def __init__(self, coalesce_interval: int):
+        """
+        Args:
+            coalesce_interval: Milliseconds to wait for more changes before sending
+        """
+        super().__init__()
+        self.desired: dict[int, int | float] = {}
+        self.values: dict[int, int | float] = {}  # Confirmed by the executor
+        self.pending: dict[int, int | float] = {}  # Sent, not confirmed yet
+        self.online = False  # Nothing is sent while the executor is not connected
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(coalesce_interval)
+        self.timer.timeout.connect(self.flush)
+
+    def set(self, param_id: int, value: float):
+        self.desired[param_id] = PARAMETERS[param_id].validate(value)
+        self.timer.start()  # Restarting pushes the send back
+
+    def changes(self) -> dict[int, int | float]:
+        """Wanted values the executor does not have and was not sent yet"""
+        return {
+            param_id: value
+            for param_id, value in self.desired.items()
+            if self.values.get(param_id) != value
+            and self.pending.get(param_id) != value
+        }
+
+    def settled(self) -> bool:
+        """The executor has every wanted value"""
+        return not self.pending and not self.changes()
+
+    def flush(self):
+        """Send every outstanding change now"""
+        self.timer.stop()
+        if not self.online:
+            return
+        changes = list(self.changes().items())
+        for start in range(0, len(changes), MAX_PARAM_ENTRIES):
+            batch = dict(changes[start : start + MAX_PARAM_ENTRIES])
+            self.pending.update(batch)
+            self.send_requested.emit(encode_params(batch))
+
+    def confirm(self, values: dict[int, int | float]):
+        """Record the values from a PARAM_REPORT"""
+        for param_id, value in values.items():
+            self.values[param_id] = value
+            if self.pending.get(param_id) == value:
+                del self.pending[param_id]
+            self.confirmed.emit(param_id, value)
+
+        if self.changes():
+            self.timer.start()
+
+    def reject(self):
+        """The executor refused the last upload, fall back to its values"""
+        for param_id in self.pending:
+            if param_id in self.values:
+                self.desired[param_id] = self.values[param_id]
+            else:
+                self.desired.pop(param_id, None)
+        self.pending.clear()
+
+    def set_online(self, online: bool):
+        """
+        Call when the executor connects or disconnects. On connecting,
+        what it had before is forgotten and every wanted value is sent.
+        """
+        self.online = online
+        self.values.clear()
+        self.pending.clear()
+        if online and self.desired:
+            self.timer.start()
@@ -0,0 +1,80 @@
+import struct
+from dataclasses import dataclass
+from enum import Enum
+
+from src.config import MCU_PRAMS
+
+# CMD_SET_PARAM and PARAM_REPORT payloads are a list of these entries
+PARAM_ENTRY_SIZE = 5  # uint8 id + 4 byte value
+MAX_PARAM_ENTRIES = 255 // PARAM_ENTRY_SIZE
+
+
+class ParamType(str, Enum):
+    INT32 = "i"
+    FLOAT = "f"
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    """Metadata of one executor parameter, must match params[] in the executor"""
+
+    param_id: int
+    name: str
+    type: ParamType
+    minimum: float
+    maximum: float
+
+    def validate(self, value: float) -> int | float:
+        """Coerce to the parameter type and check the range"""
+        if self.type == ParamType.INT32:
+            value = int(value)
+        else:
+            # Round to float32 so it compares equal to what the executor reports
+            value = struct.unpack("<f", struct.pack("<f", value))[0]
+        if not self.minimum <= value <= self.maximum:
+            raise ValueError(
+                f"{self.name} must be in [{self.minimum}, {self.maximum}], got {value}"
+            )
+        return value
+
+
+PARAMETERS: dict[int, ParamSpec] = {
+    spec.param_id: spec
+    for spec in (
+        ParamSpec(
+            MCU_PRAMS.TENDON_MOTOR_SPEED, "tendon_motor_speed", ParamType.INT32, 0, 60
+        ),
+        ParamSpec(
+            MCU_PRAMS.SETPOINT_ENCODING, "setpoint_encoding", ParamType.INT32, 0, 1
+        ),
+        ParamSpec(MCU_PRAMS.LINK_INTEGRITY, "link_integrity", ParamType.INT32, 0, 1),
+        ParamSpec(MCU_PRAMS.LINK_FRAMING, "link_framing", ParamType.INT32, 0, 1),
+        ParamSpec(MCU_PRAMS.LINK_BAUD, "link_baud", ParamType.INT32, 9600, 2_000_000),
+    )
+}
+
+
+def encode_params(values: dict[int, int | float]) -> bytes:
+    """Pack {param_id: value} into CMD_SET_PARAM entries"""
+    if len(values) > MAX_PARAM_ENTRIES:
+        raise ValueError(f"At most {MAX_PARAM_ENTRIES} parameters fit in one packet")
+    payload = bytearray()
+    for param_id, value in values.items():
+        spec = PARAMETERS[param_id]
+        payload += struct.pack("<B" + spec.type.value, param_id, spec.validate(value))
+    return bytes(payload)
+
+
+def decode_params(payload: bytes) -> dict[int, int | float]:
+    """
+    Unpack CMD_SET_PARAM or PARAM_REPORT entries. Unknown parameters are
+    skipped, as their type is not known.
+    """
+    values = {}
+    for start in range(0, len(payload) - PARAM_ENTRY_SIZE + 1, PARAM_ENTRY_SIZE):
+        spec = PARAMETERS.get(payload[start])
+        if spec is not None:
+            (values[spec.param_id],) = struct.unpack_from(
+                "<" + spec.type.value, payload, start + 1
+            )
+    return values
@@ -0,0 +1,115 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QProgressBar
+
+from src.steering_widget import RobotSteeringWidget
+
+
+class UiPresenter(QObject):
+    """
+    Collects display state and pushes it to the widgets at most once per
+    frame from a single timer.
+
+    Setters only store the value and mark it dirty, so a burst of input
+    or packets costs a few assignments instead of a widget update (and
+    later a layout and paint) per event. On each frame only the widgets
+    whose value actually changed are touched.
+
+    Signals:
+        frame(): Emitted at the start of every frame, before widgets are
+            updated, so polled state (like estimates) can be set
+    """
+
+    frame = pyqtSignal()
+
+    def __init__(
+        self,
+        tendon_bars: tuple[QProgressBar, QProgressBar, QProgressBar],
+        steering_widget: RobotSteeringWidget,
+        spool_bar: QProgressBar,
+        everted_label: QLabel,
+        frame_interval: int,
+    ):
+        """
+        Args:
+            tendon_bars: Progress bars for tendons 1 to 3
+            steering_widget: Top-down steering view
+            spool_bar: Spool speed progress bar
+            everted_label: Label for the everted length
+            frame_interval: Milliseconds between frames
+        """
+        super().__init__()
+        self.tendon_bars = tendon_bars
+        self.steering_widget = steering_widget
+        self.spool_bar = spool_bar
+        self.everted_label = everted_label
+
+        self._tendon_values = (0.0, 0.0, 0.0)
+        self._steering = (0.0, 0.0)
+        self._spool_speed = 0.0
+        self._everted_length = 0.0
+        self._dirty: set[str] = {"tendons", "steering", "spool", "everted"}
+
+        # What the widgets currently show
+        self._shown_bars: tuple[int, int, int] | None = None
+        self._shown_spool: int | None = None
+        self._shown_everted: int | None = None
+
+        self.frames_drawn: int = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_frame)
+        self.timer.start(frame_interval)
+
+    def set_tendon_values(self, values: tuple[float, float, float]):
+        if values != self._tendon_values:
+            self._tendon_values = values
+            self._dirty.add("tendons")
+
+    def set_steering(self, angle: float, magnitude: float):
+        if (angle, magnitude) != self._steering:
+            self._steering = (angle, magnitude)
+            self._dirty.add("steering")
+
+    def set_spool_speed(self, speed: float):
+        if speed != self._spool_speed:
+            self._spool_speed = speed
+            self._dirty.add("spool")
+
+    def set_everted_length(self, length: float):
+        if length != self._everted_length:
+            self._everted_length = length
+            self._dirty.add("everted")
+
+    def _on_frame(self):
+        self.frame.emit()
+        if not self._dirty:
+            return
+
+        dirty = self._dirty
+        self._dirty = set()
+        self.frames_drawn += 1
+
+        if "tendons" in dirty:
+            bars = tuple(int(value * 100) for value in self._tendon_values)
+            if bars != self._shown_bars:
+                self._shown_bars = bars
+                for bar, value in zip(self.tendon_bars, bars):
+                    bar.setValue(value)
+
+        # One update() for the steering widget, however many of its values changed
+        if "tendons" in dirty or "steering" in dirty:
+            self.steering_widget.setState(self._tendon_values, *self._steering)
+
+        if "spool" in dirty:
+            # Compare at display precision so float noise does not reformat the bar
+            shown = round(self._spool_speed * 100)
+            if shown != self._shown_spool:
+                self._shown_spool = shown
+                self.spool_bar.setValue(abs(shown))
+                self.spool_bar.setFormat(f"{self._spool_speed:.2f} rpm")
+
+        if "everted" in dirty:
+            shown = round(self._everted_length * 1000)
+            if shown != self._shown_everted:
+                self._shown_everted = shown
+                self.everted_label.setText(f"Everted: {self._everted_length:.3f} m")
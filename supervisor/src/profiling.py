@@ -0,0 +1,215 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any
+
+# Buckets are powers of two of nanoseconds, the last one also takes
+# everything slower (2^33 ns is about 8.6 s)
+_BUCKETS = 34
+_BATCH = 4096  # Durations kept per slot before they are folded in
+
+
+class LatencyHistogram:
+    """
+    Call durations in power of two buckets of nanoseconds.
+
+    Durations are appended to `pending` and folded into the buckets in
+    batches, a list append being the cheapest thing to do per call.
+    Quantiles are the upper edge of their bucket, so they are at most a
+    factor of two high; count, mean and max are exact.
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.buckets: list[int] = [0] * _BUCKETS
+        self.pending: list[int] = []
+
+    def flush(self):
+        """Fold the pending durations into the buckets"""
+        if not self.pending:
+            return
+        self.count += len(self.pending)
+        self.total_ns += sum(self.pending)
+        self.max_ns = max(self.max_ns, max(self.pending))
+        buckets = self.buckets
+        for ns in self.pending:
+            buckets[min(ns.bit_length(), _BUCKETS - 1)] += 1
+        self.pending.clear()
+
+    def quantile(self, q: float) -> int:
+        """Upper bound in ns of the q-th quantile, 0 when empty"""
+        self.flush()
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(1 << index, self.max_ns)
+        return self.max_ns
+
+    def as_dict(self) -> dict[str, float]:
+        """Times are in microseconds"""
+        self.flush()
+        return {
+            "calls": self.count,
+            "mean": self.total_ns / self.count / 1000 if self.count else 0.0,
+            "p50": self.quantile(0.5) / 1000,
+            "p99": self.quantile(0.99) / 1000,
+            "max": self.max_ns / 1000,
+            "total_ms": self.total_ns / 1e6,
+        }
+
+
+class Profiler:
+    """
+    Opt-in instrumentation for the running supervisor.
+
+    instrument() swaps a method on its class for one timing every call
+    into a LatencyHistogram. Nothing is wrapped unless profiling is
+    enabled, so there is no cost otherwise. Times are inclusive, a slot
+    emitting a signal also counts the slots that run for it.
+
+    cProfile runs and tracemalloc snapshots are taken on demand and
+    written to the output directory, as .prof (pstats, snakeviz) and
+    .tracemalloc (tracemalloc.Snapshot.load) files with a text summary
+    next to each.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Args:
+            output_dir: Directory the reports are written to, created on first use
+        """
+        self.output_dir = output_dir
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._profile: cProfile.Profile | None = None
+        self._last_snapshot: tracemalloc.Snapshot | None = None
+
+    def instrument(self, cls: type, name: str):
+        """
+        Time every call of cls.name from now on. Must run before the
+        method is connected to a signal, connect() keeps the bound method.
+        """
+        method = getattr(cls, name)
+        histogram = self.histograms.setdefault(
+            f"{cls.__name__}.{name}", LatencyHistogram()
+        )
+        clock = time.perf_counter_ns
+        pending = histogram.pending
+        record = pending.append
+
+        @functools.wraps(method)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(clock() - start)
+                if len(pending) >= _BATCH:
+                    histogram.flush()
+
+        setattr(cls, name, timed)
+
+    def report(self) -> str:
+        """The slot histograms as a text table, slowest total first"""
+        lines = [
+            f"{'slot':<40} {'calls':>9} {'mean us':>9} {'p50 us':>9} "
+            f"{'p99 us':>9} {'max us':>10} {'total ms':>10}"
+        ]
+        for histogram in self.histograms.values():
+            histogram.flush()
+        rows = sorted(
+            self.histograms.items(), key=lambda item: item[1].total_ns, reverse=True
+        )
+        for name, histogram in rows:
+            stats = histogram.as_dict()
+            lines.append(
+                f"{name:<40} {stats['calls']:>9} {stats['mean']:>9.1f} "
+                f"{stats['p50']:>9.1f} {stats['p99']:>9.1f} {stats['max']:>10.1f} "
+                f"{stats['total_ms']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def dump_histograms(self) -> str:
+        """Write report() to a file, returns its path"""
+        path = self._path("slots", "txt")
+        with open(path, "w") as file:
+            file.write(self.report() + "\n")
+        return path
+
+    def toggle_cprofile(self) -> str | None:
+        """
+        Start a cProfile run, or stop the current one and write it out.
+
+        Returns:
+            Path of the .prof file when a run was stopped, None when started
+        """
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            return None
+
+        self._profile.disable()
+        path = self._path("cprofile", "prof")
+        self._profile.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(self._profile, stream=summary).sort_stats(
+            pstats.SortKey.CUMULATIVE
+        ).print_stats(50)
+        with open(path.removesuffix(".prof") + ".txt", "w") as file:
+            file.write(summary.getvalue())
+        self._profile = None
+        return path
+
+    def snapshot_memory(self, frames: int = 16, top: int = 40) -> str | None:
+        """
+        Start tracing allocations on the first call, later calls write a
+        snapshot and its top allocation sites, compared with the previous
+        snapshot when there is one.
+
+        Returns:
+            Path of the .tracemalloc file, None when tracing just started
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._last_snapshot = None
+            return None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        path = self._path("memory", "tracemalloc")
+        snapshot.dump(path)
+
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"traced {current / 1024:.0f} KiB, peak {peak / 1024:.0f} KiB"]
+        if self._last_snapshot is not None:
+            lines.append("\nlargest changes since the previous snapshot:")
+            lines += map(str, snapshot.compare_to(self._last_snapshot, "lineno")[:top])
+        lines.append("\nlargest allocation sites:")
+        lines += map(str, snapshot.statistics("lineno")[:top])
+        with open(path.removesuffix(".tracemalloc") + ".txt", "w") as file:
+            file.write("\n".join(lines) + "\n")
+        self._last_snapshot = snapshot
+        return path
+
+    def stop(self):
+        """Finish a running cProfile run and stop tracing allocations"""
+        if self._profile is not None:
+            self.toggle_cprofile()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _path(self, kind: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return os.path.join(self.output_dir, f"{kind}-{stamp}.{extension}")
@@ -0,0 +1,425 @@
+"""
+Controller input from a pilot on another machine, over UDP.
+
+The pilot's machine reads its gamepad and sends a full snapshot of it at
+a fixed rate:
+    uv run python -m src.remote_input <supervisor host>:9466 --key <key>
+and the supervisor is started with --remote-input, which replaces the
+local ControllerThread with a RemoteControllerThread. Snapshots are only
+taken from a configured pilot host, or signed with a key both ends share.
+
+Signed snapshots also cover a random challenge the supervisor picks
+for every session, i.e. at start and after each timeout, and sends back
+in reply to snapshots that fail the check. A stream captured earlier
+cannot be replayed once its session is over.
+"""
+
+import argparse
+import hashlib
+import heapq
+import hmac
+import os
+import socket
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from src import config
+from src.input import Axes
+
+# Sequence, sender time.monotonic(), button bits, then the six axes in
+# ControllerThread's (pygame's) order
+SNAPSHOT = struct.Struct("<IdI6f")
+TAG_SIZE = 16  # Bytes of HMAC-SHA256 after a signed snapshot
+CHALLENGE_SIZE = 8  # Random bytes the tag covers, new every session
+
+AXIS_COUNT = 6
+BUTTON_COUNT = 32
+
+# Sticks centred, triggers released (pygame reports them from -1 to 1)
+REST_AXES = tuple(
+    -1.0 if axis in (Axes.LEFT_TRIGGER, Axes.RIGHT_TRIGGER) else 0.0
+    for axis in range(AXIS_COUNT)
+)
+
+_MOTION_THRESHOLD = 0.01  # Same as ControllerThread, smaller changes are noise
+
+
+@dataclass
+class Snapshot:
+    sequence: int
+    sent: float  # Sender's clock, seconds
+    buttons: int  # Bit n set while button n is held
+    axes: tuple[float, ...]
+
+    def pack(self, key: bytes = b"", challenge: bytes = b"") -> bytes:
+        """Signed with `key` and the session's `challenge` when a key is given"""
+        data = SNAPSHOT.pack(self.sequence, self.sent, self.buttons, *self.axes)
+        return data + _tag(key, challenge, data) if key else data
+
+    @classmethod
+    def unpack(
+        cls, data: bytes, key: bytes = b"", challenge: bytes = b""
+    ) -> "Snapshot | None":
+        """None when malformed, or not signed with `key` and `challenge`"""
+        if len(data) != SNAPSHOT.size + (TAG_SIZE if key else 0):
+            return None
+        body = data[: SNAPSHOT.size]
+        if key and not hmac.compare_digest(
+            data[SNAPSHOT.size :], _tag(key, challenge, body)
+        ):
+            return None
+        sequence, sent, buttons, *axes = SNAPSHOT.unpack(body)
+        return cls(sequence, sent, buttons, tuple(axes))
+
+
+def _tag(key: bytes, challenge: bytes, data: bytes) -> bytes:
+    return hmac.new(key, challenge + data, hashlib.sha256).digest()[:TAG_SIZE]
+
+
+def receive_challenge(
+    sock: socket.socket, target: tuple[str, int], challenge: bytes
+) -> bytes:
+    """
+    The newest challenge `target` sent to a non-blocking sender socket
+
+    Args:
+        sock: Socket the snapshots are sent from
+        target: (ip, port) of the supervisor, other sources are ignored
+        challenge: Challenge in use until now
+
+    Returns:
+        The new challenge, or `challenge` when none arrived
+    """
+    while True:
+        try:
+            data, source = sock.recvfrom(64)
+        except (BlockingIOError, ConnectionRefusedError):
+            return challenge  # Refused: nothing listening yet, keep sending
+        if source == target and len(data) == CHALLENGE_SIZE:
+            challenge = data
+
+
+class JitterBuffer:
+    """
+    Puts snapshots back in order and plays them out evenly.
+
+    The offset from the sender's clock to ours is the smallest
+    (arrival - sent) seen over the last `window` snapshots, i.e. the
+    fastest path. Every snapshot is played at its send time plus that
+    offset plus `delay`, so network jitter up to `delay` becomes a
+    fixed latency instead of uneven input. Snapshots are complete
+    states, a lost one is simply skipped; one arriving after a newer one
+    was played is dropped.
+    """
+
+    def __init__(self, delay: float, window: int = 256):
+        """
+        Args:
+            delay: Seconds added on top of the fastest path
+            window: Snapshots the clock offset is taken over
+        """
+        self.delay = delay
+        self._offsets: deque[float] = deque(maxlen=window)
+        self._offset = 0.0
+        self._pending: list[tuple[int, Snapshot]] = []  # Heap by sequence
+        self.last_sequence: int | None = None
+
+        # Statistics
+        self.received = 0
+        self.played = 0
+        self.lost = 0  # Never arrived, or arrived too late
+        self.stale = 0  # Arrived after a newer one was played
+        self.duplicates = 0
+
+    def reset(self):
+        """Forget the sender, e.g. after a timeout"""
+        self._offsets.clear()
+        self._pending.clear()
+        self.last_sequence = None
+
+    def push(self, snapshot: Snapshot, arrival: float):
+        self.received += 1
+        if self.last_sequence is not None and snapshot.sequence <= self.last_sequence:
+            self.stale += 1
+            return
+        if any(sequence == snapshot.sequence for sequence, _ in self._pending):
+            self.duplicates += 1
+            return
+
+        self._offsets.append(arrival - snapshot.sent)
+        self._offset = min(self._offsets)
+        heapq.heappush(self._pending, (snapshot.sequence, snapshot))
+
+    def next_due(self) -> float | None:
+        """When the next snapshot is to be played, on our clock"""
+        if not self._pending:
+            return None
+        return self._pending[0][1].sent + self._offset + self.delay
+
+    def pop_due(self, now: float) -> list[Snapshot]:
+        """Snapshots due by `now`, oldest first"""
+        due = []
+        while self._pending:
+            snapshot = self._pending[0][1]
+            if snapshot.sent + self._offset + self.delay > now:
+                break
+            heapq.heappop(self._pending)
+            if self.last_sequence is not None:
+                self.lost += snapshot.sequence - self.last_sequence - 1
+            self.last_sequence = snapshot.sequence
+            self.played += 1
+            due.append(snapshot)
+        return due
+
+
+class RemoteControllerThread(QThread):
+    """
+    Drop-in for ControllerThread, fed by snapshots from a remote pilot.
+
+    Receives on a UDP socket, plays snapshots out through a JitterBuffer
+    and emits the same button and axis signals as ControllerThread for
+    whatever changed. Snapshots must come from the `pilot` host or be
+    signed with `key` and the session's challenge, and it refuses to
+    start with neither. Only the first such sender is listened to until
+    it times out. With no snapshot played for `timeout`, every axis
+    returns to rest, held buttons are released, timed_out is emitted and
+    a new challenge is picked.
+
+    Signals:
+        button_pressed(int): button_id
+        button_released(int): button_id
+        axis_motion(int, float): axis_id, value
+        timed_out(): Input stopped, the controls were returned to rest
+        resumed(): Snapshots are arriving again after a timeout
+    """
+
+    button_pressed = pyqtSignal(int)
+    button_released = pyqtSignal(int)
+    axis_motion = pyqtSignal(int, float)
+    timed_out = pyqtSignal()
+    resumed = pyqtSignal()
+
+    def __init__(
+        self,
+        address: str,
+        delay: float,
+        timeout: float,
+        pilot: str = "",
+        key: bytes = b"",
+    ):
+        """
+        Args:
+            address: "host:port" to listen on
+            delay: Jitter buffer delay in seconds
+            timeout: Seconds without input before the controls are released
+            pilot: Host snapshots are accepted from, any when empty
+            key: Key snapshots must be signed with, unsigned when empty
+        """
+        super().__init__()
+        host, _, port = address.rpartition(":")
+        self.requested_address = address
+        self.address: tuple[str, int] | None = None  # None when malformed
+        if port.isdigit() and int(port) <= 0xFFFF:
+            self.address = (host or "127.0.0.1", int(port))
+        self.timeout = timeout
+        self.pilot = pilot
+        self.key = key
+        self.buffer = JitterBuffer(delay)
+        self.running = False
+        self.ignored = 0  # Datagrams from other senders or malformed
+        self.error = ""
+        self._socket: socket.socket | None = None
+        self._sender: tuple[str, int] | None = None
+        self._pilot_ip = ""
+        self._challenge = b""
+        self._buttons = 0
+        self._axes = REST_AXES
+
+    def start(self):
+        """Bind the socket and start, check isRunning() and `error` after"""
+        self.error = ""
+        if not self.pilot and not self.key:
+            self.error = "no pilot address or key is configured"
+            return
+        if self.address is None:
+            self.error = f"invalid address {self.requested_address!r}, not host:port"
+            return
+        self._challenge = os.urandom(CHALLENGE_SIZE)
+        try:
+            self._pilot_ip = socket.gethostbyname(self.pilot) if self.pilot else ""
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._socket.bind(self.address)
+        except OSError as e:
+            self.error = str(e)
+            if self._socket is not None:
+                self._socket.close()
+                self._socket = None
+            return
+        self.running = True
+        super().start()
+
+    @property
+    def port(self) -> int:
+        """Port being listened on, 0 when stopped"""
+        sock = self._socket
+        return sock.getsockname()[1] if sock is not None else 0
+
+    def stop(self):
+        """Stop the receiving thread, the controls are returned to rest"""
+        self.running = False
+
+    def run(self):
+        assert self._socket is not None
+        sock = self._socket
+        last_played = time.monotonic()
+        waiting = True  # For a first snapshot, or again after a timeout
+
+        while self.running:
+            now = time.monotonic()
+            wait = 0.05  # Notice stop() promptly
+            due = self.buffer.next_due()
+            if due is not None:
+                wait = min(wait, due - now)
+            if not waiting:
+                wait = min(wait, last_played + self.timeout - now)
+            sock.settimeout(max(wait, 0.0005))
+
+            try:
+                data, sender = sock.recvfrom(64)
+                self._receive(data, sender, time.monotonic())
+            except TimeoutError:
+                pass
+            except OSError:
+                break
+
+            now = time.monotonic()
+            for snapshot in self.buffer.pop_due(now):
+                if waiting:
+                    waiting = False
+                    self.resumed.emit()
+                self._apply(snapshot.buttons, snapshot.axes)
+                last_played = now
+
+            if not waiting and now - last_played > self.timeout:
+                waiting = True
+                self._sender = None
+                self._challenge = os.urandom(CHALLENGE_SIZE)
+                self.buffer.reset()
+                self._apply(0, REST_AXES)
+                self.timed_out.emit()
+
+        self._apply(0, REST_AXES)
+        sock.close()
+        self._socket = None
+        self._sender = None
+        self.buffer.reset()
+
+    def _receive(self, data: bytes, sender: tuple[str, int], arrival: float):
+        if self._pilot_ip and sender[0] != self._pilot_ip:
+            self.ignored += 1
+            return
+        if self._sender is not None and sender != self._sender:
+            self.ignored += 1
+            return
+        snapshot = Snapshot.unpack(data, self.key, self._challenge)
+        if snapshot is None:
+            self.ignored += 1
+            if self.key and len(data) == SNAPSHOT.size + TAG_SIZE:
+                # Signed for an older session, or before the sender had one
+                assert self._socket is not None
+                self._socket.sendto(self._challenge, sender)
+            return
+        self._sender = sender
+        self.buffer.push(snapshot, arrival)
+
+    def _apply(self, buttons: int, axes: tuple[float, ...]):
+        """Emit what changed since the last snapshot"""
+        changed = buttons ^ self._buttons
+        for button in range(BUTTON_COUNT):
+            if changed >> button & 1:
+                if buttons >> button & 1:
+                    self.button_pressed.emit(button)
+                else:
+                    self.button_released.emit(button)
+        self._buttons = buttons
+
+        previous = list(self._axes)
+        for axis, value in enumerate(axes):
+            # Rest is always emitted, so a timeout cannot leave a stick off centre
+            if abs(value - previous[axis]) > _MOTION_THRESHOLD or (
+                value == REST_AXES[axis] and previous[axis] != value
+            ):
+                self.axis_motion.emit(axis, value)
+                previous[axis] = value
+        self._axes = tuple(previous)
+
+
+def send(address: str, rate: float, joystick_id: int = 0, key: bytes = b""):
+    """
+    Send the local gamepad to a supervisor at `rate` snapshots per second,
+    signed with `key` and the supervisor's challenge when a key is given
+    """
+    import pygame
+
+    pygame.init()
+    pygame.joystick.init()
+    if pygame.joystick.get_count() == 0:
+        raise SystemExit("No controller connected")
+    joystick = pygame.joystick.Joystick(joystick_id)
+    joystick.init()
+
+    host, _, port = address.rpartition(":")
+    target = (socket.gethostbyname(host), int(port))
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    challenge = b""
+    interval = 1 / rate
+    sequence = 0
+    next_send = time.monotonic()
+    print(f"Sending {joystick.get_name()} to {address} at {rate:.0f} Hz")
+
+    while True:
+        pygame.event.pump()
+        buttons = 0
+        for button in range(min(joystick.get_numbuttons(), BUTTON_COUNT)):
+            if joystick.get_button(button):
+                buttons |= 1 << button
+        axes = list(REST_AXES)
+        for axis in range(min(joystick.get_numaxes(), AXIS_COUNT)):
+            axes[axis] = joystick.get_axis(axis)
+
+        sequence += 1
+        if key:
+            challenge = receive_challenge(sock, target, challenge)
+        snapshot = Snapshot(sequence, time.monotonic(), buttons, tuple(axes))
+        try:
+            sock.sendto(snapshot.pack(key, challenge), target)
+        except (BlockingIOError, ConnectionRefusedError):
+            pass  # Dropped like on the network, the next one follows shortly
+        next_send += interval
+        time.sleep(max(0.0, next_send - time.monotonic()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pilot a supervisor remotely")
+    parser.add_argument("address", help="Supervisor host:port, e.g. 192.168.1.20:9466")
+    parser.add_argument("--rate", type=float, default=config.REMOTE_INPUT_RATE)
+    parser.add_argument("--joystick", type=int, default=0)
+    parser.add_argument(
+        "--key",
+        default=os.environ.get(config.REMOTE_INPUT_KEY_ENV, ""),
+        help=f"Key shared with the supervisor, defaults to ${config.REMOTE_INPUT_KEY_ENV}",
+    )
+    args = parser.parse_args()
+    try:
+        send(args.address, args.rate, args.joystick, args.key.encode())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Preallocated ring of (timestamp, value) samples.
+
+    Appending is O(1) and never allocates, so it is safe to call from
+    hot paths. Timestamps are expected to be appended in order.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.total: int = 0  # Samples ever appended
+
+    def append(self, timestamp: float, value: float):
+        slot = self.total % self.capacity
+        self.times[slot] = timestamp
+        self.values[slot] = value
+        self.total += 1
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray):
+        """Append many samples at once"""
+        count = len(timestamps)
+        if count > self.capacity:
+            timestamps = timestamps[-self.capacity :]
+            values = values[-self.capacity :]
+            self.total += count - self.capacity
+            count = self.capacity
+
+        start = self.total % self.capacity
+        first = min(count, self.capacity - start)
+        self.times[start : start + first] = timestamps[:first]
+        self.values[start : start + first] = values[:first]
+        self.times[: count - first] = timestamps[first:]
+        self.values[: count - first] = values[first:]
+        self.total += count
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def last(self) -> tuple[float, float] | None:
+        if self.total == 0:
+            return None
+        slot = (self.total - 1) % self.capacity
+        return (float(self.times[slot]), float(self.values[slot]))
+
+    def ordered(self) -> tuple[np.ndarray, np.ndarray]:
+        """All stored samples, oldest first"""
+        if self.total <= self.capacity:
+            return (self.times[: self.total], self.values[: self.total])
+        start = self.total % self.capacity
+        return (
+            np.concatenate((self.times[start:], self.times[:start])),
+            np.concatenate((self.values[start:], self.values[:start])),
+        )
+
+    def ordered_tail(self, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """The newest count samples, oldest first"""
+        count = min(count, len(self))
+        start = (self.total - count) % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            return (self.times[start:end], self.values[start:end])
+        end -= self.capacity
+        return (
+            np.concatenate((self.times[start:], self.times[:end])),
+            np.concatenate((self.values[start:], self.values[:end])),
+        )
+
+    def since(self, timestamp: float) -> tuple[np.ndarray, np.ndarray]:
+        """Samples at or after timestamp, oldest first"""
+        count = len(self)
+        if count == 0:
+            return (self.times[:0], self.values[:0])
+
+        # Binary search on the ring without unrolling it
+        start = self.total - count
+        low, high = start, self.total
+        while low < high:
+            middle = (low + high) // 2
+            if self.times[middle % self.capacity] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+
+        first = low % self.capacity
+        end = self.total % self.capacity
+        if low == self.total:
+            return (self.times[:0], self.values[:0])
+        if first < end or end == 0:
+            stop = end if end else self.capacity
+            return (self.times[first:stop], self.values[first:stop])
+        return (
+            np.concatenate((self.times[first:], self.times[:end])),
+            np.concatenate((self.values[first:], self.values[:end])),
+        )
+
+    def clear(self):
+        self.total = 0
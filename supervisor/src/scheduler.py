@@ -0,0 +1,127 @@
+import math
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+
+class TickStatistics:
+    """Running jitter and overrun statistics for one scheduled channel"""
+
+    def __init__(self, window: int = 256):
+        self.ticks: int = 0
+        self.overruns: int = 0
+        self.max_jitter: float = 0.0
+        self._jitter_total: float = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def record(self, jitter: float, missed: int):
+        self.ticks += 1
+        self.overruns += missed
+        self._jitter_total += jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self._recent.append(jitter)
+
+    def as_dict(self) -> dict[str, float]:
+        """Jitter values are in milliseconds"""
+        recent = sorted(self._recent)
+        p99 = recent[min(len(recent) - 1, int(len(recent) * 0.99))] if recent else 0.0
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "mean_jitter_ms": (self._jitter_total / self.ticks * 1000)
+            if self.ticks
+            else 0.0,
+            "p99_jitter_ms": p99 * 1000,
+            "max_jitter_ms": self.max_jitter * 1000,
+        }
+
+
+class _Channel:
+    def __init__(self, rate: float, signal):
+        self.period: float = 1.0 / rate
+        self.deadline: float = 0.0
+        self.signal = signal
+        self.stats = TickStatistics()
+
+
+class ControlLoop(QObject):
+    """
+    Fixed-rate scheduler for control output.
+
+    Position (tendon) and speed (spool) channels tick at their own
+    rates. Deadlines sit on a fixed grid from the start time, so
+    lateness never accumulates into drift. If a channel falls more than
+    a whole period behind, the missed ticks are counted as overruns and
+    skipped rather than fired in a burst.
+
+    Signals:
+        position_tick(): Time to compute and send the tendon setpoints
+        speed_tick(): Time to compute and send the spool speed
+        ticks_done(): Every channel due at this time has ticked, for
+            sending what the ticks computed in one packet
+    """
+
+    position_tick = pyqtSignal()
+    speed_tick = pyqtSignal()
+    ticks_done = pyqtSignal()
+
+    def __init__(self, position_rate: float, speed_rate: float):
+        """
+        Args:
+            position_rate: Tendon channel rate in Hz
+            speed_rate: Spool channel rate in Hz
+        """
+        super().__init__()
+        self._channels: dict[str, _Channel] = {
+            "position": _Channel(position_rate, self.position_tick),
+            "speed": _Channel(speed_rate, self.speed_tick),
+        }
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        now = time.monotonic()
+        for channel in self._channels.values():
+            channel.deadline = now + channel.period
+        self._schedule(now)
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def set_rate(self, channel: str, rate: float):
+        """Change a channel's rate, takes effect from its next tick"""
+        self._channels[channel].period = 1.0 / rate
+
+    def _schedule(self, now: float):
+        next_deadline = min(c.deadline for c in self._channels.values())
+        # Round up so the timer never fires before the deadline
+        self._timer.start(max(0, math.ceil((next_deadline - now) * 1000)))
+
+    def _on_timeout(self):
+        now = time.monotonic()
+        ticked = False
+        for channel in self._channels.values():
+            if now < channel.deadline:
+                continue
+
+            lateness = now - channel.deadline
+            missed = int(lateness // channel.period)
+            channel.deadline += (missed + 1) * channel.period
+            channel.stats.record(lateness, missed)
+            channel.signal.emit()
+            ticked = True
+
+        if ticked:
+            self.ticks_done.emit()
+        self._schedule(time.monotonic())
+
+    def get_statistics(self) -> dict[str, dict[str, float]]:
+        """Get per-channel tick, overrun and jitter statistics"""
+        return {name: c.stats.as_dict() for name, c in self._channels.items()}
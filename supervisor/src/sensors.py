@@ -0,0 +1,193 @@
+import math
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.config import SENSOR_HISTORY_SIZE
+from src.ring_buffer import RingBuffer
+
+# Batched SENSOR_DATA: id, count, uint32 millis of the first sample,
+# uint16 microseconds between samples, then count float32 samples
+SENSOR_BATCH_HEADER = struct.Struct("<BBIH")
+SUBSCRIBE_ENTRY = struct.Struct("<BH")  # Sensor id, rate in Hz (0 to stop)
+MAX_SENSOR_RATE = 1000  # Hz, must match the executor
+
+
+@dataclass(frozen=True)
+class SensorSpec:
+    """Metadata of one executor sensor, must match readSensor() in the executor"""
+
+    sensor_id: int
+    name: str
+    unit: str
+
+
+class SENSORS:
+    TANK_PRESSURE = SensorSpec(0, "tank_pressure", "psi")
+
+
+SENSOR_SPECS: dict[int, SensorSpec] = {
+    spec.sensor_id: spec for spec in (SENSORS.TANK_PRESSURE,)
+}
+
+
+def encode_subscriptions(rates: dict[int, int]) -> bytes:
+    """Pack {sensor_id: rate in Hz} into a CMD_SUBSCRIBE payload"""
+    payload = bytearray()
+    for sensor_id, rate in rates.items():
+        if sensor_id not in SENSOR_SPECS:
+            raise ValueError(f"Unknown sensor {sensor_id}")
+        if not 0 <= rate <= MAX_SENSOR_RATE:
+            raise ValueError(f"Sensor rate must be in [0, {MAX_SENSOR_RATE}] Hz")
+        payload += SUBSCRIBE_ENTRY.pack(sensor_id, int(rate))
+    return bytes(payload)
+
+
+def parse_rates(text: str) -> dict[int, int]:
+    """
+    Parse "id:Hz,id:Hz" into {sensor_id: rate in Hz}
+
+    Raises:
+        ValueError: If an entry is malformed, the sensor unknown or the
+            rate out of range
+    """
+    rates = {}
+    for entry in text.split(","):
+        sensor_id, _, rate = entry.partition(":")
+        rates[int(sensor_id)] = int(rate)
+    encode_subscriptions(rates)  # Checks the ids and rates
+    return rates
+
+
+def decode_sensor_batch(
+    payload: bytes,
+) -> tuple[int, np.ndarray, np.ndarray] | None:
+    """
+    Decode a batched SENSOR_DATA payload without copying the samples
+    through Python floats.
+
+    Returns:
+        (sensor_id, executor times in seconds, values), or None if the
+        payload is not a batch
+    """
+    if len(payload) < SENSOR_BATCH_HEADER.size:
+        return None
+    sensor_id, count, first_ms, interval_us = SENSOR_BATCH_HEADER.unpack_from(payload)
+    if len(payload) != SENSOR_BATCH_HEADER.size + count * 4:
+        return None
+
+    values = np.frombuffer(
+        payload, dtype="<f4", count=count, offset=SENSOR_BATCH_HEADER.size
+    )
+    times = first_ms / 1000 + np.arange(count) * (interval_us / 1e6)
+    return (sensor_id, times, values.astype(np.float64))
+
+
+def aggregate(
+    times: np.ndarray, values: np.ndarray, interval: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduce samples to fixed time buckets for display.
+
+    Args:
+        times: Sorted sample times in seconds
+        values: Sample values
+        interval: Bucket width in seconds
+
+    Returns:
+        (bucket start times, means, minimums, maximums)
+    """
+    if len(times) == 0:
+        empty = np.zeros(0)
+        return (empty, empty, empty, empty)
+
+    buckets = np.floor(times / interval).astype(np.int64)
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    counts = np.diff(np.append(starts, len(values)))
+    means = np.add.reduceat(values, starts) / counts
+    return (
+        buckets[starts] * interval,
+        means,
+        np.minimum.reduceat(values, starts),
+        np.maximum.reduceat(values, starts),
+    )
+
+
+class SensorHub:
+    """
+    Per-sensor history of streamed samples.
+
+    Batched SENSOR_DATA frames are decoded with NumPy straight into one
+    RingBuffer per sensor, stamped in executor time. One-shot
+    CMD_READ_SENSOR replies are stored the same way, stamped with the
+    executor time the caller estimates they arrived at.
+    """
+
+    def __init__(self, history_size: int = SENSOR_HISTORY_SIZE):
+        """
+        Args:
+            history_size: Samples kept per sensor
+        """
+        self.history_size = history_size
+        self.buffers: dict[int, RingBuffer] = {
+            sensor_id: RingBuffer(history_size) for sensor_id in SENSOR_SPECS
+        }
+        self.rates: dict[int, int] = {}  # Requested rates, resent after a reset
+        self.frames: int = 0
+        self.invalid_frames: int = 0
+
+    def subscribe(self, rates: dict[int, int]) -> bytes:
+        """
+        Record the wanted rates and build the CMD_SUBSCRIBE payload.
+        A rate of 0 unsubscribes.
+        """
+        payload = encode_subscriptions(rates)
+        for sensor_id, rate in rates.items():
+            if rate:
+                self.rates[sensor_id] = rate
+            else:
+                self.rates.pop(sensor_id, None)
+        return payload
+
+    def resubscribe(self) -> bytes:
+        """CMD_SUBSCRIBE payload for every recorded rate, e.g. after a reset"""
+        return encode_subscriptions(self.rates)
+
+    def handle_sensor_data(
+        self, payload: bytes, executor_time: float
+    ) -> tuple[int, np.ndarray, np.ndarray] | None:
+        """
+        Store a SENSOR_DATA payload, batched or one-shot.
+
+        Args:
+            payload: SENSOR_DATA payload
+            executor_time: Executor time in seconds the packet arrived,
+                used for one-shot replies, which carry no timestamp.
+                One-shot replies are dropped while it is NaN
+
+        Returns:
+            (sensor_id, times, values) that were stored, or None
+        """
+        batch = decode_sensor_batch(payload)
+        if batch is None and len(payload) == 5 and math.isfinite(executor_time):
+            sensor_id, value = struct.unpack("<Bf", payload)
+            batch = (sensor_id, np.array([executor_time]), np.array([value]))
+
+        if batch is None or batch[0] not in self.buffers:
+            self.invalid_frames += 1
+            return None
+
+        sensor_id, times, values = batch
+        self.buffers[sensor_id].extend(times, values)
+        self.frames += 1
+        return batch
+
+    def history(self, sensor_id: int, since: float | None = None):
+        """(times, values) of one sensor, oldest first"""
+        buffer = self.buffers[sensor_id]
+        return buffer.ordered() if since is None else buffer.since(since)
+
+    def clear(self):
+        for buffer in self.buffers.values():
+            buffer.clear()
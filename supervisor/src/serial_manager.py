@@ -1,7 +1,7 @@
 import traceback
 from enum import Enum
 
-from PyQt6.QtCore import QIODevice, QObject, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import QIODevice, QObject, QThread, pyqtSignal, pyqtSlot
 from PyQt6.QtSerialPort import QSerialPort, QSerialPortInfo
 
 
@@ -37,6 +37,21 @@ class SerialConfig:
         self.flow_control = flow_control
 
 
+class PortScanner(QThread):
+    """
+    Looks for Arduino ports off the GUI thread, enumerating them can take
+    a while on some systems.
+
+    Signals:
+        ports_found(list): Port names from SerialManager.find_arduino_ports()
+    """
+
+    ports_found = pyqtSignal(list)
+
+    def run(self):
+        self.ports_found.emit(SerialManager.find_arduino_ports())
+
+
 class SerialManager(QObject):
     """
     Manages serial port communication with Arduino-style devices.
@@ -69,6 +84,11 @@ class SerialManager(QObject):
         self.add_newline = add_newline
         self._config = SerialConfig()
 
+        # Statistics, only updated on the GUI thread
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+        self.write_errors: int = 0
+
     @staticmethod
     def get_available_ports() -> list[tuple[str, str, str]]:
         """
@@ -177,9 +197,11 @@ class SerialManager(QObject):
         bytes_written = self.serial.write(data.encode("utf-8"))
 
         if bytes_written == -1:
+            self.write_errors += 1
             self.error_occurred.emit("Failed to write data")
             return False
 
+        self.bytes_sent += bytes_written
         return True
 
     def send_bytes(self, data: bytes, throw_error: bool = True) -> bool:
@@ -201,10 +223,12 @@ class SerialManager(QObject):
         bytes_written = self.serial.write(data)
 
         if bytes_written == -1:
+            self.write_errors += 1
             if throw_error:
                 self.error_occurred.emit("Failed to write data")
             return False
 
+        self.bytes_sent += bytes_written
         return True
 
     def read_line(self) -> str | None:
@@ -242,10 +266,20 @@ class SerialManager(QObject):
     @pyqtSlot()
     def _on_ready_read(self):
         """Internal handler for incoming data."""
+        if not self.auto_decode:
+            # Binary data is not split at 0x0A, bytes after the last one would
+            # wait for the next readyRead
+            data = self.serial.readAll()
+            if data:
+                self.bytes_received += len(data)
+                self.data_received_raw.emit(bytes(data))
+            return
+
         if self.serial.canReadLine():
             while self.serial.canReadLine():
                 data = self.serial.readLine()
                 raw_bytes = bytes(data)
+                self.bytes_received += len(raw_bytes)
 
                 if self.auto_decode:
                     try:
@@ -259,6 +293,7 @@ class SerialManager(QObject):
             data = self.serial.readAll()
             if data:
                 raw_bytes = bytes(data)
+                self.bytes_received += len(raw_bytes)
 
                 if self.auto_decode:
                     try:
@@ -277,6 +312,28 @@ class SerialManager(QObject):
         """Get the current baud rate."""
         return self.serial.baudRate()
 
+    def set_baud_rate(self, baud_rate: int) -> bool:
+        """
+        Change the baud rate, also while connected.
+
+        Args:
+            baud_rate: New baud rate
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._config.baud_rate = baud_rate
+        if not self.is_connected():
+            return True
+
+        self.serial.flush()  # Hand queued bytes to the driver before switching
+        if not self.serial.setBaudRate(baud_rate):
+            self.error_occurred.emit(
+                f"Failed to set baud rate {baud_rate}: {self.serial.errorString()}"
+            )
+            return False
+        return True
+
     def flush(self) -> bool:
         """Flush the serial port buffers."""
         return self.serial.flush()
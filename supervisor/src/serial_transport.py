@@ -0,0 +1,176 @@
+import asyncio
+import os
+import termios
+from collections.abc import Callable
+
+# Input and local mode bits cleared for a raw port, as cfmakeraw() does
+_RAW_IFLAG = (
+    termios.IGNBRK
+    | termios.BRKINT
+    | termios.PARMRK
+    | termios.ISTRIP
+    | termios.INLCR
+    | termios.IGNCR
+    | termios.ICRNL
+    | termios.IXON
+    | termios.IXOFF
+    | termios.IXANY
+)
+_RAW_LFLAG = (
+    termios.ECHO | termios.ECHONL | termios.ICANON | termios.ISIG | termios.IEXTEN
+)
+
+
+class SerialTransport:
+    """
+    Serial port on an asyncio event loop, for POSIX ttys and ptys.
+
+    Incoming bytes are handed to on_data as soon as loop.add_reader
+    reports them. send() writes straight to the port, and whatever the
+    driver does not take is queued and written once the port is writable
+    again, so the caller never blocks. Past `max_queued` bytes send()
+    refuses, as the executor is clearly not keeping up.
+    """
+
+    def __init__(
+        self,
+        on_data: Callable[[bytes], None],
+        on_closed: Callable[[], None] | None = None,
+        max_queued: int = 64 * 1024,
+    ):
+        """
+        Args:
+            on_data: Called with every chunk of bytes read
+            on_closed: Called when the port goes away, e.g. unplugged
+            max_queued: Bytes queued for writing before send() refuses
+        """
+        self.on_data = on_data
+        self.on_closed = on_closed
+        self.max_queued = max_queued
+        self.fd: int | None = None
+        self.baud_rate = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue = bytearray()
+        self._drained = asyncio.Event()
+        self._drained.set()
+
+    @property
+    def queued(self) -> int:
+        """Bytes waiting to be written"""
+        return len(self._queue)
+
+    def open(self, path: str, baud_rate: int):
+        """
+        Open and configure the port, from within the running loop.
+
+        Raises:
+            OSError: The port cannot be opened
+            ValueError: The baud rate is not one termios knows
+        """
+        if self.fd is not None:
+            self.close()
+        self._loop = asyncio.get_running_loop()
+        self.fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            self.set_baud_rate(baud_rate)
+        except (OSError, ValueError):
+            os.close(self.fd)
+            self.fd = None
+            raise
+        self._loop.add_reader(self.fd, self._on_readable)
+
+    def close(self):
+        if self.fd is None:
+            return
+        assert self._loop is not None
+        self._loop.remove_reader(self.fd)
+        self._loop.remove_writer(self.fd)
+        os.close(self.fd)
+        self.fd = None
+        self._queue.clear()
+        self._drained.set()
+        if self.on_closed is not None:
+            self.on_closed()
+
+    def is_connected(self) -> bool:
+        return self.fd is not None
+
+    def set_baud_rate(self, baud_rate: int):
+        """Raw 8N1 at this rate, also while open"""
+        speed = getattr(termios, f"B{baud_rate}", None)
+        if speed is None:
+            raise ValueError(f"Baud rate {baud_rate} is not supported by termios")
+        assert self.fd is not None
+
+        iflag, oflag, cflag, lflag, _, _, cc = termios.tcgetattr(self.fd)
+        iflag &= ~_RAW_IFLAG
+        oflag &= ~termios.OPOST
+        lflag &= ~_RAW_LFLAG
+        cflag &= ~(termios.CSIZE | termios.PARENB | termios.CSTOPB)
+        cflag &= ~getattr(termios, "CRTSCTS", 0)
+        cflag |= termios.CS8 | termios.CREAD | termios.CLOCAL
+        cc[termios.VMIN] = 0
+        cc[termios.VTIME] = 0
+        termios.tcsetattr(
+            self.fd, termios.TCSANOW, [iflag, oflag, cflag, lflag, speed, speed, cc]
+        )
+        self.baud_rate = baud_rate
+
+    def send(self, data: bytes) -> bool:
+        """
+        Write without blocking.
+
+        Returns:
+            False if not open or the queue is full, True otherwise
+        """
+        if self.fd is None or len(self._queue) + len(data) > self.max_queued:
+            return False
+
+        if self._queue:
+            self._queue += data  # Behind what is already waiting
+            return True
+        try:
+            written = os.write(self.fd, data)
+        except BlockingIOError:
+            written = 0
+        except OSError:
+            self.close()
+            return False
+        if written < len(data):
+            self._queue += data[written:]
+            self._drained.clear()
+            assert self._loop is not None
+            self._loop.add_writer(self.fd, self._on_writable)
+        return True
+
+    async def drain(self):
+        """Wait until every queued byte has been handed to the driver"""
+        await self._drained.wait()
+
+    def _on_writable(self):
+        assert self.fd is not None and self._loop is not None
+        try:
+            written = os.write(self.fd, self._queue)
+        except BlockingIOError:
+            return
+        except OSError:
+            self.close()
+            return
+        del self._queue[:written]
+        if not self._queue:
+            self._loop.remove_writer(self.fd)
+            self._drained.set()
+
+    def _on_readable(self):
+        assert self.fd is not None
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError:  # EIO once the other end of a pty is gone
+            self.close()
+            return
+        if not data:
+            self.close()
+            return
+        self.on_data(data)
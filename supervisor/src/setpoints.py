@@ -0,0 +1,60 @@
+import struct
+from enum import IntEnum
+
+# CMD_SET_SETPOINTS: tendon 1-3 and spool speed as int16 fixed point
+SETPOINT_FRAME = struct.Struct("<hhhh")
+TENDON_LSB = 1 / 4096  # Radians per count, +-8 rad
+SPOOL_LSB = 1 / 8192  # rpm per count, +-4 rpm
+KEEP = -32768  # Leaves that setpoint as it is, tendons are kept as a group
+_LIMIT = 32767
+
+
+class SetpointEncoding(IntEnum):
+    """Values of the SETPOINT_ENCODING parameter, must match the executor"""
+
+    FLOAT32 = 0  # CMD_SET_TENDONS and CMD_SET_SPOOL only
+    INT16 = 1  # CMD_SET_SETPOINTS with the scales above
+
+
+def _to_fixed(value: float, lsb: float) -> int:
+    counts = round(value / lsb)
+    if not -_LIMIT <= counts <= _LIMIT:
+        raise ValueError(f"{value} is outside +-{_LIMIT * lsb:.3f}")
+    return counts
+
+
+def encode_setpoints(
+    tendons: tuple[float, float, float] | None, spool: float | None
+) -> bytes:
+    """
+    Pack a CMD_SET_SETPOINTS payload.
+
+    Args:
+        tendons: Tendon setpoints in radians, or None to keep them
+        spool: Spool speed in rpm, or None to keep it
+    """
+    if tendons is None:
+        tendon_counts = (KEEP, KEEP, KEEP)
+    else:
+        tendon_counts = tuple(_to_fixed(value, TENDON_LSB) for value in tendons)
+    spool_count = KEEP if spool is None else _to_fixed(spool, SPOOL_LSB)
+    return SETPOINT_FRAME.pack(*tendon_counts, spool_count)
+
+
+def decode_setpoints(
+    payload: bytes,
+) -> tuple[tuple[float, float, float] | None, float | None] | None:
+    """
+    Unpack a CMD_SET_SETPOINTS payload.
+
+    Returns:
+        (tendons in radians or None, spool rpm or None), None entries
+        were kept, or None if the payload is malformed
+    """
+    if len(payload) != SETPOINT_FRAME.size:
+        return None
+    tendon_1, tendon_2, tendon_3, spool = SETPOINT_FRAME.unpack(payload)
+    tendons = None
+    if tendon_1 != KEEP:
+        tendons = (tendon_1 * TENDON_LSB, tendon_2 * TENDON_LSB, tendon_3 * TENDON_LSB)
+    return (tendons, None if spool == KEEP else spool * SPOOL_LSB)
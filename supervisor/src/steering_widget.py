@@ -1,7 +1,7 @@
 import math
 
-from PyQt6.QtCore import QPointF, QSize, Qt
-from PyQt6.QtGui import QBrush, QPainter, QPen, QPolygonF
+from PyQt6.QtCore import QEvent, QPointF, QSize, Qt
+from PyQt6.QtGui import QBrush, QPainter, QPen, QPixmap, QPolygonF, QStaticText
 from PyQt6.QtWidgets import QSizePolicy, QWidget
 
 from src.config import TENDON_1_ANGLE, TENDON_2_ANGLE, TENDON_3_ANGLE
@@ -41,6 +41,17 @@ class RobotSteeringWidget(QWidget):
         self._body_radius_ratio = 0.35  # Ratio of widget size
         self._tendon_length_ratio = 0.45
 
+        # Render cache, the static layer is rebuilt on resize or palette change
+        self._static_layer: QPixmap | None = None
+        self._center = QPointF()
+        self._body_radius = 0.0
+        self._tendon_points: list[tuple[QPointF, QPointF, QPointF]] = []
+        self._labels = (QStaticText("T1"), QStaticText("T2"), QStaticText("T3"))
+        self._value_texts: dict[str, QStaticText] = {}
+        self._tendon_pen = QPen(self.palette().highlight().color(), 3)
+        self._text_pen = QPen(Qt.GlobalColor.white)
+        self._arrow_pen = QPen(self.palette().highlight().color(), 3)
+
     def heightForWidth(self, a0):
         return a0
 
@@ -81,116 +92,152 @@ class RobotSteeringWidget(QWidget):
         self._steering_magnitude = max(0.0, min(1.0, magnitude))
         self.update()
 
-    def paintEvent(self, a0):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def setState(self, tendon_values, angle, magnitude):
+        """Set the tendon values and steering with a single repaint"""
+        self._tendon_1_value, self._tendon_2_value, self._tendon_3_value = tendon_values
+        self._steering_angle = angle
+        self._steering_magnitude = max(0.0, min(1.0, magnitude))
+        self.update()
 
-        # Calculate center and radius
+    def resizeEvent(self, a0):
+        self._static_layer = None
+        super().resizeEvent(a0)
+
+    def changeEvent(self, a0):
+        if a0 is not None and a0.type() in (
+            QEvent.Type.PaletteChange,
+            QEvent.Type.FontChange,
+        ):
+            self._static_layer = None
+            self._value_texts.clear()
+        super().changeEvent(a0)
+
+    def _update_geometry(self):
+        """Precompute every position that only depends on the widget size"""
         size = min(self.width(), self.height())
         center_x = self.width() / 2
         center_y = self.height() / 2
         body_radius = size * self._body_radius_ratio
         tendon_radius = size * self._tendon_length_ratio
 
+        self._center = QPointF(center_x, center_y)
+        self._body_radius = body_radius
+        self._tendon_points = []
+        for angle in (self._tendon_1_angle, self._tendon_2_angle, self._tendon_3_angle):
+            # Convert angle to Qt coordinate system (y-axis is inverted)
+            qt_angle = angle * -1
+            cos_a = math.cos(qt_angle)
+            sin_a = math.sin(qt_angle)
+            self._tendon_points.append(
+                (
+                    QPointF(
+                        center_x + body_radius * cos_a, center_y + body_radius * sin_a
+                    ),
+                    QPointF(
+                        center_x + tendon_radius * cos_a,
+                        center_y + tendon_radius * sin_a,
+                    ),
+                    QPointF(
+                        center_x + (tendon_radius + 20) * cos_a,
+                        center_y + (tendon_radius + 20) * sin_a,
+                    ),
+                )
+            )
+
+    def _build_static_layer(self) -> QPixmap:
+        """Draw the body, tendon circles and labels, which only change on resize"""
+        self._update_geometry()
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
         # Draw body circle
         painter.setPen(QPen(self.palette().light().color(), 2))
         painter.setBrush(QBrush(self.palette().alternateBase().color()))
-        painter.drawEllipse(QPointF(center_x, center_y), body_radius, body_radius)
-
-        # Draw tendons
-        self._draw_tendon(
-            painter,
-            center_x,
-            center_y,
-            body_radius,
-            tendon_radius,
-            self._tendon_1_angle,
-            self._tendon_1_value,
-            self.palette().highlight().color(),
-            "T1",
-        )
-        self._draw_tendon(
-            painter,
-            center_x,
-            center_y,
-            body_radius,
-            tendon_radius,
-            self._tendon_2_angle,
-            self._tendon_2_value,
-            self.palette().highlight().color(),
-            "T2",
-        )
-        self._draw_tendon(
-            painter,
-            center_x,
-            center_y,
-            body_radius,
-            tendon_radius,
-            self._tendon_3_angle,
-            self._tendon_3_value,
-            self.palette().highlight().color(),
-            "T3",
-        )
+        painter.drawEllipse(self._center, self._body_radius, self._body_radius)
 
-        # Draw steering direction arrow if magnitude > 0
-        if self._steering_magnitude > 0.01:
-            self._draw_steering_arrow(painter, center_x, center_y, body_radius * 0.7)
-
-    def _draw_tendon(
-        self, painter, cx, cy, body_r, tendon_r, angle, value, color, label
-    ):
-        """Draw a single tendon with its line, circle, and label."""
-        # Convert angle to Qt coordinate system (y-axis is inverted)
-        qt_angle = angle * -1
-
-        # Calculate positions
-        body_x = cx + body_r * math.cos(qt_angle)
-        body_y = cy + body_r * math.sin(qt_angle)
-        tendon_x = cx + tendon_r * math.cos(qt_angle)
-        tendon_y = cy + tendon_r * math.sin(qt_angle)
-        label_x = cx + (tendon_r + 20) * math.cos(qt_angle)
-        label_y = cy + (tendon_r + 20) * math.sin(qt_angle)
-
-        # Determine line width based on tendon value (thicker = more tension)
+        color = self.palette().highlight().color()
+        self._tendon_pen.setColor(color)
+        circle_radius = 16
+        for (_, tendon_point, label_point), label in zip(
+            self._tendon_points, self._labels
+        ):
+            # Draw tendon circle
+            painter.setPen(QPen(color, 2))
+            painter.setBrush(QBrush(color))
+            painter.drawEllipse(tendon_point, circle_radius, circle_radius)
+
+            # Draw label, centered on where the old baseline text sat
+            painter.setPen(QPen(Qt.GlobalColor.white))
+            label_size = label.size()
+            painter.drawStaticText(
+                QPointF(
+                    label_point.x() - label_size.width() / 2,
+                    label_point.y() - label_size.height() / 2,
+                ),
+                label,
+            )
+
+        painter.end()
+        return pixmap
+
+    def _value_text(self, value: float) -> QStaticText:
+        text = f"{value:.2f}"
+        static_text = self._value_texts.get(text)
+        if static_text is None:
+            if len(self._value_texts) > 512:
+                self._value_texts.clear()
+            static_text = QStaticText(text)
+            static_text.prepare(font=self.font())
+            self._value_texts[text] = static_text
+        return static_text
+
+    def paintEvent(self, a0):
+        if self._static_layer is None:
+            self._static_layer = self._build_static_layer()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, self._static_layer)
+
+        values = (self._tendon_1_value, self._tendon_2_value, self._tendon_3_value)
+
+        # Line from center to body edge, thicker = more tension
         base_width = 3
-        value_width = max(0, min(5, abs(value) * 2))  # Scale value to width
-        line_width = base_width + value_width
+        for (body_point, _, _), value in zip(self._tendon_points, values):
+            value_width = max(0, min(5, abs(value) * 2))  # Scale value to width
+            self._tendon_pen.setWidthF(base_width + value_width)
+            painter.setPen(self._tendon_pen)
+            painter.drawLine(self._center, body_point)
+
+        # Value text inside the tendon circle
+        painter.setPen(self._text_pen)
+        for (_, tendon_point, _), value in zip(self._tendon_points, values):
+            static_text = self._value_text(value)
+            text_size = static_text.size()
+            painter.drawStaticText(
+                QPointF(
+                    tendon_point.x() - text_size.width() / 2,
+                    tendon_point.y() - text_size.height() / 2,
+                ),
+                static_text,
+            )
 
-        # Draw line from center to body edge
-        painter.setPen(QPen(color, line_width))
-        painter.drawLine(QPointF(cx, cy), QPointF(body_x, body_y))
+        # Draw steering direction arrow if magnitude > 0
+        if self._steering_magnitude > 0.01:
+            self._draw_steering_arrow(painter, self._body_radius * 0.7)
 
-        # Draw tendon circle
-        circle_radius = 16
-        painter.setPen(QPen(color, 2))
-        painter.setBrush(QBrush(color))
-        painter.drawEllipse(QPointF(tendon_x, tendon_y), circle_radius, circle_radius)
-
-        # Draw label
-        painter.setPen(QPen(Qt.GlobalColor.white))
-        # painter.drawText(int(label_x - 10), int(label_y + 5), label)
-        painter.drawText(int(label_x - 10), int(label_y + 5), label)
-
-        # Draw value text inside or near the circle
-        painter.setPen(QPen(Qt.GlobalColor.white))
-        value_text = f"{value:.2f}"
-        # For small values, draw text next to circle
-        # if abs(value) < 0.3:
-        # text_offset = 15
-        # text_x = tendon_x + text_offset * math.cos(qt_angle)
-        # text_y = tendon_y + text_offset * math.sin(qt_angle)
-        # else:
-        text_x = tendon_x
-        text_y = tendon_y
-
-        # Calculate text bounds for centering (approximate)
-        text_width = len(value_text) * 7
-        painter.drawText(int(text_x - text_width / 2), int(text_y + 4), value_text)
-
-    def _draw_steering_arrow(self, painter, cx, cy, length):
+    def _draw_steering_arrow(self, painter, length):
         """Draw an arrow indicating the steering direction."""
         # Convert angle to Qt coordinate system
         qt_angle = self._steering_angle * -1
+        cx = self._center.x()
+        cy = self._center.y()
 
         # Calculate arrow end point (scaled by magnitude)
         arrow_length = length * self._steering_magnitude
@@ -198,8 +245,9 @@ class RobotSteeringWidget(QWidget):
         end_y = cy + arrow_length * math.sin(qt_angle)
 
         # Draw arrow line
-        painter.setPen(QPen(self.palette().highlight().color(), 3))
-        painter.drawLine(QPointF(cx, cy), QPointF(end_x, end_y))
+        self._arrow_pen.setColor(self.palette().highlight().color())
+        painter.setPen(self._arrow_pen)
+        painter.drawLine(self._center, QPointF(end_x, end_y))
 
         # Draw arrowhead
         arrow_size = 12
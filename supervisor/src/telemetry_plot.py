@@ -0,0 +1,261 @@
+import time
+
+import numpy as np
+from PyQt6.QtCore import QPointF, QSize, QTimer
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from src.ring_buffer import RingBuffer
+
+
+def _min_max_polyline(
+    columns: np.ndarray, y_min: np.ndarray, y_max: np.ndarray
+) -> QPolygonF:
+    """
+    Build a polyline that goes from the min to the max of every column,
+    written straight into the QPolygonF point storage.
+    """
+    count = len(columns)
+    polygon = QPolygonF()
+    polygon.resize(count * 2)
+    pointer = polygon.data()
+    pointer.setsize(count * 2 * 2 * 8)  # Two points of two doubles per column
+
+    points = np.frombuffer(pointer, dtype=np.float64).reshape(count, 2, 2)
+    points[:, :, 0] = columns[:, None]
+    points[:, 0, 1] = y_min
+    points[:, 1, 1] = y_max
+    return polygon
+
+
+class _ColumnCache:
+    """
+    Running min/max of one channel per time bucket of one pixel column.
+
+    Buckets are aligned to absolute time, so finished buckets never
+    change and each paint only has to fold in the samples appended since
+    the previous one.
+    """
+
+    def __init__(self, buffer: RingBuffer):
+        self.buffer = buffer
+        self.bucket_width = 0.0
+        self.seen = 0  # buffer.total when last updated
+        self.buckets = np.zeros(0, dtype=np.int64)
+        self.minimums = np.zeros(0, dtype=np.float64)
+        self.maximums = np.zeros(0, dtype=np.float64)
+
+    def update(self, bucket_width: float, first_bucket: int):
+        """
+        Fold new samples in and drop buckets before first_bucket.
+
+        Args:
+            bucket_width: Seconds per pixel column
+            first_bucket: Bucket of the left edge of the plot
+        """
+        buffer = self.buffer
+        if bucket_width != self.bucket_width or buffer.total < self.seen:
+            # Resized or cleared, start over from everything stored
+            self.bucket_width = bucket_width
+            self.seen = buffer.total - len(buffer)
+            self.buckets = self.buckets[:0]
+            self.minimums = self.minimums[:0]
+            self.maximums = self.maximums[:0]
+
+        new = min(buffer.total - self.seen, len(buffer))
+        self.seen = buffer.total
+        if new > 0:
+            times, values = buffer.ordered_tail(new)
+            buckets = np.floor(times / bucket_width).astype(np.int64)
+            keep = buckets >= first_bucket
+            times, values, buckets = (times[keep], values[keep], buckets[keep])
+
+        if new > 0 and len(buckets):
+            # Times are sorted, so every bucket is one contiguous run
+            starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+            minimums = np.minimum.reduceat(values, starts)
+            maximums = np.maximum.reduceat(values, starts)
+            buckets = buckets[starts]
+
+            if len(self.buckets) and self.buckets[-1] == buckets[0]:
+                # The newest cached bucket was still filling
+                minimums[0] = min(minimums[0], self.minimums[-1])
+                maximums[0] = max(maximums[0], self.maximums[-1])
+                self.buckets = self.buckets[:-1]
+                self.minimums = self.minimums[:-1]
+                self.maximums = self.maximums[:-1]
+
+            self.buckets = np.concatenate((self.buckets, buckets))
+            self.minimums = np.concatenate((self.minimums, minimums))
+            self.maximums = np.concatenate((self.maximums, maximums))
+
+        skip = int(np.searchsorted(self.buckets, first_bucket))
+        if skip:
+            self.buckets = self.buckets[skip:]
+            self.minimums = self.minimums[skip:]
+            self.maximums = self.maximums[skip:]
+
+
+class _Lane:
+    """One horizontal strip of the plot, sharing a y axis between channels"""
+
+    def __init__(self, name: str, y_range: tuple[float, float] | None):
+        self.name = name
+        self.y_range = y_range  # None to autoscale
+        self.channels: list[str] = []
+
+
+class TelemetryPlot(QWidget):
+    """
+    Scrolling strip chart of telemetry channels.
+
+    Each channel is a preallocated RingBuffer, so add_sample is O(1)
+    and can be called straight from packet and control slots. Painting
+    happens on a capped timer and only when new samples arrived. Samples
+    are reduced to a min/max pair per pixel column, and those columns are
+    cached between paints, so the cost of a paint depends on the widget
+    width and the samples since the last paint, not on how much history
+    is stored.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        capacity: int,
+        refresh_interval: int,
+        parent=None,
+    ):
+        """
+        Args:
+            window: Seconds of history shown
+            capacity: Samples kept per channel
+            refresh_interval: Minimum milliseconds between repaints
+        """
+        super().__init__(parent)
+        self.setMinimumHeight(200)
+        self.setSizePolicy(
+            QSizePolicy.Policy.Expanding, QSizePolicy.Policy.MinimumExpanding
+        )
+
+        self.window = window
+        self.capacity = capacity
+        self._lanes: list[_Lane] = []
+        self._buffers: dict[str, RingBuffer] = {}
+        self._pens: dict[str, QPen] = {}
+        self._columns: dict[str, _ColumnCache] = {}
+        self._seen_total = 0
+        self._appended = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._on_refresh)
+        self.timer.start(refresh_interval)
+
+    def sizeHint(self):
+        return QSize(400, 300)
+
+    def add_lane(
+        self,
+        name: str,
+        channels: list[tuple[str, QColor]],
+        y_range: tuple[float, float] | None = None,
+    ):
+        """
+        Add a strip showing one or more channels on a shared y axis.
+
+        Args:
+            name: Label drawn in the corner of the strip
+            channels: (channel name, line color) pairs
+            y_range: Fixed (min, max), or None to fit the visible data
+        """
+        lane = _Lane(name, y_range)
+        for channel, color in channels:
+            lane.channels.append(channel)
+            self._buffers[channel] = RingBuffer(self.capacity)
+            self._columns[channel] = _ColumnCache(self._buffers[channel])
+            self._pens[channel] = QPen(color, 1)
+        self._lanes.append(lane)
+
+    def add_sample(self, channel: str, value: float, timestamp: float | None = None):
+        """Record a sample, timestamp defaults to time.monotonic()"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self._buffers[channel].append(timestamp, value)
+        self._appended += 1
+
+    def _on_refresh(self):
+        if self._appended != self._seen_total:
+            self._seen_total = self._appended
+            self.update()
+            return
+
+        # Keep scrolling while old samples are still on screen
+        t0 = time.monotonic() - self.window
+        for buffer in self._buffers.values():
+            last = buffer.last()
+            if last is not None and last[0] >= t0:
+                self.update()
+                return
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        width = self.width()
+        if not self._lanes or width <= 0:
+            return
+
+        # One bucket per pixel column, aligned to absolute time
+        bucket_width = self.window / width
+        last_bucket = int(time.monotonic() // bucket_width)
+        first_bucket = last_bucket - width + 1
+        lane_height = self.height() / len(self._lanes)
+
+        painter.fillRect(self.rect(), self.palette().base())
+        grid_pen = QPen(self.palette().mid().color(), 1)
+        text_pen = QPen(self.palette().text().color())
+
+        for index, lane in enumerate(self._lanes):
+            top = index * lane_height
+            bottom = top + lane_height - 1
+
+            painter.setPen(grid_pen)
+            painter.drawLine(QPointF(0, bottom), QPointF(width, bottom))
+
+            decimated = {}
+            for channel in lane.channels:
+                cache = self._columns[channel]
+                cache.update(bucket_width, first_bucket)
+                if len(cache.buckets):
+                    decimated[channel] = (
+                        (cache.buckets - first_bucket).astype(np.float64),
+                        cache.minimums,
+                        cache.maximums,
+                    )
+
+            if lane.y_range is not None:
+                low, high = lane.y_range
+            elif decimated:
+                low = min(float(d[1].min()) for d in decimated.values())
+                high = max(float(d[2].max()) for d in decimated.values())
+            else:
+                low, high = (0.0, 1.0)
+            if high - low < 1e-9:
+                low -= 0.5
+                high += 0.5
+
+            scale = (lane_height - 4) / (high - low)
+            for channel, (columns, minimums, maximums) in decimated.items():
+                y_min = bottom - 2 - (minimums - low) * scale
+                y_max = bottom - 2 - (maximums - low) * scale
+                painter.setPen(self._pens[channel])
+                painter.drawPolyline(_min_max_polyline(columns, y_min, y_max))
+
+            painter.setPen(text_pen)
+            painter.drawText(
+                QPointF(4, top + 14), f"{lane.name}  [{low:.3g}, {high:.3g}]"
+            )
+
+        painter.end()
+
+    def clear(self):
+        for buffer in self._buffers.values():
+            buffer.clear()
+        self.update()
@@ -0,0 +1,236 @@
+"""
+Fans the supervisor's packets and derived state out to any number of
+local dashboard clients, as JSON lines over TCP or a Unix socket.
+
+Every line is one message:
+    {"t": 12.5, "dir": "rx", "packet": "SENSOR_DATA", "payload": "00ff..."}
+    {"t": 12.5, "state": {"everted_length": 0.42, ...}}
+where t is time.monotonic() on the supervisor. Clients only read, and
+are disconnected when they fall too far behind.
+"""
+
+import asyncio
+import errno
+import json
+import os
+import stat
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from src.packet_protocol import PacketParser
+
+
+def _remove_stale_socket(path: str):
+    """
+    Remove a socket left over from an earlier run at `path`
+
+    Raises:
+        OSError: Something other than a socket is there
+    """
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(errno.EEXIST, "Exists and is not a socket", path)
+    os.unlink(path)
+
+
+class _Subscriber(asyncio.Protocol):
+    def __init__(self, server: "TelemetryServer"):
+        self.server = server
+        self.transport: asyncio.WriteTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        assert isinstance(transport, asyncio.WriteTransport)
+        self.transport = transport
+        self.server.subscribers.add(self)
+
+    def connection_lost(self, exc: Exception | None):
+        self.server.subscribers.discard(self)
+
+    def data_received(self, data: bytes):
+        pass  # Nothing is read from clients
+
+
+class TelemetryServer:
+    """
+    Publish/subscribe server on an asyncio loop, the supervisor's I/O
+    thread: the headless supervisor's own loop, or one started by
+    start_thread() next to the GUI.
+
+    publish_packet() and publish_state() are cheap and callable from any
+    thread. They only queue the message. Every flush interval the loop
+    thread serializes what was queued once into one shared frame and
+    writes that same bytes object to every subscriber, so the cost per
+    subscriber is a write per interval, not per message. A subscriber's
+    transport buffer is its bounded queue, a client with more than
+    `max_queued` bytes unsent is dropped rather than slowing the others
+    or the supervisor down. A pass encodes at most `max_batch` messages,
+    the rest follow on the next loop iteration, so serial reads sharing
+    the loop are never held up by a long backlog.
+    """
+
+    def __init__(self, max_queued: int, flush_interval: float, max_batch: int):
+        """
+        Args:
+            max_queued: Bytes queued per client before it is dropped
+            flush_interval: Seconds messages are collected before a write
+            max_batch: Messages encoded per pass of the loop
+        """
+        self.max_queued = max_queued
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.subscribers: set[_Subscriber] = set()
+        self.frames_sent = 0
+        self.messages_sent = 0
+        self.clients_dropped = 0
+
+        self._pending: deque[tuple[Any, ...]] = deque()
+        self._flush_scheduled = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+
+    async def start(self, address: str):
+        """
+        Listen on the running loop.
+
+        Args:
+            address: "host:port" for TCP, otherwise a Unix socket path
+        """
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        host, _, port = address.rpartition(":")
+        if port.isdigit():
+            self._server = await self._loop.create_server(
+                lambda: _Subscriber(self), host or "127.0.0.1", int(port)
+            )
+        else:
+            _remove_stale_socket(address)
+            self._server = await self._loop.create_unix_server(
+                lambda: _Subscriber(self), address
+            )
+
+    @property
+    def address(self) -> str:
+        """Where clients connect, "host:port" or the socket path"""
+        assert self._server is not None
+        name = self._server.sockets[0].getsockname()
+        return f"{name[0]}:{name[1]}" if isinstance(name, tuple) else name
+
+    def close(self):
+        """Stop listening and drop every client, on the loop thread"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for subscriber in list(self.subscribers):
+            assert subscriber.transport is not None
+            subscriber.transport.abort()
+        self.subscribers.clear()
+
+    def start_thread(self, address: str):
+        """
+        Run on a new I/O thread with its own loop, returns once listening.
+
+        Raises:
+            OSError: The address is not available
+        """
+        started = threading.Event()
+        failure: list[BaseException] = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start(address))
+            except OSError as e:
+                failure.append(e)
+                started.set()
+                loop.close()
+                return
+            started.set()
+            loop.run_forever()
+            self.close()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="telemetry", daemon=True)
+        self._thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+
+    def stop_thread(self):
+        """Stop the thread from start_thread()"""
+        if self._thread is None or self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def publish_packet(self, direction: str, packet_type: int, payload: bytes):
+        """Queue a packet, `direction` is "rx" (from the executor) or "tx\""""
+        if self.subscribers:
+            self._queue((time.monotonic(), direction, packet_type, payload))
+
+    def publish_state(self, state: dict[str, Any]):
+        """Queue derived state, values must be JSON serializable"""
+        if self.subscribers:
+            self._queue((time.monotonic(), state))
+
+    def _queue(self, message: tuple[Any, ...]):
+        self._pending.append(message)
+        if self._flush_scheduled or self._loop is None:
+            return
+        self._flush_scheduled = True
+        if threading.get_ident() == self._loop_thread:
+            self._loop.call_later(self.flush_interval, self._flush)
+        else:
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, self.flush_interval, self._flush
+            )
+
+    def _flush(self):
+        # Cleared before draining, a message queued meanwhile schedules a new pass
+        self._flush_scheduled = False
+        pending = self._pending
+        lines = [
+            _encode(pending.popleft()) for _ in range(min(len(pending), self.max_batch))
+        ]
+        if pending:
+            assert self._loop is not None
+            self._flush_scheduled = True
+            self._loop.call_soon(self._flush)
+        if not lines or not self.subscribers:
+            return
+
+        frame = "".join(lines).encode()
+        self.frames_sent += 1
+        self.messages_sent += len(lines)
+        for subscriber in list(self.subscribers):
+            transport = subscriber.transport
+            assert transport is not None
+            if transport.get_write_buffer_size() + len(frame) > self.max_queued:
+                self.clients_dropped += 1
+                transport.abort()
+            else:
+                transport.write(frame)
+
+
+# Type names are plain identifiers, packet lines are formatted directly
+# rather than through json.dumps, about four times faster
+_TYPE_NAMES = [PacketParser.type_name(packet_type) for packet_type in range(256)]
+
+
+def _encode(message: tuple[Any, ...]) -> str:
+    if len(message) == 2:
+        timestamp, state = message
+        return json.dumps({"t": round(timestamp, 6), "state": state}) + "\n"
+    timestamp, direction, packet_type, payload = message
+    return (
+        f'{{"t": {timestamp:.6f}, "dir": "{direction}", '
+        f'"packet": "{_TYPE_NAMES[packet_type]}", "payload": "{payload.hex()}"}}\n'
+    )
@@ -1,18 +1,47 @@
+import math
+import os
 import sys
-from datetime import datetime
+import time
 from enum import Enum
 
+import numpy as np
 from PyQt6 import QtWidgets
-from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor, QKeySequence, QShortcut
 
 from generated_ui.main import Ui_MainWindow
-from src import config
+from src import config, options
+from src.clock_sync import ClockSync
 from src.control import cartesian_to_polar, controller_to_spool, controller_to_tendon
 from src.input import Axes, Buttons, ControllerThread
-from src.packet_protocol import PacketBuilder, PacketParser, PacketStream, PacketType
-from src.serial_manager import SerialConfig, SerialManager
+from src.link_speed import LinkSpeedNegotiator, LinkSpeedState
+from src.log_view import PacketLogView
+from src.loop_monitor import EventLoopMonitor
+from src.metrics import MetricsRegistry, MetricsServer, Samples
+from src.motor_model import ExecutorModel
+from src.notifications import NotificationCenter, NotificationLevel
+from src.odometry import SpoolOdometry
+from src.packet_log import PacketDirection, PacketLog
+from src.packet_protocol import (
+    Framing,
+    Integrity,
+    PacketBuilder,
+    PacketParser,
+    PacketType,
+)
+from src.packet_stream import PacketStream
+from src.param_mirror import ParameterMirror
+from src.presenter import UiPresenter
+from src.profiling import Profiler
+from src.remote_input import RemoteControllerThread
+from src.scheduler import ControlLoop
+from src.sensors import SENSOR_SPECS, SENSORS, SensorHub, aggregate, parse_rates
+from src.serial_manager import PortScanner, SerialConfig, SerialManager
+from src.setpoints import SetpointEncoding
 from src.steering_widget import RobotSteeringWidget
+from src.telemetry_plot import TelemetryPlot
+from src.telemetry_server import TelemetryServer
+from src.watchdog import LinkWatchdog
 
 
 class ControllerStatus(str, Enum):
@@ -24,6 +53,7 @@ class McuConnectionStatus(str, Enum):
     DISCONNECTED = "disconnected"
     CONNECTING = "connecting"
     CONNECTED = "connected"
+    DEGRADED = "degraded"
 
 
 class ActivationStatus(str, Enum):
@@ -32,12 +62,45 @@ class ActivationStatus(str, Enum):
 
 
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
-    def __init__(self, *args, obj=None, **kwargs):
+    def __init__(
+        self,
+        *args,
+        obj=None,
+        profiler: Profiler | None = None,
+        metrics_port: int | None = None,
+        telemetry_address: str | None = None,
+        remote_input: str | None = None,
+        remote_pilot: str = "",
+        remote_key: bytes = b"",
+        sensor_rates: dict[int, int] | None = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         # Load the generated UI
         self.setupUi(self)
         self.setWindowTitle("Vine Robot Supervisor")
 
+        # Errors are collected here instead of popping up dialogs
+        self.notifications = NotificationCenter(
+            config.NOTIFICATION_HISTORY,
+            config.NOTIFICATION_REFRESH_INTERVAL,
+            self.notificationList,
+            self.statusbar,
+        )
+        self.notifications.changed.connect(self.on_notifications_changed)
+        self.notificationClearBtn.clicked.connect(self.notifications.clear)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        # Set up the serial log
+        self.packet_log = PacketLog()
+        self.packet_log_view = PacketLogView(
+            self.serialLog,
+            self.packet_log,
+            config.LOG_REFRESH_INTERVAL,
+            self.logTypeFilter,
+            self.logDirectionFilter,
+        )
+
         # Set up MCU communication
         self.serial_mgr = SerialManager(auto_decode=False, add_newline=False)
         self.serial_mgr.error_occurred.connect(self.on_error)
@@ -50,13 +113,46 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.mcuStatusBtn.clicked.connect(self.mcu_connect_btn)
         self.mcuSearchBtn.clicked.connect(self.mcu_search)
 
-        self.mcu_search()
+        # Ports are listed once the window is up, enumerating them can be slow
+        self.port_scanner = PortScanner()
+        self.port_scanner.ports_found.connect(self.on_ports_found)
+        QTimer.singleShot(0, self.mcu_search)
+
+        # Keep checking the link once connected
+        self.link_watchdog = LinkWatchdog(
+            config.HEARTBEAT_INTERVAL,
+            config.HEARTBEAT_CHECK_INTERVAL,
+            config.HEARTBEAT_LATENCY_LIMIT,
+            config.STATUS_GAP_LIMIT,
+            config.HEARTBEAT_RECOVERY_TIME,
+        )
+        self.link_watchdog.ping_due.connect(self.on_heartbeat)
+        self.link_watchdog.degraded.connect(self.on_link_degraded)
+        self.link_watchdog.recovered.connect(self.on_link_recovered)
+        self.link_watchdog.health_updated.connect(self.on_link_health)
+        self.link_watchdog.start()
+
+        # How promptly the event loop gets to readyRead, input and timers
+        self.loop_monitor = EventLoopMonitor(
+            config.LOOP_LAG_INTERVAL,
+            config.LOOP_LAG_WINDOW,
+            config.LOOP_STALL_LIMIT,
+            config.LOOP_LAG_REPORT_INTERVAL,
+        )
+        self.loop_monitor.lag_updated.connect(self.on_loop_lag)
+        self.loop_monitor.stalled.connect(self.on_loop_stall)
 
         # Set up status bar
         self.statusbar_activation = QtWidgets.QLabel()
         self.statusbar_mcu_connection = QtWidgets.QLabel()
         self.statusbar_controller_connection = QtWidgets.QLabel()
+        self.statusbar_everted_length = QtWidgets.QLabel()
+        self.statusbar_link_health = QtWidgets.QLabel()
+        self.statusbar_loop_lag = QtWidgets.QLabel()
 
+        self.statusbar.addPermanentWidget(self.statusbar_everted_length)
+        self.statusbar.addPermanentWidget(self.statusbar_loop_lag)
+        self.statusbar.addPermanentWidget(self.statusbar_link_health)
         self.statusbar.addPermanentWidget(self.statusbar_activation)
         self.statusbar.addPermanentWidget(self.statusbar_mcu_connection)
         self.statusbar.addPermanentWidget(self.statusbar_controller_connection)
@@ -95,6 +191,42 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self.on_tendon_speed_slider_update
         )
 
+        # Parameters are only sent when they differ from the executor's
+        self.param_mirror = ParameterMirror(config.PARAM_COALESCE_INTERVAL)
+        self.param_mirror.send_requested.connect(self.send_params)
+        self.param_mirror.confirmed.connect(self.on_param_confirmed)
+
+        # Compact setpoints are only sent once the executor confirms it takes them
+        self.setpoint_encoding = SetpointEncoding.FLOAT32
+        self.param_mirror.set(
+            config.MCU_PRAMS.SETPOINT_ENCODING, config.SETPOINT_ENCODING
+        )
+        self.param_mirror.set(config.MCU_PRAMS.LINK_INTEGRITY, config.LINK_INTEGRITY)
+        self.param_mirror.set(config.MCU_PRAMS.LINK_FRAMING, config.LINK_FRAMING)
+        self.param_mirror.set(config.MCU_PRAMS.LINK_BAUD, config.MCU_BAUD_RATE)
+        self.tendonSpeedSettingSlider.sliderReleased.connect(self.param_mirror.flush)
+
+        # Faster baud rates are tried once the other link settings are in effect
+        self.link_speed = LinkSpeedNegotiator(
+            self.packet_stream,
+            config.MCU_BAUD_RATE,
+            config.LINK_BAUD_RATES,
+            config.LINK_PROBE_PINGS,
+            config.LINK_PROBE_WINDOW,
+            config.LINK_PROBE_PAYLOAD,
+            config.LINK_PROBE_TIMEOUT,
+            config.LINK_FALLBACK_WAIT,
+            config.LINK_ERROR_CHECK_INTERVAL,
+            config.LINK_ERROR_LIMIT,
+            config.LINK_DESYNC_PACKETS,
+        )
+        self.link_speed.rate_requested.connect(
+            lambda rate: self.param_mirror.set(config.MCU_PRAMS.LINK_BAUD, rate)
+        )
+        self.link_speed.fallback_requested.connect(self.on_link_speed_fallback)
+        self.link_speed.resync_requested.connect(self.on_link_speed_resync)
+        self.link_speed.rate_verified.connect(self.on_link_speed_verified)
+
         # Controller values
         self.left_x = 0.0
         self.left_y = 0.0
@@ -103,8 +235,22 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.left_trigger = 0.0
         self.right_trigger = 0.0
 
-        # Set up controller communication
-        self.controller_thread = ControllerThread(poll_rate=config.CONTROLLER_POLL_RATE)
+        # Set up controller communication, local or from a remote pilot
+        self.controller_thread: ControllerThread | RemoteControllerThread
+        if remote_input is not None:
+            self.controller_thread = RemoteControllerThread(
+                remote_input,
+                config.REMOTE_INPUT_DELAY,
+                config.REMOTE_INPUT_TIMEOUT,
+                remote_pilot,
+                remote_key,
+            )
+            self.controller_thread.timed_out.connect(self.on_remote_input_timeout)
+            self.controller_thread.resumed.connect(self.on_remote_input_resumed)
+        else:
+            self.controller_thread = ControllerThread(
+                poll_rate=config.CONTROLLER_POLL_RATE
+            )
         self.controller_thread.button_pressed.connect(self.on_button_pressed)
         self.controller_thread.button_released.connect(self.on_button_released)
         self.controller_thread.axis_motion.connect(self.on_axis_motion)
@@ -114,6 +260,20 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
         self.controllerStatusBtn.clicked.connect(self.controller_connect_btn)
 
+        # Control output runs at a fixed rate, independent of input events
+        self.last_stick: tuple[float, float] | None = None
+        self.last_spool_speed: float | None = None
+        self.setpoint_refresh_at = 0.0  # Monotonic time the next resend is due
+        self.pending_tendons: tuple[float, float, float] | None = None
+        self.pending_spool_speed: float | None = None
+        self.control_loop = ControlLoop(
+            config.CONTROL_POSITION_RATE, config.CONTROL_SPEED_RATE
+        )
+        self.control_loop.position_tick.connect(self.on_position_tick)
+        self.control_loop.speed_tick.connect(self.on_speed_tick)
+        self.control_loop.ticks_done.connect(self.on_control_ticks_done)
+        self.control_loop.start()
+
         # Connect settings
         self.spoolSpeedModifier = 0
         self.spoolSpeedSettingSlider.setMinimum(0)
@@ -125,11 +285,212 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.spoolSpeedProgress.setMinimum(0)
         self.spoolSpeedProgress.setMaximum(int(config.MAX_SPOOL_SPEED * 100))
 
+        # Map host time to the executor clock
+        self.clock_sync = ClockSync()
+
+        # Streamed sensor history
+        self.sensor_hub = SensorHub()
+        if sensor_rates:
+            self.sensor_hub.subscribe(sensor_rates)  # Sent once connected
+        self.last_sensor_plot_time: dict[str, float] = {}
+
+        # Track how much body has been everted and where the motors are
+        self.spool_odometry = SpoolOdometry()
+        self.executor_model = ExecutorModel()
+        self.odometry_reset_shortcut = QShortcut(QKeySequence("Ctrl+R"), self)
+        self.odometry_reset_shortcut.activated.connect(self.reset_odometry)
+
         # Set up custom widgets
         self.steering_widget = RobotSteeringWidget()
         self.tendonInfoLayout.addChildWidget(self.steering_widget)
         self.steering_widget.setMaximumSize(400, 400)
 
+        # All per-frame widget updates go through the presenter
+        self.presenter = UiPresenter(
+            (self.tendon1Progress, self.tendon2Progress, self.tendon3Progress),
+            self.steering_widget,
+            self.spoolSpeedProgress,
+            self.statusbar_everted_length,
+            config.UI_FRAME_INTERVAL,
+        )
+        self.presenter.frame.connect(self.update_estimates)
+
+        # Telemetry history
+        self.telemetry_plot = TelemetryPlot(
+            config.PLOT_WINDOW, config.PLOT_CAPACITY, config.PLOT_REFRESH_INTERVAL
+        )
+        self.telemetry_plot.add_lane(
+            "Tendons",
+            [
+                ("tendon_1", QColor(Qt.GlobalColor.red)),
+                ("tendon_2", QColor(Qt.GlobalColor.green)),
+                ("tendon_3", QColor(Qt.GlobalColor.blue)),
+            ],
+            (-config.MAX_TENDON_VALUE, config.MAX_TENDON_VALUE),
+        )
+        self.telemetry_plot.add_lane(
+            "Spool rpm",
+            [("spool", QColor(Qt.GlobalColor.darkYellow))],
+            (config.MIN_SPOOL_SPEED, config.MAX_SPOOL_SPEED),
+        )
+        self.telemetry_plot.add_lane(
+            "Tank psi",
+            [(SENSORS.TANK_PRESSURE.name, QColor(Qt.GlobalColor.darkRed))],
+            (0, 100),
+        )
+        self.telemetry_plot.add_lane(
+            "Latency ms",
+            [
+                ("rtt", QColor(Qt.GlobalColor.magenta)),
+                ("one_way", QColor(Qt.GlobalColor.darkGreen)),
+            ],
+        )
+        self.telemetry_plot.add_lane(
+            "Packets/s",
+            [
+                ("tx_rate", QColor(Qt.GlobalColor.darkCyan)),
+                ("rx_rate", QColor(Qt.GlobalColor.darkGray)),
+            ],
+        )
+        self.rightLayout.insertWidget(1, self.telemetry_plot)
+
+        self.last_packet_counts = (0, 0, time.monotonic())
+        self.packet_rate_timer = QTimer(self)
+        self.packet_rate_timer.timeout.connect(self.sample_packet_rates)
+        self.packet_rate_timer.start(config.PLOT_RATE_INTERVAL)
+        self.loop_monitor.start()
+
+        # Metrics for long test runs, scraped without involving this thread
+        self.metrics = MetricsRegistry("supervisor_")
+        self._register_metrics()
+        self.metrics_server: MetricsServer | None = None
+        if metrics_port is not None:
+            self.metrics_server = MetricsServer(
+                self.metrics, config.METRICS_HOST, metrics_port
+            )
+            try:
+                self.metrics_server.start()
+            except OSError as e:
+                self.metrics_server = None
+                self.notifications.notify(f"Metrics not served: {e}")
+
+        # Packets and state for dashboards, sent from the telemetry I/O thread
+        self.telemetry: TelemetryServer | None = None
+        if telemetry_address is not None:
+            self.telemetry = TelemetryServer(
+                config.TELEMETRY_CLIENT_QUEUE,
+                config.TELEMETRY_FLUSH_INTERVAL,
+                config.TELEMETRY_FLUSH_BATCH,
+            )
+            try:
+                self.telemetry.start_thread(telemetry_address)
+            except OSError as e:
+                self.telemetry = None
+                self.notifications.notify(f"Telemetry not served: {e}")
+
+        # Profiling hotkeys, only with --profile (see PROFILED_SLOTS)
+        self.profiler = profiler
+        if self.profiler is not None:
+            for key, slot in (
+                ("F8", self.dump_slot_profile),
+                ("F9", self.toggle_cprofile),
+                ("F10", self.snapshot_memory),
+            ):
+                QShortcut(QKeySequence(key), self).activated.connect(slot)
+
+    def _register_metrics(self):
+        # Readers run on the exporter's thread: plain values and list copies only
+        codec = self.packet_stream.codec
+        serial = self.serial_mgr
+
+        def by_type(counts: list[int]) -> Samples:
+            return [
+                ((("type", PacketParser.type_name(packet_type)),), count)
+                for packet_type, count in enumerate(counts[:])
+                if count
+            ]
+
+        metrics = self.metrics
+        metrics.collect(
+            "packets_sent_total",
+            "Packets written to the executor",
+            "counter",
+            lambda: by_type(codec.sent_by_type),
+        )
+        metrics.collect(
+            "packets_received_total",
+            "Valid packets from the executor",
+            "counter",
+            lambda: by_type(codec.received_by_type),
+        )
+        metrics.collect(
+            "packets_invalid_total",
+            "Packets from the executor that failed their check",
+            "counter",
+            lambda: [((), codec.packets_invalid)],
+        )
+        metrics.collect(
+            "serial_sent_bytes_total",
+            "Bytes written to the serial port",
+            "counter",
+            lambda: [((), serial.bytes_sent)],
+        )
+        metrics.collect(
+            "serial_received_bytes_total",
+            "Bytes read from the serial port",
+            "counter",
+            lambda: [((), serial.bytes_received)],
+        )
+        metrics.collect(
+            "serial_write_errors_total",
+            "Failed serial writes",
+            "counter",
+            lambda: [((), serial.write_errors)],
+        )
+        metrics.collect(
+            "link_connected",
+            "1 while connected to the executor",
+            "gauge",
+            lambda: [
+                (
+                    (),
+                    int(
+                        self.mcu_connection_status
+                        in (McuConnectionStatus.CONNECTED, McuConnectionStatus.DEGRADED)
+                    ),
+                )
+            ],
+        )
+        self.metric_rtt = metrics.gauge("link_rtt_seconds", "Last PING round trip")
+        self.metric_health = metrics.gauge(
+            "link_health", "Link health score, 1 fine to 0 at a limit"
+        )
+        self.metric_baud = metrics.gauge("link_baud_rate", "Serial baud rate in use")
+        self.metric_degraded = metrics.counter(
+            "link_degraded_total", "Times the link degraded and motors were stopped"
+        )
+        self.metric_errors = metrics.counter(
+            "errors_total", "Errors reported to the notifications"
+        )
+        self.loop_lag = (0.0, 0.0, 0.0)
+        metrics.summary(
+            "event_loop_lag_seconds",
+            f"GUI event loop lag, quantiles over the last {config.LOOP_LAG_WINDOW} "
+            "samples",
+            lambda: [
+                ((("quantile", quantile),), lag / 1000)
+                for quantile, lag in zip(("0.5", "0.99", "1"), self.loop_lag)
+            ],
+            lambda: self.loop_monitor.total_lag,
+            lambda: self.loop_monitor.samples,
+        )
+        metrics.collect(
+            "event_loop_stalls_total",
+            f"Event loop lags over {config.LOOP_STALL_LIMIT} s",
+            "counter",
+            lambda: [((), self.loop_monitor.stalls)],
+        )
+
     def mcu_connect_btn(self):
         if self.serial_mgr.is_connected():
             self._set_mcu_status(McuConnectionStatus.DISCONNECTED)
@@ -150,14 +511,13 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.spoolSpeedModifier = float(self.spoolSpeedSettingSlider.value()) / 100
 
     def on_tendon_speed_slider_update(self):
-        self.packet_stream.send_packet(
-            PacketType.CMD_SET_PARAM,
-            PacketBuilder.set_param(
-                config.MCU_PRAMS.TENDON_MOTOR_SPEED,
-                self.tendonSpeedSettingSlider.value(),
-            ),
+        self.param_mirror.set(
+            config.MCU_PRAMS.TENDON_MOTOR_SPEED, self.tendonSpeedSettingSlider.value()
         )
 
+    def send_params(self, payload: bytes):
+        self.packet_stream.send_packet(PacketType.CMD_SET_PARAM, payload)
+
     def controller_connect_btn(self):
         if self.controller_thread.isRunning():
             self._set_controller_status(ControllerStatus.DISCONNECTED)
@@ -166,10 +526,11 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self._set_controller_status(ControllerStatus.CONNECTED)
 
     def mcu_search(self):
-        ports = SerialManager.find_arduino_ports()
-        for i in range(self.mcuStatusCombo.count()):
-            self.mcuStatusCombo.removeItem(i)
+        if not self.port_scanner.isRunning():
+            self.port_scanner.start()
 
+    def on_ports_found(self, ports: list[str]):
+        self.mcuStatusCombo.clear()
         self.mcuStatusCombo.insertItems(0, ports)
 
     def toggle_activation_btn(self):
@@ -179,14 +540,140 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         elif self.mcu_activation_status == ActivationStatus.DISABLED:
             self._set_activation_status(ActivationStatus.ENABLED)
 
+    def update_estimates(self):
+        now = time.monotonic()
+        self.presenter.set_everted_length(self.spool_odometry.everted_length(now))
+
+        # Show where the tendon motors should be, not just where they were told to go
+        self.executor_model.advance(now)
+        tendons = self.executor_model.tendon_positions()
+        self.presenter.set_tendon_values(tendons)
+
+        if self.telemetry is not None:
+            self.telemetry.publish_state(
+                {
+                    "everted_length": float(self.spool_odometry.everted_length(now)),
+                    "tendons": [float(tendon) for tendon in tendons],
+                    "mcu": self.mcu_connection_status.value,
+                    "activation": self.mcu_activation_status.value,
+                    "link_health": self.metric_health.value,
+                    "loop_lag_p99": self.loop_lag[1],
+                }
+            )
+
+    def sample_packet_rates(self):
+        now = time.monotonic()
+        sent = self.packet_stream.packets_sent
+        received = self.packet_stream.packets_received
+        last_sent, last_received, last_time = self.last_packet_counts
+        self.last_packet_counts = (sent, received, now)
+
+        elapsed = now - last_time
+        if elapsed > 0:
+            self.telemetry_plot.add_sample("tx_rate", (sent - last_sent) / elapsed, now)
+            self.telemetry_plot.add_sample(
+                "rx_rate", (received - last_received) / elapsed, now
+            )
+
     def on_packet_sent(self, packet_type: PacketType, payload: bytes):
-        cursor = self.serialText.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.serialText.setTextCursor(cursor)
+        if self.telemetry is not None:
+            self.telemetry.publish_packet("tx", packet_type, payload)
+
+        # Keep the estimators in step with what the executor was told
+        now = time.monotonic()
+        if packet_type == PacketType.CMD_SET_SPOOL:
+            speed = PacketParser.parse_spool_speed(payload)
+            if speed is not None:
+                self.spool_odometry.set_speed(speed, now)
+                self.telemetry_plot.add_sample("spool", speed, now)
+        elif packet_type == PacketType.CMD_SET_TENDONS:
+            tendons = PacketParser.parse_tendons(payload)
+            if tendons is not None:
+                self._tendons_sent(tendons, now)
+        elif packet_type == PacketType.CMD_SET_SETPOINTS:
+            setpoints = PacketParser.parse_setpoints(payload)
+            if setpoints is not None:
+                tendons, speed = setpoints
+                if tendons is not None:
+                    self._tendons_sent(tendons, now)
+                if speed is not None:
+                    self.spool_odometry.set_speed(speed, now)
+                    self.telemetry_plot.add_sample("spool", speed, now)
+        elif packet_type == PacketType.CMD_SET_PARAM:
+            params = PacketParser.parse_params(payload)
+            if config.MCU_PRAMS.TENDON_MOTOR_SPEED in params:
+                self.executor_model.set_tendon_speed(
+                    params[config.MCU_PRAMS.TENDON_MOTOR_SPEED], now
+                )
+        elif packet_type == PacketType.CMD_START:
+            self.spool_odometry.set_running(True, now)
+            self.executor_model.set_running(True, now)
+        elif packet_type == PacketType.CMD_STOP:
+            self.spool_odometry.set_running(False, now)
+            self.executor_model.set_running(False, now)
+        elif packet_type == PacketType.PING:
+            self.link_watchdog.ping_sent(now)
+
+        self.packet_log.append(
+            PacketDirection.SENT,
+            packet_type,
+            payload,
+            time.time(),
+            self._executor_time(now),
+        )
+
+    def _tendons_sent(self, tendons: tuple[float, float, float], now: float):
+        self.executor_model.set_tendons(tendons, now)
+        for channel, value in zip(("tendon_1", "tendon_2", "tendon_3"), tendons):
+            self.telemetry_plot.add_sample(channel, value, now)
+
+    def on_param_confirmed(self, param_id: int, value: float):
+        # The executor switched the link settings right after sending the report
+        if param_id == config.MCU_PRAMS.SETPOINT_ENCODING:
+            self.setpoint_encoding = SetpointEncoding(value)
+        elif param_id == config.MCU_PRAMS.LINK_INTEGRITY:
+            self.packet_stream.set_integrity(Integrity(value))
+        elif param_id == config.MCU_PRAMS.LINK_FRAMING:
+            self.packet_stream.set_framing(Framing(value))
+        elif param_id == config.MCU_PRAMS.LINK_BAUD:
+            if value != self.serial_mgr.get_baud_rate():
+                self.serial_mgr.set_baud_rate(value)
+                self.packet_stream.clear_buffer()  # Read at the wrong rate
+            self.link_speed.confirmed(value)
 
-        # Update the serial text stream
-        self.serialText.insertPlainText(
-            f"[{datetime.now().strftime('%H:%M:%S.%f')}] -> {PacketType(packet_type).name} {payload.hex(' ')}\n"
+        if (
+            self.link_speed.state == LinkSpeedState.IDLE
+            and self.mcu_connection_status
+            in (McuConnectionStatus.CONNECTED, McuConnectionStatus.DEGRADED)
+            and self.param_mirror.settled()
+        ):
+            self.link_speed.start(self.serial_mgr.get_baud_rate())
+
+    def _reset_link(self):
+        """Back to the settings every executor session starts with"""
+        self.setpoint_encoding = SetpointEncoding.FLOAT32
+        self.packet_stream.set_integrity(Integrity.XOR)
+        self.packet_stream.set_framing(Framing.START_BYTE)
+        self.serial_mgr.set_baud_rate(config.MCU_BAUD_RATE)
+        self.packet_stream.clear_buffer()
+
+    def on_link_speed_fallback(self, reason: str):
+        # The executor goes back to the base settings after a second of nothing valid
+        self.param_mirror.set_online(False)
+        self._reset_link()
+        self.notifications.notify(
+            f"Link falling back to the base settings: {reason}",
+            NotificationLevel.WARNING,
+        )
+
+    def on_link_speed_resync(self):
+        if self.serial_mgr.is_connected():
+            self.param_mirror.set_online(True)
+            self.packet_stream.send_packet(PacketType.CMD_GET_PARAM)
+
+    def on_link_speed_verified(self, rate: int, round_trips: float, goodput: float):
+        self.statusbar_link_health.setToolTip(
+            f"{rate} baud: {round_trips:.0f} round trips/s, {goodput / 1000:.1f} kB/s"
         )
 
     def on_packet_received(self, packet_type: PacketType, payload: bytes):
@@ -194,13 +681,34 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         Run every time a packet is retrieved from the MCU
         """
 
-        cursor = self.serialText.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.serialText.setTextCursor(cursor)
+        if self.telemetry is not None:
+            self.telemetry.publish_packet("rx", packet_type, payload)
 
-        # Update the serial text stream
-        self.serialText.insertPlainText(
-            f"[{datetime.now().strftime('%H:%M:%S.%f')}] <- {PacketType(packet_type).name} {payload.hex(' ')}\n"
+        now = time.monotonic()
+        if packet_type == PacketType.PONG:
+            rtt = self.link_watchdog.pong_received(now)
+            if rtt is not None:
+                self.metric_rtt.set(rtt)
+                self.clock_sync.add_rtt(rtt)
+                self.telemetry_plot.add_sample("rtt", rtt * 1000, now)
+        elif packet_type == PacketType.STATUS_UPDATE:
+            self.link_watchdog.status_received(now)
+            status = PacketParser.parse_status_update(payload)
+            if status is not None:
+                resets = self.clock_sync.resets
+                self.clock_sync.add_uptime(status.uptime, now)
+                if self.clock_sync.resets != resets:
+                    self.on_executor_reset()
+                latency = self.clock_sync.one_way_latency(status.uptime, now)
+                self.telemetry_plot.add_sample("one_way", latency * 1000, now)
+
+        # Update the serial log, the view catches up on its next refresh
+        self.packet_log.append(
+            PacketDirection.RECEIVED,
+            packet_type,
+            payload,
+            time.time(),
+            self._executor_time(now),
         )
 
         # Handle the packet
@@ -211,10 +719,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self._set_mcu_status(McuConnectionStatus.CONNECTED)
             return
 
-        elif packet_type == PacketType.PONG:
-            return
-
-        elif packet_type == PacketType.ACK:
+        elif packet_type in (PacketType.PONG, PacketType.ACK):
             return
 
         elif packet_type == PacketType.PING:
@@ -226,13 +731,162 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self.mcu_mode = status.mode
                 self.mcu_state = status.state
 
+        elif packet_type == PacketType.SENSOR_DATA:
+            self.on_sensor_data(payload)
+
+        elif packet_type == PacketType.PARAM_REPORT:
+            self.param_mirror.confirm(PacketParser.parse_params(payload))
+
+        elif packet_type == PacketType.NACK:
+            if payload[:1] == bytes([PacketType.CMD_SET_SETPOINTS]):
+                # The executor lost the negotiated encoding, e.g. after a reset
+                self.setpoint_encoding = SetpointEncoding.FLOAT32
+                self.last_stick = None
+                self.last_spool_speed = None
+                self.on_error("Executor refused compact setpoints, sending floats")
+                # Its report lets the mirror negotiate the encoding again
+                self.packet_stream.send_packet(PacketType.CMD_GET_PARAM)
+            elif payload[:1] == bytes([PacketType.CMD_SET_PARAM]):
+                self.param_mirror.reject()
+                self.link_speed.rejected()
+                self.on_error("Executor refused the parameter upload")
+
+        elif packet_type == PacketType.ERROR_REPORT:
+            code = payload[0] if payload else 0xFF
+            if code == config.EXECUTOR_ERRORS.HEARTBEAT_TIMEOUT:
+                self.on_error("Executor stopped the motors: heartbeat timed out")
+            else:
+                self.on_error(f"Executor error report: 0x{code:02X}")
+
         else:
             self.packet_stream.send_packet(PacketType.NACK, PacketBuilder.nack(0xFF))
 
+    def on_heartbeat(self):
+        if self.serial_mgr.is_connected():
+            self.packet_stream.send_packet(PacketType.PING, PacketBuilder.ping(), False)
+
+    def on_link_degraded(self, reason: str):
+        # Stop first, then tell the operator
+        self.packet_stream.send_packet(PacketType.CMD_STOP, throw_error=False)
+        if self.mcu_activation_status == ActivationStatus.ENABLED:
+            self._set_activation_status(ActivationStatus.DISABLED)
+        self._set_mcu_status(McuConnectionStatus.DEGRADED)
+        self.metric_degraded.inc()
+        self.notifications.notify(
+            f"Link degraded, motors stopped: {reason}", NotificationLevel.WARNING
+        )
+        # The executor may have dropped the negotiated settings meanwhile
+        if self.serial_mgr.is_connected():
+            self.link_speed.resync()
+
+    def reset_odometry(self):
+        """Zero the everted length, e.g. after re-spooling the body"""
+        self.spool_odometry.reset()
+        self.notifications.notify("Everted length reset", NotificationLevel.INFO)
+
+    def on_executor_reset(self):
+        """The executor restarted mid-session: motors zeroed, sensor streams dropped"""
+        self.notifications.notify("The executor restarted", NotificationLevel.WARNING)
+        self.executor_model.reset()
+        self.spool_odometry.set_running(False, time.monotonic())
+        if self.sensor_hub.rates:
+            self.packet_stream.send_packet(
+                PacketType.CMD_SUBSCRIBE, self.sensor_hub.resubscribe()
+            )
+
+    def on_remote_input_timeout(self):
+        # The axes are already back at rest, stop the motors as well
+        if self.mcu_activation_status == ActivationStatus.ENABLED:
+            self._set_activation_status(ActivationStatus.DISABLED)
+        self.notifications.notify(
+            "Remote input lost, motors stopped", NotificationLevel.WARNING
+        )
+
+    def on_remote_input_resumed(self):
+        self.notifications.notify("Remote input received", NotificationLevel.INFO)
+
+    def on_link_recovered(self):
+        if self.mcu_connection_status == McuConnectionStatus.DEGRADED:
+            self._set_mcu_status(McuConnectionStatus.CONNECTED)
+            self.notifications.notify(
+                "Link recovered, re-enable to continue", NotificationLevel.INFO
+            )
+
+    def on_link_health(self, score: float, latency: float, gap: float):
+        baud_rate = self.serial_mgr.get_baud_rate()
+        self.metric_health.set(score)
+        self.metric_baud.set(baud_rate)
+        self.statusbar_link_health.setText(
+            f"Link: {score * 100:.0f}% ({latency * 1000:.0f} ms, "
+            f"{baud_rate // 1000} kBd)"
+        )
+
+    def on_loop_lag(self, p50: float, p99: float, worst: float):
+        self.loop_lag = (p50, p99, worst)
+        self.statusbar_loop_lag.setText(f"Loop: {p99:.1f} ms")
+        tooltip = (
+            f"Event loop lag p50 {p50:.1f} ms, p99 {p99:.1f} ms, max {worst:.1f} ms"
+        )
+        if self.loop_monitor.last_stall is not None:
+            lag, slot = self.loop_monitor.last_stall
+            tooltip += f"\nLast stall {lag * 1000:.0f} ms in {slot}"
+        self.statusbar_loop_lag.setToolTip(tooltip)
+
+    def on_loop_stall(self, lag: float, slot: str):
+        self.notifications.notify(
+            f"Event loop stalled: {lag * 1000:.0f} ms in {slot}",
+            NotificationLevel.WARNING,
+        )
+
+    def on_sensor_data(self, payload: bytes):
+        now = time.monotonic()
+        stored = self.sensor_hub.handle_sensor_data(payload, self._executor_time(now))
+        if stored is None:
+            return
+        sensor_id, times, values = stored
+
+        # Plot a min/max envelope at display rate instead of every sample
+        finite = np.isfinite(values) & np.isfinite(times)
+        starts, _, minimums, maximums = aggregate(
+            times[finite], values[finite], config.SENSOR_DISPLAY_INTERVAL
+        )
+        if len(starts) == 0:
+            return
+        if self.clock_sync.ready:
+            host_times = np.array([self.clock_sync.to_host(t) for t in starts])
+        else:
+            host_times = now - (times[-1] - starts)
+
+        # Refitting the clock can move times back a little, the plot needs them in order
+        channel = SENSOR_SPECS[sensor_id].name
+        host_times = np.maximum(
+            host_times, self.last_sensor_plot_time.get(channel, 0.0)
+        )
+        self.last_sensor_plot_time[channel] = float(host_times[-1])
+        for host_time, low, high in zip(host_times, minimums, maximums):
+            self.telemetry_plot.add_sample(channel, low, host_time)
+            self.telemetry_plot.add_sample(channel, high, host_time)
+
+    def _executor_time(self, host_time: float) -> float:
+        if not self.clock_sync.ready:
+            return math.nan
+        return self.clock_sync.to_executor(host_time)
+
     def on_error(self, text: str):
-        msgBox = QtWidgets.QMessageBox()
-        msgBox.setText(text)
-        msgBox.exec()
+        self.metric_errors.inc()
+        self.notifications.notify(text)
+
+    def on_notifications_changed(self, unseen: int):
+        if self.tabs.currentWidget() is self.notificationTab:
+            if unseen:
+                self.notifications.mark_seen()
+            unseen = 0
+        title = f"Notifications ({unseen})" if unseen else "Notifications"
+        self.tabs.setTabText(self.tabs.indexOf(self.notificationTab), title)
+
+    def on_tab_changed(self, index: int):
+        if self.tabs.widget(index) is self.notificationTab:
+            self.notifications.mark_seen()
 
     def on_button_pressed(self, button_id: int):
         if button_id == Buttons.LOGO:
@@ -284,46 +938,130 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             elif axis_id == Axes.RIGHT_Y:
                 self.right_y = 0
 
-        if (
+    def _is_driving(self) -> bool:
+        return (
             self.mcu_connection_status == McuConnectionStatus.CONNECTED
             and self.mcu_activation_status == ActivationStatus.ENABLED
-        ):
-            if axis_id == Axes.LEFT_X or axis_id == Axes.LEFT_Y:
-                tendon_values = tuple(
-                    float(i)
-                    for i in controller_to_tendon(
-                        round(self.left_x, 5), round(self.left_y, 5)
-                    )
-                )
-                self.packet_stream.send_packet(
-                    PacketType.CMD_SET_TENDONS,
-                    PacketBuilder.set_tendons(*tendon_values),
-                )
-                self.steering_widget.setTendonValues(*tendon_values)
-                self.steering_widget.setSteering(
-                    *cartesian_to_polar(self.left_x, self.left_y)
-                )
+        )
 
-                self.tendon1Progress.setValue(int(tendon_values[0] * 100))
-                self.tendon2Progress.setValue(int(tendon_values[1] * 100))
-                self.tendon3Progress.setValue(int(tendon_values[2] * 100))
+    def on_position_tick(self):
+        if not self._is_driving():
+            return
 
-            elif axis_id == Axes.LEFT_TRIGGER or axis_id == Axes.RIGHT_TRIGGER:
-                speed = controller_to_spool(
-                    round(self.left_trigger, 2),
-                    round(self.right_trigger, 2),
-                    self.spoolSpeedModifier,
-                )
-                self.spoolSpeedProgress.setValue(int(abs(speed) * 100))
-                self.spoolSpeedProgress.setFormat(f"{speed:.2f} rpm")
-                self.packet_stream.send_packet(
-                    PacketType.CMD_SET_SPOOL, PacketBuilder.set_spool_speed(speed)
-                )
+        left_x = round(self.left_x, 5)
+        left_y = round(self.left_y, 5)
+        if (left_x, left_y) == self.last_stick:
+            return
+        self.last_stick = (left_x, left_y)
+
+        self.pending_tendons = tuple(
+            float(i) for i in controller_to_tendon(left_x, left_y)
+        )
+        self.presenter.set_steering(*cartesian_to_polar(left_x, left_y))
+
+    def on_speed_tick(self):
+        if not self._is_driving():
+            return
+
+        try:
+            speed = controller_to_spool(
+                round(self.left_trigger, 2),
+                round(self.right_trigger, 2),
+                self.spoolSpeedModifier,
+            )
+        except ValueError:
+            # Both triggers held, keep the last command until one is released
+            return
+
+        if speed == self.last_spool_speed:
+            return
+        self.last_spool_speed = speed
+
+        self.pending_spool_speed = speed
+        self.presenter.set_spool_speed(speed)
+
+    def on_control_ticks_done(self):
+        """Send the setpoints the ticks computed, in one packet if negotiated"""
+        tendons, speed = self.pending_tendons, self.pending_spool_speed
+        self.pending_tendons = None
+        self.pending_spool_speed = None
+
+        now = time.monotonic()
+        if now >= self.setpoint_refresh_at:
+            # Setpoints are not acknowledged, so the next ticks send them even
+            # if unchanged, a dropped frame would otherwise hold a stale target
+            self.setpoint_refresh_at = now + config.SETPOINT_REFRESH_INTERVAL
+            self.last_stick = None
+            self.last_spool_speed = None
+
+        if tendons is None and speed is None:
+            return
+
+        if self.setpoint_encoding == SetpointEncoding.INT16:
+            self.packet_stream.send_packet(
+                PacketType.CMD_SET_SETPOINTS,
+                PacketBuilder.set_setpoints(tendons, speed),
+            )
+            return
+
+        if tendons is not None:
+            self.packet_stream.send_packet(
+                PacketType.CMD_SET_TENDONS, PacketBuilder.set_tendons(*tendons)
+            )
+        if speed is not None:
+            self.packet_stream.send_packet(
+                PacketType.CMD_SET_SPOOL, PacketBuilder.set_spool_speed(speed)
+            )
+
+    def dump_slot_profile(self):
+        assert self.profiler is not None
+        path = self.profiler.dump_histograms()
+        self.notifications.notify(
+            f"Slot timings written: {path}", NotificationLevel.INFO
+        )
+
+    def toggle_cprofile(self):
+        assert self.profiler is not None
+        path = self.profiler.toggle_cprofile()
+        if path is None:
+            self.notifications.notify(
+                "cProfile started, F9 again to stop", NotificationLevel.INFO
+            )
+        else:
+            self.notifications.notify(
+                f"cProfile written: {path}", NotificationLevel.INFO
+            )
+
+    def snapshot_memory(self):
+        assert self.profiler is not None
+        path = self.profiler.snapshot_memory()
+        if path is None:
+            self.notifications.notify(
+                "Tracing allocations, F10 again for a snapshot", NotificationLevel.INFO
+            )
+        else:
+            self.notifications.notify(
+                f"Memory snapshot written: {path}", NotificationLevel.INFO
+            )
 
     def closeEvent(self, a0):
         """Clean up when window closes."""
+        self.control_loop.stop()
+        self.loop_monitor.stop()
+        self.loop_monitor.wait()
+        self.link_watchdog.stop()
+        self.link_watchdog.wait()
         self.controller_thread.stop()
         self.controller_thread.wait()
+        self.port_scanner.wait()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.telemetry is not None:
+            self.telemetry.stop_thread()
+        if self.profiler is not None:
+            self.profiler.stop()
+            print(self.profiler.report())
+            print(f"Slot timings written: {self.profiler.dump_histograms()}")
         a0.accept()
 
     def _set_mcu_status(self, status: McuConnectionStatus, visual_only: bool = False):
@@ -332,6 +1070,16 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self.packet_stream.send_packet(PacketType.CMD_STOP)
                 self.serial_mgr.disconnect()
                 self.mcu_connection_status = McuConnectionStatus.DISCONNECTED
+                self.link_watchdog.disarm()
+                self.link_speed.stop()
+                self.param_mirror.set_online(False)
+                self.clock_sync.reset()  # The executor restarts on reconnect
+                self.executor_model.reset()
+                # Start the next session at the base rate and negotiate again
+                self.param_mirror.set(config.MCU_PRAMS.LINK_BAUD, config.MCU_BAUD_RATE)
+                self._reset_link()
+            self.statusbar_link_health.setText("")
+            self.statusbar_link_health.setToolTip("")
 
             self.activationButton.setStyleSheet(
                 " QPushButton { background-color: red; } "
@@ -365,6 +1113,14 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
         elif status == McuConnectionStatus.CONNECTED:
             if not visual_only:
+                if self.mcu_connection_status == McuConnectionStatus.CONNECTING:
+                    self.link_watchdog.arm()
+                    self.param_mirror.set_online(True)
+                    self.packet_stream.send_packet(PacketType.CMD_GET_PARAM)
+                    if self.sensor_hub.rates:
+                        self.packet_stream.send_packet(
+                            PacketType.CMD_SUBSCRIBE, self.sensor_hub.resubscribe()
+                        )
                 self.mcu_connection_status = McuConnectionStatus.CONNECTED
                 self.mcu_connect_timer.stop()
 
@@ -374,6 +1130,16 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             self.statusbar_mcu_connection.setText("MCU: Connected")
             self.statusbar_mcu_connection.setStyleSheet(" QLabel { color: green; } ")
 
+        elif status == McuConnectionStatus.DEGRADED:
+            if not visual_only:
+                self.mcu_connection_status = McuConnectionStatus.DEGRADED
+
+            self.mcuStatusInfo.setText("Degraded")
+            self.mcuStatusInfo.setStyleSheet(" QLineEdit { color: orange; } ")
+
+            self.statusbar_mcu_connection.setText("MCU: Degraded")
+            self.statusbar_mcu_connection.setStyleSheet(" QLabel { color: orange; } ")
+
     def _set_controller_status(
         self, status: ControllerStatus, visual_only: bool = False
     ):
@@ -408,17 +1174,34 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             else:
                 if not visual_only:
                     self.controller_thread.stop()
-                    self.on_error("Failed to connect to controller")
+                    reason = getattr(self.controller_thread, "error", "")
+                    self.on_error(
+                        "Failed to connect to controller"
+                        + (f": {reason}" if reason else "")
+                    )
 
     def _set_activation_status(
         self, status: ActivationStatus, visual_only: bool = False
     ):
+        if (
+            not visual_only
+            and status == ActivationStatus.ENABLED
+            and self.mcu_connection_status == McuConnectionStatus.DEGRADED
+        ):
+            self.on_error("Failed to enable: the link to the MCU is degraded")
+            return
+
         if (
             not visual_only
             and self.mcu_connection_status != McuConnectionStatus.CONNECTED
         ):
             self.on_error("Failed to change activation state: MCU is not connected")
 
+        if not visual_only:
+            # Make the next control tick resend everything
+            self.last_stick = None
+            self.last_spool_speed = None
+
         if status == ActivationStatus.DISABLED:
             if not visual_only:
                 self.mcu_activation_status = ActivationStatus.DISABLED
@@ -450,11 +1233,57 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             )
 
 
+# Slots timed when profiling, the serial receive path, controller input
+# and the most expensive paint
+PROFILED_SLOTS = (
+    (MainWindow, "on_axis_motion"),
+    (MainWindow, "on_packet_received"),
+    (MainWindow, "on_packet_sent"),
+    (PacketStream, "on_data_received"),
+    (SerialManager, "_on_ready_read"),
+    (RobotSteeringWidget, "paintEvent"),
+)
+
+
 def run():
+    profiler = None
+    profile = options.requested(sys.argv, config.PROFILE_ENV, config.PROFILE_FLAG, "1")
+    if profile not in (None, "0"):
+        # Before anything is constructed, connect() keeps the unwrapped slots
+        profiler = Profiler(config.PROFILE_DIR)
+        for cls, name in PROFILED_SLOTS:
+            profiler.instrument(cls, name)
+
     app = QtWidgets.QApplication(sys.argv)
     app.setApplicationName("Stem Research 2025-2026")
 
-    window = MainWindow()
+    metrics_port = options.requested(
+        sys.argv, config.METRICS_ENV, config.METRICS_FLAG, str(config.METRICS_PORT)
+    )
+    telemetry_address = options.requested(
+        sys.argv, config.TELEMETRY_ENV, config.TELEMETRY_FLAG, config.TELEMETRY_ADDRESS
+    )
+    sensor_stream = options.requested(
+        sys.argv,
+        config.SENSOR_STREAM_ENV,
+        config.SENSOR_STREAM_FLAG,
+        config.SENSOR_STREAM_RATES,
+    )
+    remote_input = options.requested(
+        sys.argv,
+        config.REMOTE_INPUT_ENV,
+        config.REMOTE_INPUT_FLAG,
+        config.REMOTE_INPUT_ADDRESS,
+    )
+    window = MainWindow(
+        profiler=profiler,
+        metrics_port=int(metrics_port) if metrics_port else None,
+        telemetry_address=telemetry_address,
+        remote_input=remote_input,
+        remote_pilot=os.environ.get(config.REMOTE_INPUT_PILOT_ENV, ""),
+        remote_key=os.environ.get(config.REMOTE_INPUT_KEY_ENV, "").encode(),
+        sensor_rates=parse_rates(sensor_stream) if sensor_stream else None,
+    )
     window.show()
 
     app.exec()
@@ -0,0 +1,180 @@
+import threading
+import time
+from enum import Enum
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class LinkState(str, Enum):
+    IDLE = "idle"  # Not monitoring, e.g. while disconnected
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+
+
+class LinkWatchdog(QThread):
+    """
+    Monitors the link to the executor from its own thread.
+
+    While armed it asks for a PING every heartbeat interval and tracks
+    PONG latency (including how long the oldest PING has gone
+    unanswered) and the time since the last STATUS_UPDATE. These are
+    combined into a health score from 1 (fine) to 0 (at a limit). The
+    checks run here rather than on a QTimer, so a busy GUI thread shows
+    up as latency instead of delaying the check that notices it.
+
+    The GUI thread reports packets with ping_sent, pong_received and
+    status_received, which only take a lock and store a timestamp.
+
+    Signals:
+        ping_due(): Time to send a PING
+        degraded(str): A limit was exceeded, with the reason
+        recovered(): The link stayed healthy for the recovery time
+        health_updated(float, float, float): Score, latency and status
+            gap in seconds, once per heartbeat
+    """
+
+    ping_due = pyqtSignal()
+    degraded = pyqtSignal(str)
+    recovered = pyqtSignal()
+    health_updated = pyqtSignal(float, float, float)
+
+    def __init__(
+        self,
+        heartbeat_interval: float,
+        check_interval: float,
+        latency_limit: float,
+        status_gap_limit: float,
+        recovery_time: float,
+    ):
+        """
+        Args:
+            heartbeat_interval: Seconds between PINGs
+            check_interval: Seconds between health checks
+            latency_limit: PONG latency in seconds that degrades the link
+            status_gap_limit: Seconds without a STATUS_UPDATE that degrades the link
+            recovery_time: Seconds the score must stay at or above 0.5 to recover
+        """
+        super().__init__()
+        self.heartbeat_interval = heartbeat_interval
+        self.check_interval = check_interval
+        self.latency_limit = latency_limit
+        self.status_gap_limit = status_gap_limit
+        self.recovery_time = recovery_time
+
+        self.running = False
+        self.state = LinkState.IDLE
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+        # Guarded by _lock
+        self._ping_outstanding: float | None = None  # Send time of the oldest PING
+        self._latency: float = 0.0  # Smoothed PONG round trip time
+        self._last_status: float = 0.0
+        self._healthy_since: float | None = None
+
+    def arm(self):
+        """Start monitoring, e.g. once the executor answered the first PING"""
+        now = time.monotonic()
+        with self._lock:
+            self._ping_outstanding = None
+            self._latency = 0.0
+            self._last_status = now
+            self._healthy_since = None
+            self.state = LinkState.HEALTHY
+        self._wake.set()
+
+    def disarm(self):
+        with self._lock:
+            self.state = LinkState.IDLE
+
+    def ping_sent(self, timestamp: float):
+        with self._lock:
+            if self._ping_outstanding is None:
+                self._ping_outstanding = timestamp
+
+    def pong_received(self, timestamp: float) -> float | None:
+        """
+        Returns:
+            Round trip time in seconds, or None if no PING was outstanding
+        """
+        with self._lock:
+            if self._ping_outstanding is None:
+                return None
+            rtt = timestamp - self._ping_outstanding
+            self._ping_outstanding = None
+            self._latency = (
+                rtt if self._latency == 0.0 else 0.8 * self._latency + 0.2 * rtt
+            )
+            return rtt
+
+    def status_received(self, timestamp: float):
+        with self._lock:
+            self._last_status = timestamp
+
+    def _assess(self, now: float) -> tuple[float, float, float]:
+        """Returns (score, latency, status gap), call with _lock held"""
+        latency = self._latency
+        if self._ping_outstanding is not None:
+            latency = max(latency, now - self._ping_outstanding)
+        gap = now - self._last_status
+
+        worst = max(latency / self.latency_limit, gap / self.status_gap_limit)
+        return (min(1.0, max(0.0, 1.0 - worst)), latency, gap)
+
+    def run(self):
+        self.running = True
+        next_ping = time.monotonic()
+        next_report = next_ping
+
+        while self.running:
+            now = time.monotonic()
+            reason: str | None = None
+            came_back = False
+
+            with self._lock:
+                if self.state == LinkState.IDLE:
+                    score = None
+                else:
+                    score, latency, gap = self._assess(now)
+
+                    if self.state == LinkState.HEALTHY and score <= 0.0:
+                        self.state = LinkState.DEGRADED
+                        self._healthy_since = None
+                        if latency >= self.latency_limit:
+                            reason = f"PONG latency {latency * 1000:.0f} ms"
+                        else:
+                            reason = f"No STATUS_UPDATE for {gap:.1f} s"
+
+                    elif self.state == LinkState.DEGRADED:
+                        if score < 0.5:
+                            self._healthy_since = None
+                        elif self._healthy_since is None:
+                            self._healthy_since = now
+                        elif now - self._healthy_since >= self.recovery_time:
+                            self.state = LinkState.HEALTHY
+                            came_back = True
+
+            # Emit outside the lock, the slots run on the GUI thread
+            if reason is not None:
+                self.degraded.emit(reason)
+            elif came_back:
+                self.recovered.emit()
+
+            if score is not None:
+                if now >= next_ping:
+                    next_ping = now + self.heartbeat_interval
+                    self.ping_due.emit()
+                if now >= next_report:
+                    next_report = now + self.heartbeat_interval
+                    self.health_updated.emit(score, latency, gap)
+            else:
+                next_ping = now
+                next_report = now
+
+            self._wake.wait(self.check_interval)
+            self._wake.clear()
+
+    def stop(self):
+        """Stop the monitoring thread"""
+        self.running = False
+        self._wake.set()